@@ -0,0 +1,76 @@
+"""
+Correction Engine Benchmark for EchoOS
+Compares the per-utterance cost of the old per-mapping regex loop with CorrectionEngine
+Run: python benchmarks/benchmark_corrections.py
+"""
+
+import os
+import re
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.enhanced_stt import EnhancedSTT
+from modules.correction_engine import CorrectionEngine
+
+UTTERANCES = [
+    "open not bad",
+    "launch crow",
+    "create fine on desktop",
+    "close all tabs",
+    "volume up",
+    "scroll down",
+    "open had a thought folder",
+    "search for python tutorials",
+    "minimise window",
+    "lock computer",
+    "open whats app",
+    "next tab",
+]
+
+
+def legacy_correct(text, mappings):
+    """The pre-CorrectionEngine loop: sort every call, one search + sub per mapping"""
+    sorted_mappings = sorted(mappings.items(), key=lambda x: len(x[0]), reverse=True)
+    for incorrect, correct in sorted_mappings:
+        pattern = r'\b' + re.escape(incorrect) + r'\b'
+        if re.search(pattern, text):
+            text = re.sub(pattern, correct, text)
+    return text
+
+
+def time_per_call(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for utterance in UTTERANCES:
+            fn(utterance)
+        samples.append((time.perf_counter() - start) / len(UTTERANCES) * 1e6)
+    return samples
+
+
+def main(rounds=200):
+    mappings = EnhancedSTT._build_correction_mappings(None)
+    engine = CorrectionEngine(mappings)
+
+    legacy = time_per_call(lambda t: legacy_correct(t, mappings), rounds)
+    compiled = time_per_call(lambda t: engine.apply(t)[0], rounds)
+
+    print(f"Correction mappings: {len(mappings)}, utterances: {len(UTTERANCES)}, rounds: {rounds}")
+    print(f"{'implementation':<16}{'median us':>12}{'p95 us':>12}")
+    for name, samples in (("legacy loop", legacy), ("single pass", compiled)):
+        p95 = statistics.quantiles(samples, n=20)[-1]
+        print(f"{name:<16}{statistics.median(samples):>12.1f}{p95:>12.1f}")
+    print(f"Speedup: {statistics.median(legacy) / statistics.median(compiled):.1f}x")
+
+    print("\nOutputs (legacy -> single pass):")
+    for utterance in UTTERANCES:
+        old, new = legacy_correct(utterance, mappings), engine.apply(utterance)[0]
+        marker = "" if old == new else "   <- differs"
+        print(f"  {utterance!r}: {old!r} -> {new!r}{marker}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+App Discovery Scan Benchmark for EchoOS
+Builds a synthetic Program Files-like tree (~100k files by default: app folders with
+bundled node_modules, locales, resources and helper executables) and compares the
+previous unbounded os.walk scanning with the bounded, pruned scandir walker.
+
+Measured per implementation: cold Program Files scan (single-threaded and with a
+worker pool), warm rescan with the discovery cache, and the per-app executable search
+used for registry install locations. Also reports how many of the apps' main
+executables each scan finds.
+
+Run: python benchmarks/discovery_bench.py [--files 100000] [--rounds 3] [--workers 4] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.dir_scan import SCAN_DEPTH, find_primary, is_helper_executable, is_ignored_dir
+from modules.discovery_cache import DiscoveryCache
+
+EXECUTABLES = (".exe", ".bat", ".cmd")
+
+
+def touch(path):
+    with open(path, 'w'):
+        pass
+
+
+def build_tree(root, total_files):
+    """Vendor/App folders, each with its main executable, an uninstaller and ~500 bundled files"""
+    per_app = 500
+    apps = max(1, total_files // per_app)
+    primaries = []
+    for i in range(apps):
+        app = os.path.join(root, f"Vendor{i % 40}", f"App{i}")
+        os.makedirs(app)
+        primaries.append(os.path.join(app, f"App{i}.exe"))
+        touch(primaries[-1])
+        touch(os.path.join(app, "unins000.exe"))
+        for j in range(8):
+            touch(os.path.join(app, f"lib{j}.dll"))
+        locales = os.path.join(app, "locales")
+        os.makedirs(locales)
+        for j in range(60):
+            touch(os.path.join(locales, f"l{j}.pak"))
+        bin_dir = os.path.join(app, "bin")
+        os.makedirs(bin_dir)
+        for name in ("crashpad_handler.exe", "helper.exe", "codec.dll", "render.dll"):
+            touch(os.path.join(bin_dir, name))
+        # Bundled node_modules: the bulk of the files, several levels deep
+        remaining = per_app - 8 - 2 - 60 - 4
+        modules = os.path.join(app, "resources", "app", "node_modules")
+        for k in range(remaining // 20):
+            package = os.path.join(modules, f"pkg{k}", "lib", "internal")
+            os.makedirs(package)
+            for j in range(19):
+                touch(os.path.join(package, f"m{j}.js"))
+            touch(os.path.join(package, "build.cmd"))
+    return primaries
+
+
+def legacy_scan(roots):
+    """Program Files scanning as it was: os.walk into every folder, every executable becomes an app"""
+    found = []
+    for root in roots:
+        for folder, dirs, files in os.walk(root):
+            for file in files:
+                if file.lower().endswith(EXECUTABLES):
+                    found.append(os.path.join(folder, file))
+    return found
+
+
+def legacy_find(directory):
+    """_find_executable_in_dir as it was: the first executable os.walk reaches"""
+    for folder, dirs, files in os.walk(directory):
+        for file in files:
+            if file.lower().endswith(EXECUTABLES):
+                return os.path.join(folder, file)
+    return None
+
+
+def pruned_scan(cache, roots, depth, workers):
+    apps = cache.scan("program_files", roots,
+                      lambda file: file.lower().endswith(EXECUTABLES),
+                      lambda path, file: {"name": os.path.splitext(file)[0], "exec": path},
+                      max_depth=depth, ignore=is_ignored_dir,
+                      stop_when=lambda found: any(not is_helper_executable(os.path.basename(a["exec"])) for a in found),
+                      workers=workers)
+    return [app["exec"] for app in apps]
+
+
+def timed(fn, rounds):
+    samples, result = [], None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app discovery directory scanning on a synthetic tree")
+    parser.add_argument("--files", type=int, default=100000, help="Approximate number of files in the tree")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed runs per measurement (median is reported)")
+    parser.add_argument("--workers", type=int, default=4, help="Worker threads for the pooled scan")
+    parser.add_argument("--depth", type=int, default=SCAN_DEPTH, help="Scan depth below each root")
+    parser.add_argument("--keep", help="Build the tree here and keep it (default: temporary directory)")
+    parser.add_argument("--json", help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    base = args.keep or tempfile.mkdtemp(prefix="echoos-discovery-bench-")
+    root = os.path.join(base, "Program Files")
+    try:
+        start = time.perf_counter()
+        primaries = build_tree(root, args.files)
+        file_count = sum(len(files) for _, _, files in os.walk(root))
+        print(f"Tree: {file_count} files, {len(primaries)} apps, built in {time.perf_counter() - start:.1f} s")
+        # One untimed walk so both implementations start from a warm page cache
+        legacy_scan([root])
+
+        report = {'files': file_count, 'apps': len(primaries), 'depth': args.depth, 'rounds': args.rounds}
+        results = {}
+
+        ms, found = timed(lambda: legacy_scan([root]), args.rounds)
+        results['legacy os.walk'] = {'ms': ms, 'executables': len(found), 'primaries': len(set(found) & set(primaries))}
+
+        for workers in (1, args.workers):
+            stats = {}
+
+            def cold():
+                cache = DiscoveryCache(os.path.join(base, "bench_cache.json"))
+                cache.clear()
+                paths = pruned_scan(cache, [root], args.depth, workers)
+                stats.update(cache.get_stats())
+                return paths
+
+            ms, found = timed(cold, args.rounds)
+            results[f'pruned scandir, {workers} worker(s)'] = {
+                'ms': ms, 'executables': len(found), 'primaries': len(set(found) & set(primaries)),
+                'stat_calls': stats['stat_calls'], 'dir_listings': stats['dir_listings']}
+
+        cache = DiscoveryCache(os.path.join(base, "bench_cache.json"))
+        cache.clear()
+        pruned_scan(cache, [root], args.depth, 1)
+
+        def warm():
+            cache.reset_stats()
+            return pruned_scan(cache, [root], args.depth, 1)
+
+        ms, found = timed(warm, args.rounds)
+        results['pruned scandir, cached rescan'] = {
+            'ms': ms, 'executables': len(found), 'primaries': len(set(found) & set(primaries)),
+            'stat_calls': cache.stats['stat_calls'], 'dir_listings': cache.stats['dir_listings']}
+
+        app_dirs = [os.path.dirname(path) for path in primaries]
+        ms, found = timed(lambda: [legacy_find(d) for d in app_dirs], args.rounds)
+        results['legacy find executable'] = {'ms': ms, 'primaries': len(set(found) & set(primaries))}
+        ms, found = timed(lambda: [find_primary(d, lambda f: f.lower().endswith(EXECUTABLES), args.depth)
+                                   for d in app_dirs], args.rounds)
+        results['find_primary'] = {'ms': ms, 'primaries': len(set(found) & set(primaries))}
+
+        report['results'] = results
+        baseline = results['legacy os.walk']['ms']
+        print(f"{'implementation':<36}{'ms':>10}{'speedup':>9}{'exes':>8}{'main':>7}{'stats':>9}{'lists':>8}")
+        for name, r in results.items():
+            reference = results['legacy find executable']['ms'] if 'find' in name else baseline
+            r['speedup'] = reference / r['ms'] if r['ms'] else None
+            print(f"{name:<36}{r['ms']:>10.1f}{r['speedup']:>8.1f}x{r.get('executables', ''):>8}"
+                  f"{r['primaries']:>7}{r.get('stat_calls', ''):>9}{r.get('dir_listings', ''):>8}")
+
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+    finally:
+        if not args.keep:
+            shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
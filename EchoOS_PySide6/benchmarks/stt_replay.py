@@ -0,0 +1,359 @@
+"""
+STT Replay Benchmark for EchoOS
+Feeds recorded WAV fixtures through the real EnhancedSTT streaming pipeline
+(VAD -> KaldiRecognizer -> _correct_speech_text) using a fake sounddevice source,
+and reports per-stage latency percentiles, real-time factor and word accuracy.
+
+Fixtures are mono 16-bit WAV files; each `name.wav` may have a `name.txt` next to
+it holding the expected (post-correction) transcript.
+
+Run: python benchmarks/stt_replay.py path/to/fixtures [--speed 1.0] [--rounds 3] [--json out.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import types
+import wave
+from collections import defaultdict
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_RATE = 16000
+
+
+class FakeInputStream:
+    """Stand-in for sounddevice.InputStream that plays the current replay source"""
+
+    def __init__(self, samplerate=SAMPLE_RATE, channels=1, dtype='int16', blocksize=480,
+                 device=None, callback=None, **kwargs):
+        self.samplerate = samplerate
+        self.blocksize = blocksize or 480
+        self.callback = callback
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="fake-input-stream", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        source = FakeSoundDevice.source
+        if source is None:
+            return
+        interval = self.blocksize / self.samplerate / source.speed if source.speed > 0 else 0.0
+        next_tick = time.perf_counter()
+        for start in range(0, len(source.samples), self.blocksize):
+            if self._stop.is_set():
+                return
+            block = source.samples[start:start + self.blocksize]
+            if len(block) < self.blocksize:
+                block = np.pad(block, (0, self.blocksize - len(block)))
+            self.callback(block.reshape(-1, 1), len(block), None, None)
+            if start <= source.speech_end_sample < start + self.blocksize:
+                source.speech_end_time = time.perf_counter()
+            if interval:
+                next_tick += interval
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        source.finished.set()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def close(self):
+        self.stop()
+
+
+class FakeSoundDevice(types.ModuleType):
+    """Minimal `sounddevice` replacement: InputStream plays the replay source, rec() returns silence"""
+
+    source = None
+
+    def __init__(self):
+        super().__init__("sounddevice")
+        self.InputStream = FakeInputStream
+
+    @staticmethod
+    def rec(frames, samplerate=SAMPLE_RATE, channels=1, dtype='int16', **kwargs):
+        return np.zeros((int(frames), channels), dtype=np.int16)
+
+    @staticmethod
+    def wait():
+        return None
+
+
+class ReplaySource:
+    """One fixture's samples plus trailing silence, with the wall time its speech finished playing"""
+
+    def __init__(self, samples, tail_seconds: float, speed: float, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        tail = rng.integers(-8, 9, int(tail_seconds * SAMPLE_RATE)).astype(np.int16)
+        self.samples = np.concatenate([samples, tail])
+        self.speech_end_sample = max(len(samples) - 1, 0)
+        self.speech_end_time = None
+        self.speed = speed
+        self.finished = threading.Event()
+
+
+def load_wav(path):
+    """Read a 16-bit WAV as mono int16 at SAMPLE_RATE (linear resampling if needed)"""
+    with wave.open(path, 'rb') as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM")
+        channels, rate = wav.getnchannels(), wav.getframerate()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels)[:, 0]
+    if rate != SAMPLE_RATE:
+        positions = np.linspace(0, len(samples) - 1, int(len(samples) * SAMPLE_RATE / rate))
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+    return samples
+
+
+def load_fixtures(paths):
+    """Expand files/directories into (name, samples, transcript-or-None) tuples"""
+    wav_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            wav_paths.extend(sorted(glob.glob(os.path.join(path, "*.wav"))))
+        else:
+            wav_paths.append(path)
+
+    fixtures = []
+    for wav_path in wav_paths:
+        transcript_path = os.path.splitext(wav_path)[0] + ".txt"
+        transcript = None
+        if os.path.exists(transcript_path):
+            with open(transcript_path, 'r', encoding='utf-8') as f:
+                transcript = f.read().strip()
+        fixtures.append((os.path.basename(wav_path), load_wav(wav_path), transcript))
+    return fixtures
+
+
+def word_errors(reference: str, hypothesis: str):
+    """Word-level edit distance and reference length"""
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1], len(ref)
+
+
+class TimedRecognizer:
+    """Proxy around a KaldiRecognizer that records time spent decoding"""
+
+    def __init__(self, rec, timings):
+        self._rec = rec
+        self._timings = timings
+
+    def _timed(self, name, *args):
+        start = time.perf_counter()
+        try:
+            return getattr(self._rec, name)(*args)
+        finally:
+            self._timings['recognizer'].append((time.perf_counter() - start) * 1000)
+
+    def AcceptWaveform(self, data):
+        return self._timed('AcceptWaveform', data)
+
+    def Result(self):
+        return self._timed('Result')
+
+    def PartialResult(self):
+        return self._timed('PartialResult')
+
+    def FinalResult(self):
+        return self._timed('FinalResult')
+
+    def __getattr__(self, name):
+        return getattr(self._rec, name)
+
+
+def instrument(stt, timings):
+    """Wrap the pipeline stages of an EnhancedSTT instance with timers"""
+    def timed(name, fn, materialize=False):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            if materialize:
+                result = list(result)
+            timings[name].append((time.perf_counter() - start) * 1000)
+            return result
+        return wrapper
+
+    if stt.vad is not None:
+        stt.vad.process = timed('vad', stt.vad.process, materialize=True)
+    stt._correct_speech_text = timed('correction', stt._correct_speech_text)
+    stt._decode_with_full_model = timed('full_model_redecode', stt._decode_with_full_model)
+
+    create, release = stt._create_recognizer, stt._release_recognizer
+
+    def create_recognizer(key):
+        rec = create(key)
+        return TimedRecognizer(rec, timings) if rec is not None else None
+
+    def release_recognizer(rec, key):
+        release(rec._rec if isinstance(rec, TimedRecognizer) else rec, key)
+
+    stt._create_recognizer = create_recognizer
+    stt._release_recognizer = release_recognizer
+
+
+def percentiles(samples):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        'count': len(ordered),
+        'p50': pick(0.50),
+        'p95': pick(0.95),
+        'p99': pick(0.99),
+        'mean': statistics.mean(ordered),
+        'total': sum(ordered)
+    }
+
+
+def replay(stt, fixture, args, timings):
+    """Play one fixture through the listening loop and collect what it dispatched"""
+    name, samples, transcript = fixture
+    source = ReplaySource(samples, args.tail, args.speed)
+    FakeSoundDevice.source = source
+    dispatched = []
+
+    def on_text(text):
+        dispatched.append((time.perf_counter(), text))
+
+    stt.correction_cache.clear()
+    stt.start_listening(on_text)
+    # Allow for real-time playback plus model wait before giving up on the fixture
+    duration = len(source.samples) / SAMPLE_RATE
+    source.finished.wait(timeout=(duration / args.speed if args.speed > 0 else duration) + 30)
+    time.sleep(args.settle)
+    stt.stop_listening()
+    if getattr(stt, '_thread', None):
+        stt._thread.join(timeout=5)
+
+    hypothesis = ' '.join(text for _, text in dispatched)
+    if source.speech_end_time is not None:
+        for dispatched_at, _ in dispatched:
+            timings['end_to_end'].append((dispatched_at - source.speech_end_time) * 1000)
+
+    result = {'fixture': name, 'audio_seconds': len(samples) / SAMPLE_RATE, 'hypothesis': hypothesis,
+              'reference': transcript}
+    if transcript is not None:
+        errors, words = word_errors(transcript, hypothesis)
+        result.update(errors=errors, words=words, exact=transcript.lower().split() == hypothesis.lower().split())
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay WAV fixtures through the EnhancedSTT pipeline")
+    parser.add_argument("fixtures", nargs="+", help="WAV files or directories of WAV files")
+    parser.add_argument("--model", default="models/vosk-model-small-en-us-0.15", help="Vosk model path")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed (1.0 = real time, 0 = unpaced)")
+    parser.add_argument("--rounds", type=int, default=1, help="Times to replay each fixture")
+    parser.add_argument("--tail", type=float, default=1.0, help="Seconds of near-silence appended to each fixture")
+    parser.add_argument("--settle", type=float, default=0.3, help="Seconds to wait for late results after playback")
+    parser.add_argument("--energy-threshold", type=int, default=500, help="Fixed energy threshold (skips calibration)")
+    parser.add_argument("--mode", choices=("command", "dictation"), default="command", help="Recognition mode")
+    parser.add_argument("--no-vad", action="store_true", help="Disable frame-level VAD")
+    parser.add_argument("--no-early-dispatch", action="store_true", help="Disable dispatch from partial results")
+    parser.add_argument("--json", help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    # Must be installed before the STT modules import sounddevice
+    sys.modules["sounddevice"] = FakeSoundDevice()
+    from modules.enhanced_stt import EnhancedSTT, VOSK_AVAILABLE
+    from modules.vosk_registry import get_model_registry
+
+    if not VOSK_AVAILABLE:
+        sys.exit("vosk is not installed - the replay benchmark needs the real recognizer")
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        sys.exit("No WAV fixtures found")
+
+    load_start = time.perf_counter()
+    if get_model_registry().get_model(args.model) is None:
+        sys.exit(f"Could not load Vosk model from {args.model}")
+    model_load_ms = (time.perf_counter() - load_start) * 1000
+
+    stt = EnhancedSTT(model_path=args.model)
+    stt.model = get_model_registry().get_model(args.model)
+    stt._energy_calibrated = True
+    stt.set_energy_threshold(args.energy_threshold)
+    stt.vad_enabled = not args.no_vad
+    stt.early_dispatch_enabled = not args.no_early_dispatch
+    stt.whisper_fallback_enabled = False
+    if stt.whisper_fallback:
+        stt.whisper_fallback.stop()  # Started by EnhancedSTT; the replay measures Vosk only
+    stt.set_recognition_mode(args.mode)
+
+    timings = defaultdict(list)
+    instrument(stt, timings)
+
+    results = []
+    for _ in range(args.rounds):
+        for fixture in fixtures:
+            results.append(replay(stt, fixture, args, timings))
+
+    audio_seconds = sum(r['audio_seconds'] for r in results)
+    processing_ms = sum(sum(timings[stage]) for stage in ('vad', 'recognizer', 'full_model_redecode', 'correction'))
+    scored = [r for r in results if r.get('words') is not None]
+    total_errors = sum(r['errors'] for r in scored)
+    total_words = sum(r['words'] for r in scored)
+
+    report = {
+        'fixtures': len(fixtures),
+        'rounds': args.rounds,
+        'speed': args.speed,
+        'model_load_ms': model_load_ms,
+        'audio_seconds': audio_seconds,
+        'real_time_factor': processing_ms / 1000 / audio_seconds if audio_seconds else None,
+        'stages_ms': {stage: percentiles(samples) for stage, samples in timings.items()},
+        'word_error_rate': total_errors / total_words if total_words else None,
+        'exact_match_rate': sum(r['exact'] for r in scored) / len(scored) if scored else None,
+        'results': results
+    }
+
+    print(f"Fixtures: {len(fixtures)} x {args.rounds} rounds, {audio_seconds:.1f}s audio, "
+          f"model load {model_load_ms:.0f} ms")
+    print(f"{'stage':<22}{'calls':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'total ms':>12}")
+    for stage in ('vad', 'recognizer', 'full_model_redecode', 'correction', 'end_to_end'):
+        stats = report['stages_ms'].get(stage)
+        if stats:
+            print(f"{stage:<22}{stats['count']:>8}{stats['p50']:>10.2f}{stats['p95']:>10.2f}"
+                  f"{stats['p99']:>10.2f}{stats['total']:>12.1f}")
+    if report['real_time_factor'] is not None:
+        print(f"Real-time factor: {report['real_time_factor']:.3f}")
+    if report['word_error_rate'] is not None:
+        print(f"Word accuracy: {1 - report['word_error_rate']:.1%} (WER {report['word_error_rate']:.1%}), "
+              f"exact match {report['exact_match_rate']:.1%}")
+    for r in results:
+        if r.get('reference') is not None and not r['exact']:
+            print(f"  {r['fixture']}: expected {r['reference']!r}, got {r['hypothesis']!r}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
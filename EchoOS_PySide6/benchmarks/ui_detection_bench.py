@@ -0,0 +1,202 @@
+"""
+UI Detection Benchmark for EchoOS
+Runs UniversalUIAutomator's element detection over recorded screenshots and compares
+it with the previous full-resolution implementation (three independent grayscale,
+Canny and findContours passes with per-contour Python filtering).
+
+Reports per-screenshot latency percentiles for both, the speedup, element counts per
+type, and how many of the full-resolution elements the pyramid path still finds
+(same type, IoU >= --iou).
+
+Run: python benchmarks/ui_detection_bench.py path/to/screenshots [--rounds 5] [--scale 0.5] [--json out.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+def load_screenshots(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for ext in IMAGE_EXTENSIONS:
+                files.extend(glob.glob(os.path.join(path, f"*{ext}")))
+        elif path.lower().endswith(IMAGE_EXTENSIONS):
+            files.append(path)
+    return sorted(set(files))
+
+
+def legacy_detect(screenshot):
+    """The detectors as they were: full resolution, each doing its own conversion and contour pass"""
+    import cv2
+    import numpy as np
+
+    cv_image = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+    elements = []
+
+    gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
+    edges = cv2.Canny(gray, 50, 150)
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    for contour in contours:
+        epsilon = 0.02 * cv2.arcLength(contour, True)
+        approx = cv2.approxPolyDP(contour, epsilon, True)
+        if len(approx) >= 4:
+            x, y, w, h = cv2.boundingRect(contour)
+            if 50 <= w <= 300 and 20 <= h <= 100:
+                elements.append(('button', (x, y, w, h)))
+
+    gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1))
+    dilated = cv2.dilate(gray, kernel, iterations=1)
+    contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if 2 <= w / h <= 20 and w >= 100 and h >= 10:
+            elements.append(('text', (x, y, w, h)))
+
+    gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
+    edges = cv2.Canny(gray, 50, 150)
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if 100 <= w <= 500 and 20 <= h <= 50:
+            elements.append(('input', (x, y, w, h)))
+
+    return elements
+
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+
+def matched(reference, candidates, threshold):
+    """How many reference elements have a same-type candidate overlapping at IoU >= threshold"""
+    by_type = defaultdict(list)
+    for kind, rect in candidates:
+        by_type[kind].append(rect)
+    return sum(1 for kind, rect in reference if any(iou(rect, other) >= threshold for other in by_type[kind]))
+
+
+def percentiles(samples):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        'count': len(ordered),
+        'p50': pick(0.50),
+        'p95': pick(0.95),
+        'mean': statistics.mean(ordered),
+        'total': sum(ordered)
+    }
+
+
+def counts(elements):
+    result = defaultdict(int)
+    for kind, _ in elements:
+        result[kind] += 1
+    return dict(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark UI element detection on recorded screenshots")
+    parser.add_argument("screenshots", nargs="+", help="Image files or directories of screenshots")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed runs per screenshot and implementation")
+    parser.add_argument("--scale", type=float, default=None, help="Pyramid level to detect on (default: DETECTION_SCALE)")
+    parser.add_argument("--iou", type=float, default=0.5, help="Overlap needed to count a legacy element as found")
+    parser.add_argument("--json", help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    from modules.ui_automation import UniversalUIAutomator, IMAGE_PROCESSING_AVAILABLE
+    if not IMAGE_PROCESSING_AVAILABLE:
+        sys.exit("OpenCV, NumPy and Pillow are needed for the detection benchmark")
+    from PIL import Image
+
+    files = load_screenshots(args.screenshots)
+    if not files:
+        sys.exit("No screenshots found")
+
+    automator = UniversalUIAutomator()
+    if args.scale is not None:
+        automator.detection_scale = args.scale
+
+    timings = defaultdict(list)
+    results = []
+    for path in files:
+        screenshot = Image.open(path).convert('RGB')
+        legacy_ms, pyramid_ms = [], []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            legacy = legacy_detect(screenshot)
+            legacy_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            current = [(e.element_type, (e.x, e.y, e.width, e.height))
+                       for e in automator._detect_ui_elements(screenshot)]
+            pyramid_ms.append((time.perf_counter() - start) * 1000)
+        timings['legacy'].extend(legacy_ms)
+        timings['pyramid'].extend(pyramid_ms)
+
+        found = matched(legacy, current, args.iou)
+        results.append({
+            'screenshot': os.path.basename(path),
+            'size': screenshot.size,
+            'legacy_ms': statistics.median(legacy_ms),
+            'pyramid_ms': statistics.median(pyramid_ms),
+            'legacy_elements': counts(legacy),
+            'pyramid_elements': counts(current),
+            'legacy_recall': found / len(legacy) if legacy else None
+        })
+
+    legacy_total = sum(r['legacy_ms'] for r in results)
+    pyramid_total = sum(r['pyramid_ms'] for r in results)
+    recalls = [r['legacy_recall'] for r in results if r['legacy_recall'] is not None]
+    report = {
+        'screenshots': len(files),
+        'rounds': args.rounds,
+        'scale': automator.detection_scale,
+        'latency_ms': {name: percentiles(samples) for name, samples in timings.items()},
+        'speedup': legacy_total / pyramid_total if pyramid_total else None,
+        'mean_legacy_recall': statistics.mean(recalls) if recalls else None,
+        'results': results
+    }
+
+    print(f"Screenshots: {len(files)} x {args.rounds} rounds, detection scale {automator.detection_scale}")
+    print(f"{'implementation':<16}{'runs':>8}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for name in ('legacy', 'pyramid'):
+        stats = report['latency_ms'][name]
+        print(f"{name:<16}{stats['count']:>8}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['mean']:>10.2f}")
+    if report['speedup'] is not None:
+        print(f"Speedup: {report['speedup']:.2f}x")
+    if report['mean_legacy_recall'] is not None:
+        print(f"Legacy elements still found (IoU >= {args.iou}): {report['mean_legacy_recall']:.1%}")
+    for r in results:
+        print(f"  {r['screenshot']}: {r['size'][0]}x{r['size'][1]} {r['legacy_ms']:.1f} -> {r['pyramid_ms']:.1f} ms, "
+              f"legacy {r['legacy_elements']} / pyramid {r['pyramid_elements']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,7 @@ from modules.enhanced_stt import EnhancedSTT
 from modules.simple_screen_analyzer import SimpleScreenAnalyzer
 from modules.advanced_screen_analyzer import AdvancedScreenAnalyzer
 from modules.universal_executor_v2 import UniversalExecutorV2
+from modules.vosk_registry import get_model_registry
 
 # Initialize universal configuration
 universal_config = UniversalConfig()
@@ -72,6 +73,10 @@ def main():
     
     logger.info("Starting EchoOS - Enhanced Voice-Controlled Operating System")
     
+    # Start loading the Vosk model right away on a background thread - the window never waits for it
+    model_ready = get_model_registry().preload("models/vosk-model-small-en-us-0.15")
+    model_ready.add_done_callback(lambda f: logger.info("Speech model ready") if f.exception() is None else None)
+    
     # Initialize Qt application
     app = QApplication(sys.argv)
     app.setApplicationName("EchoOS")
@@ -86,19 +91,24 @@ def main():
         auth = Authenticator(tts=tts)
         
         logger.info("Initializing app discovery...")
-        app_disc = AppDiscovery()
+        app_disc = AppDiscovery(scan_depth=universal_config.get("discovery.scan_depth", 3))
         
         logger.info("Initializing enhanced speech recognition...")
-        stt_mgr = EnhancedSTT(tts=tts)
+        stt_mgr = EnhancedSTT(tts=tts, universal_config=universal_config, config_dir=str(CONFIG_DIR))
         
         logger.info("Initializing simple screen analyzer...")
         screen_analyzer = SimpleScreenAnalyzer(tts=tts)
         
         logger.info("Initializing advanced screen analyzer...")
+        # Capture scope shared by every component that grabs the screen
+        capture_scope = (universal_config.get("automation.screen_capture_scope", "window"),
+                         universal_config.get("automation.screen_focus_region"))
         advanced_screen_analyzer = AdvancedScreenAnalyzer(tts=tts)
+        advanced_screen_analyzer.set_capture_scope(*capture_scope)
         
         logger.info("Initializing UI automation...")
         ui_automator = UniversalUIAutomator(tts=tts)
+        ui_automator.set_capture_scope(*capture_scope)
         
         logger.info("Initializing command parser...")
         parser = CommandParser(tts=tts)
@@ -108,6 +118,7 @@ def main():
         
         logger.info("Initializing universal command executor...")
         universal_executor = UniversalCommandExecutor(tts=tts, auth=auth)
+        universal_executor.set_capture_scope(*capture_scope)
         
         logger.info("Initializing universal executor V2...")
         universal_executor_v2 = UniversalExecutorV2(tts=tts, screen_analyzer=advanced_screen_analyzer, app_discovery=app_disc, auth=auth)
@@ -124,6 +135,8 @@ def main():
         # Create main window (FAST STARTUP)
         logger.info("Creating main window...")
         win = EchoMainWindow(auth, stt_mgr, app_disc, context_parser, executor, tts, accessibility, universal_executor, screen_analyzer, advanced_screen_analyzer, universal_executor_v2)
+        if universal_config.get("commands.speculative_dispatch", False):
+            win.command_pipeline.set_speculative(True)
         win.show()
         
         # Start app discovery in background (NON-BLOCKING)
@@ -141,6 +154,19 @@ def main():
         discovery_thread = threading.Thread(target=background_discovery, daemon=True)
         discovery_thread.start()
         
+        # Periodic incremental rescans: directories unchanged since the last scan are only stat-ed
+        def periodic_discovery():
+            nonlocal discovery_thread
+            if not discovery_thread.is_alive():
+                discovery_thread = threading.Thread(target=background_discovery, daemon=True)
+                discovery_thread.start()
+        
+        rescan_minutes = universal_config.get("discovery.rescan_interval_minutes", 30)
+        discovery_timer = QTimer()
+        if rescan_minutes:
+            discovery_timer.timeout.connect(periodic_discovery)
+            discovery_timer.start(int(rescan_minutes * 60000))
+        
         # Setup periodic cleanup
         cleanup_timer = QTimer()
         cleanup_timer.timeout.connect(auth.cleanup_expired_sessions)
@@ -159,6 +185,7 @@ def main():
         try:
             sys.exit(app.exec())
         finally:
+            stt_mgr.shutdown()
             logger.info("EchoOS shutdown complete")
         
     except Exception as e:
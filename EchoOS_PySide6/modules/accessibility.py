@@ -17,13 +17,8 @@ except ImportError:
     PYAUTOGUI_AVAILABLE = False
     print("PyAutoGUI not available - some accessibility features will be limited")
 
-try:
-    import cv2
-    import pytesseract
-    from PIL import Image
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+from .ocr_service import OCR_AVAILABLE, get_ocr_service
+if not OCR_AVAILABLE:
     print("OCR libraries not available - screen reading will be limited")
 
 try:
@@ -75,11 +70,8 @@ class AccessibilityManager:
             else:
                 screenshot = pyautogui.screenshot()
                 
-            # Convert to OpenCV format
-            img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-            
-            # Perform OCR
-            text = pytesseract.image_to_string(img)
+            # Perform OCR on the shared worker pool
+            text = get_ocr_service().text(screenshot)
             
             if text.strip():
                 self.tts.say(f"Screen content: {text[:200]}...")  # Limit to 200 chars
@@ -9,6 +9,7 @@ import time
 import logging
 import platform
 import re
+import threading
 from typing import Optional, Dict, List, Any, Tuple
 from pathlib import Path
 
@@ -22,12 +23,10 @@ try:
 except ImportError:
     IMAGE_PROCESSING_AVAILABLE = False
 
-# OCR imports
-try:
-    import pytesseract
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+from .screen_frame import ScreenFrame
+from .ui_detection import DETECTION_SCALE, size_mask
+from .ocr_service import OCR_AVAILABLE, get_ocr_service
+from .incremental_ocr import IncrementalOCR
 
 # Window management
 try:
@@ -49,6 +48,82 @@ if platform.system() == "Windows":
 else:
     WINDOWS_APIS_AVAILABLE = False
 
+class LazyScreenContext:
+    """Screen context whose facets are computed on first access.
+
+    Reads like the dict returned by `AdvancedScreenAnalyzer.analyze_screen()`
+    (`ctx['screen_text']`, `ctx.get('files_on_screen', [])`), but the screen
+    grab, OCR and contour pass only run for the facets someone actually reads.
+    Facets depend on each other: files need OCR text, the current app needs the
+    window and OCR text, and actions need the app and files.
+    """
+
+    FACETS = ('active_window', 'screen_text', 'files_on_screen', 'ui_elements',
+              'current_app', 'available_actions', 'context_type')
+
+    def __init__(self, analyzer: "AdvancedScreenAnalyzer", seed: Optional[Dict[str, Any]] = None):
+        self._analyzer = analyzer
+        self._lock = threading.RLock()
+        self._values: Dict[str, Any] = dict(seed) if seed else {}
+        self._values.setdefault('timestamp', time.time())
+
+    def _compute(self, key: str) -> Any:
+        analyzer = self._analyzer
+        if key == 'frame':
+            # One capture shared by OCR and UI element detection, scoped to the active window
+            return analyzer._capture_frame(self['active_window'])
+        if key == 'active_window':
+            return analyzer._get_active_window_info()
+        if key == 'screen_text':
+            return analyzer._extract_screen_text(self['frame'])
+        if key == 'files_on_screen':
+            return analyzer._detect_files_on_screen(self['screen_text'])
+        if key == 'ui_elements':
+            return analyzer._detect_ui_elements(self['frame'])
+        if key == 'current_app':
+            return analyzer._identify_application(self['active_window'], self['screen_text'])
+        if key == 'available_actions':
+            return analyzer._get_available_actions(self['current_app'], self['files_on_screen'])
+        if key == 'context_type':
+            return self['current_app']
+        raise KeyError(key)
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            if key not in self._values:
+                start = time.perf_counter()
+                self._values[key] = self._compute(key)
+                self._analyzer.logger.debug(f"Screen facet '{key}' computed in {(time.perf_counter() - start) * 1000:.0f} ms")
+            return self._values[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+        except Exception as e:
+            self._analyzer.logger.error(f"Error computing screen facet '{key}': {e}")
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return key == 'timestamp' or key in self.FACETS
+
+    def __bool__(self) -> bool:
+        return True
+
+    def keys(self):
+        return ('timestamp',) + self.FACETS
+
+    @property
+    def computed(self) -> List[str]:
+        """Facets evaluated so far"""
+        return [key for key in self.FACETS if key in self._values]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Evaluate every facet (the old eager behaviour)"""
+        return {key: self.get(key) for key in self.keys()}
+
+
 class AdvancedScreenAnalyzer:
     """Advanced screen analyzer with OCR and context understanding"""
     
@@ -60,9 +135,17 @@ class AdvancedScreenAnalyzer:
         # Cache settings
         self.last_analysis = None
         self.analysis_cache_time = 1.0  # seconds
+        self._lazy_context = None
         
         # OCR settings
         self.ocr_config = '--psm 6'  # Assume uniform block of text
+        self.incremental_ocr = IncrementalOCR(config=self.ocr_config)
+        self.last_ocr = None  # OCRResult of the last frame (text plus word boxes)
+        
+        # Capture scope: 'window' (active window, optionally narrowed to a focus region) or 'desktop'
+        self.capture_scope = 'window'
+        self.focus_region = None  # FOCUS_REGIONS name or (left, top, right, bottom) fractions of the window
+        self.last_frame_scope = None
         
     def analyze_screen(self) -> Dict[str, Any]:
         """Perform comprehensive screen analysis"""
@@ -77,14 +160,17 @@ class AdvancedScreenAnalyzer:
             # Get active window info
             window_info = self._get_active_window_info()
             
+            # Capture once - OCR and UI element detection share the frame and its derived planes
+            frame = self._capture_frame(window_info)
+            
             # Extract screen text using OCR
-            screen_text = self._extract_screen_text()
+            screen_text = self._extract_screen_text(frame)
             
             # Detect files and folders on screen
             files_on_screen = self._detect_files_on_screen(screen_text)
             
             # Detect UI elements (buttons, links, etc.)
-            ui_elements = self._detect_ui_elements()
+            ui_elements = self._detect_ui_elements(frame)
             
             # Identify current application
             current_app = self._identify_application(window_info, screen_text)
@@ -119,6 +205,18 @@ class AdvancedScreenAnalyzer:
                 'context_type': 'unknown'
             }
     
+    def screen_context(self) -> LazyScreenContext:
+        """Lazily evaluated screen context - only the facets that are read get computed"""
+        current_time = time.time()
+        if self.last_analysis and current_time - self.last_analysis.get('timestamp', 0) < self.analysis_cache_time:
+            return LazyScreenContext(self, seed=self.last_analysis)
+        lazy = self._lazy_context
+        if lazy is not None and current_time - lazy['timestamp'] < self.analysis_cache_time:
+            # Share facets already computed for a command a moment ago
+            return lazy
+        self._lazy_context = LazyScreenContext(self)
+        return self._lazy_context
+    
     def _get_active_window_info(self) -> Optional[Dict]:
         """Get information about currently active window"""
         try:
@@ -153,6 +251,7 @@ class AdvancedScreenAnalyzer:
                 'title': window_text,
                 'hwnd': hwnd,
                 'rect': rect,
+                'bbox': rect,
                 'process_name': process_name,
                 'process_path': process_path,
                 'app_name': self._extract_app_name(window_text, process_name)
@@ -170,6 +269,8 @@ class AdvancedScreenAnalyzer:
                     'title': active_windows.title,
                     'rect': (active_windows.left, active_windows.top, 
                             active_windows.width, active_windows.height),
+                    'bbox': (active_windows.left, active_windows.top,
+                             active_windows.left + active_windows.width, active_windows.top + active_windows.height),
                     'app_name': self._extract_app_name(active_windows.title, "")
                 }
             return None
@@ -191,29 +292,43 @@ class AdvancedScreenAnalyzer:
         
         return window_title.strip()
     
-    def _extract_screen_text(self) -> str:
+    def set_capture_scope(self, scope: str = 'window', focus_region=None):
+        """Choose what gets captured and OCRed: the active window (default), a focus region of it, or the desktop"""
+        self.capture_scope = scope
+        self.focus_region = focus_region
+        self.last_analysis = None
+        self._lazy_context = None
+    
+    def _capture_frame(self, window_info: Optional[Dict] = None) -> Optional[ScreenFrame]:
+        """Capture the screen once for an analysis - by default only the active window"""
+        if not IMAGE_PROCESSING_AVAILABLE:
+            return None
+        if self.capture_scope == 'desktop':
+            frame = ScreenFrame.capture()
+        else:
+            if window_info is None:
+                window_info = self._get_active_window_info()
+            frame = ScreenFrame.capture_scoped(window_info, self.focus_region)
+        if frame is not None:
+            self.last_frame_scope = frame.scope
+        return frame
+    
+    def _extract_screen_text(self, frame: Optional[ScreenFrame] = None) -> str:
         """Extract text from current screen using OCR"""
         try:
             if not OCR_AVAILABLE or not IMAGE_PROCESSING_AVAILABLE:
                 return ""
             
-            # Capture screen
-            screenshot = ImageGrab.grab()
-            
-            # Convert to OpenCV format
-            img_array = np.array(screenshot)
-            img = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-            
-            # Preprocess image for better OCR
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            
-            # Apply thresholding
-            _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            if frame is None:
+                frame = self._capture_frame()
+            if frame is None:
+                return ""
             
-            # Perform OCR
-            text = pytesseract.image_to_string(thresh, config=self.ocr_config)
+            # Otsu-thresholded grayscale (shared with other detectors via the frame);
+            # only tiles whose pixels changed since earlier frames are re-OCRed
+            self.last_ocr = self.incremental_ocr.recognize(frame.thresholded)
             
-            return text.strip()
+            return self.last_ocr.text.strip()
             
         except Exception as e:
             self.logger.debug(f"OCR error (expected if Tesseract not installed): {e}")
@@ -282,7 +397,7 @@ class AdvancedScreenAnalyzer:
         
         return unique_files
     
-    def _detect_ui_elements(self) -> List[Dict[str, Any]]:
+    def _detect_ui_elements(self, frame: Optional[ScreenFrame] = None) -> List[Dict[str, Any]]:
         """Detect UI elements like buttons, links, etc."""
         elements = []
         
@@ -290,31 +405,24 @@ class AdvancedScreenAnalyzer:
             return elements
         
         try:
-            # Capture screen
-            screenshot = ImageGrab.grab()
-            img_array = np.array(screenshot)
-            img = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-            
-            # Convert to grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            if frame is None:
+                frame = self._capture_frame()
+            if frame is None:
+                return elements
             
-            # Detect edges
-            edges = cv2.Canny(gray, 50, 150)
+            # Contour rects from the frame's shared, downscaled edge map (full-resolution coordinates)
+            rects = frame.pyramid.rects(DETECTION_SCALE)
             
-            # Find contours
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            for contour in contours:
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Filter for button-like elements
-                if 50 <= w <= 400 and 20 <= h <= 100:
-                    elements.append({
-                        'type': 'button',
-                        'rect': (x, y, w, h),
-                        'center': (x + w//2, y + h//2),
-                        'area': w * h
-                    })
+            # Filter for button-like elements
+            for x, y, w, h in rects[size_mask(rects, (50, 400), (20, 100))].tolist():
+                # Frame coordinates -> screen coordinates (the frame may be one window)
+                x, y = frame.to_screen(x, y)
+                elements.append({
+                    'type': 'button',
+                    'rect': (x, y, w, h),
+                    'center': (x + w//2, y + h//2),
+                    'area': w * h
+                })
             
             # Sort by area (larger elements first)
             elements.sort(key=lambda x: x['area'], reverse=True)
@@ -395,9 +503,10 @@ class AdvancedScreenAnalyzer:
         
         return list(set(actions))  # Remove duplicates
     
-    def find_file_on_screen(self, file_name: str) -> Optional[Dict[str, Any]]:
-        """Find a specific file on screen"""
-        context = self.analyze_screen()
+    def find_file_on_screen(self, file_name: str, context=None) -> Optional[Dict[str, Any]]:
+        """Find a specific file on screen (only OCR is needed, not the full analysis)"""
+        if context is None:
+            context = self.screen_context()
         files = context.get('files_on_screen', [])
         
         # Fuzzy match
@@ -447,6 +556,11 @@ class AdvancedScreenAnalyzer:
             'ocr_available': OCR_AVAILABLE,
             'window_management_available': WINDOW_MANAGEMENT_AVAILABLE,
             'windows_apis_available': WINDOWS_APIS_AVAILABLE,
-            'last_analysis_time': self.last_analysis.get('timestamp', 0) if self.last_analysis else 0
+            'last_analysis_time': self.last_analysis.get('timestamp', 0) if self.last_analysis else 0,
+            'capture_scope': self.capture_scope,
+            'focus_region': self.focus_region,
+            'last_frame_scope': self.last_frame_scope,
+            'incremental_ocr': self.incremental_ocr.get_stats(),
+            'ocr_service': get_ocr_service().get_stats()
         }
 
@@ -0,0 +1,301 @@
+"""
+Binary App Catalog for EchoOS
+Compact, memory-mappable form of apps.json: interned strings, fixed-width records and a prebuilt lookup hash index
+"""
+
+import logging
+import mmap
+import os
+import struct
+import zlib
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'ECAT'
+VERSION = 2
+NONE = 0xFFFFFFFF
+
+# magic, version, reserved, strings, records, buckets, then section offsets and the source JSON's mtime
+HEADER = struct.Struct('<4sHHIIIQQQQQq')
+# name, exec, category, icon (string ids), first alias slot, alias count
+RECORD = struct.Struct('<IIIIII')
+# key string id, first candidate slot, candidate count
+BUCKET = struct.Struct('<III')
+U32 = struct.Struct('<I')
+SPAN = struct.Struct('<II')
+
+
+def key_variants(name: str) -> List[str]:
+    """Lookup keys for a name or alias: as spoken, and without spaces or hyphens"""
+    name = name.lower().strip()
+    if not name:
+        return []
+    keys = [name]
+    for stripped in (name.replace(' ', ''), name.replace('-', '')):
+        if stripped != name:
+            keys.append(stripped)
+    return keys
+
+
+def app_keys(app: Dict[str, Any]) -> List[str]:
+    """Every lookup key of one app entry, name first"""
+    keys = []
+    for name in [app.get('name', '')] + list(app.get('aliases') or []):
+        if isinstance(name, str):
+            keys.extend(key_variants(name))
+    return keys
+
+
+def catalog_path(json_path: str) -> str:
+    """Where the binary catalog for a given apps.json lives"""
+    return os.path.splitext(json_path)[0] + '.catalog'
+
+
+def write_catalog(path: str, apps: List[Dict[str, Any]], source_mtime_ns: int = 0) -> bool:
+    """Write `apps` as a binary catalog (atomically, via a temp file). Returns True on success."""
+    strings: List[bytes] = []
+    ids: Dict[str, int] = {}
+
+    def intern(value) -> int:
+        if not isinstance(value, str):
+            return NONE
+        sid = ids.get(value)
+        if sid is None:
+            sid = ids[value] = len(strings)
+            strings.append(value.encode('utf-8'))
+        return sid
+
+    records = bytearray()
+    alias_ids = bytearray()
+    alias_count = 0
+    keys: Dict[str, List[int]] = {}
+    for index, app in enumerate(apps):
+        aliases = []
+        for alias in app.get('aliases') or []:
+            if isinstance(alias, str) and alias not in aliases:
+                aliases.append(alias)
+        records += RECORD.pack(intern(app.get('name', '')), intern(app.get('exec') or app.get('path') or ''),
+                               intern(app.get('category')), intern(app.get('icon')), alias_count, len(aliases))
+        for alias in aliases:
+            alias_ids += U32.pack(intern(alias))
+        alias_count += len(aliases)
+        for key in app_keys(app):
+            indices = keys.setdefault(key, [])
+            if not indices or indices[-1] != index:
+                indices.append(index)
+
+    key_ids = {key: intern(key) for key in keys}
+
+    # Every app a key names, later entries first: readers take the first one whose executable
+    # still exists, which is the app the JSON loader's last-usable-wins dict ends up with
+    candidates = bytearray()
+    spans: Dict[str, tuple] = {}
+    for key, indices in keys.items():
+        spans[key] = (len(candidates) // U32.size, len(indices))
+        for index in reversed(indices):
+            candidates += U32.pack(index)
+
+    # Open-addressing hash index, at most half full
+    buckets = 8
+    while buckets < 2 * len(keys):
+        buckets *= 2
+    table = [(NONE, 0, 0)] * buckets
+    for key in keys:
+        slot = zlib.crc32(key.encode('utf-8')) & (buckets - 1)
+        while table[slot][0] != NONE:
+            slot = (slot + 1) & (buckets - 1)
+        table[slot] = (key_ids[key],) + spans[key]
+
+    offsets = bytearray()
+    position = 0
+    for data in strings:
+        offsets += U32.pack(position)
+        position += len(data)
+    offsets += U32.pack(position)
+    blob = b''.join(strings)
+
+    strings_offset = HEADER.size
+    records_offset = strings_offset + len(offsets) + len(blob)
+    aliases_offset = records_offset + len(records)
+    candidates_offset = aliases_offset + len(alias_ids)
+    index_offset = candidates_offset + len(candidates)
+    header = HEADER.pack(MAGIC, VERSION, 0, len(strings), len(apps), buckets, strings_offset,
+                         records_offset, aliases_offset, candidates_offset, index_offset, source_mtime_ns)
+
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(offsets)
+            f.write(blob)
+            f.write(records)
+            f.write(alias_ids)
+            f.write(candidates)
+            for entry in table:
+                f.write(BUCKET.pack(*entry))
+        os.replace(tmp_path, path)
+        logger.info(f"Wrote app catalog {path}: {len(apps)} apps, {len(strings)} strings, {len(keys)} keys")
+        return True
+    except OSError as e:
+        # e.g. on Windows while another process still has the old catalog mapped
+        logger.warning(f"Could not write app catalog {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+class AppCatalog:
+    """Read-only, memory-mapped view of a binary app catalog.
+
+    Opening only maps the file and reads the header; strings are decoded
+    when a lookup or caller actually touches them, so a cold start costs
+    microseconds and untouched pages are never read into memory.
+    """
+
+    def __init__(self, path: str, mapped: "mmap.mmap"):
+        self.path = path
+        self._map = mapped
+        (magic, version, _, self.string_count, self.record_count, self.bucket_count, self._strings,
+         self._records, self._aliases, self._candidates, self._index, self.source_mtime_ns) = HEADER.unpack_from(mapped, 0)
+        self._blob = self._strings + U32.size * (self.string_count + 1)
+
+    @classmethod
+    def open(cls, path: str) -> Optional["AppCatalog"]:
+        """Map a catalog file; None if it is missing or not a valid catalog"""
+        try:
+            # The mapping keeps its own handle, so the file can be closed right away
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not map app catalog {path}: {e}")
+            return None
+        try:
+            magic, version = struct.unpack_from('<4sH', mapped, 0)
+        except struct.error:
+            magic, version = None, None
+        if magic != MAGIC or version != VERSION:
+            mapped.close()
+            return None
+        return cls(path, mapped)
+
+    def close(self):
+        self._map.close()
+
+    def __len__(self):
+        return self.record_count
+
+    # Field decoding
+    def _string_bytes(self, sid: int) -> bytes:
+        start, end = SPAN.unpack_from(self._map, self._strings + U32.size * sid)
+        return self._map[self._blob + start:self._blob + end]
+
+    def string(self, sid: int) -> Optional[str]:
+        if sid == NONE:
+            return None
+        return self._string_bytes(sid).decode('utf-8')
+
+    def _record(self, index: int):
+        return RECORD.unpack_from(self._map, self._records + RECORD.size * index)
+
+    def name(self, index: int) -> str:
+        return self.string(self._record(index)[0])
+
+    def exec_path(self, index: int) -> str:
+        return self.string(self._record(index)[1])
+
+    def aliases(self, index: int) -> List[str]:
+        first, count = self._record(index)[4:]
+        return [self.string(U32.unpack_from(self._map, self._aliases + U32.size * (first + i))[0]) for i in range(count)]
+
+    def app(self, index: int) -> Dict[str, Any]:
+        """One record decoded into the apps.json entry shape"""
+        name, exec_path, category, icon, _, _ = self._record(index)
+        return {
+            'name': self.string(name),
+            'exec': self.string(exec_path),
+            'aliases': self.aliases(index),
+            'category': self.string(category),
+            'icon': self.string(icon)
+        }
+
+    def apps(self) -> List[Dict[str, Any]]:
+        return [self.app(i) for i in range(self.record_count)]
+
+    # Index
+    def candidates(self, key: str) -> List[int]:
+        """Record indices for an exact lookup key, later apps.json entries first (empty if unknown)"""
+        encoded = key.encode('utf-8')
+        mask = self.bucket_count - 1
+        slot = zlib.crc32(encoded) & mask
+        for _ in range(self.bucket_count):
+            key_sid, first, count = BUCKET.unpack_from(self._map, self._index + BUCKET.size * slot)
+            if key_sid == NONE:
+                return []
+            if self._string_bytes(key_sid) == encoded:
+                return [U32.unpack_from(self._map, self._candidates + U32.size * (first + i))[0] for i in range(count)]
+            slot = (slot + 1) & mask
+        return []
+
+    def find(self, key: str) -> Optional[int]:
+        """Record index for an exact lookup key (the last app that claims it), or None"""
+        candidates = self.candidates(key)
+        return candidates[0] if candidates else None
+
+    def keys(self) -> Iterator[str]:
+        """Every lookup key (decodes the whole index - only for callers that need them all)"""
+        for slot in range(self.bucket_count):
+            key_sid = BUCKET.unpack_from(self._map, self._index + BUCKET.size * slot)[0]
+            if key_sid != NONE:
+                yield self.string(key_sid)
+
+
+class CatalogPaths(Mapping):
+    """Lookup key -> executable, read straight from a catalog.
+
+    Behaves like the name -> path dicts executors used to build. With
+    `verify`, apps whose executable no longer exists are skipped (checked on
+    first touch and remembered): a key shared by several apps resolves to the
+    last one that still exists, exactly as the JSON loader resolves it.
+    """
+
+    def __init__(self, catalog: AppCatalog, verify: bool = True):
+        self._catalog = catalog
+        self._verify = verify
+        self._exists: Dict[str, bool] = {}
+        self._keys: Optional[List[str]] = None
+
+    def _usable(self, exec_path: str) -> bool:
+        if not exec_path:
+            return False
+        if not self._verify:
+            return True
+        exists = self._exists.get(exec_path)
+        if exists is None:
+            exists = self._exists[exec_path] = os.path.exists(exec_path)
+        return exists
+
+    def __getitem__(self, key: str) -> str:
+        for index in self._catalog.candidates(key) if isinstance(key, str) else []:
+            exec_path = self._catalog.exec_path(index)
+            if self._usable(exec_path):
+                return exec_path
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        if self._keys is None:
+            self._keys = [key for key in self._catalog.keys() if key in self]
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(list(iter(self)))
@@ -1,16 +1,44 @@
 import platform
 import os
 import json
+import hashlib
 import pathlib
 import subprocess
+import threading
+import time
 import winreg
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import List, Dict, Set
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
+from .app_catalog import catalog_path, write_catalog
+from .app_registry import AppRegistry
+from .dir_scan import SCAN_DEPTH, find_primary, is_helper_executable, is_ignored_dir
+from .discovery_cache import CACHE_FILE, DiscoveryCache
+
 logger = logging.getLogger(__name__)
 
+# Seconds each discovery source may run before the scan moves on without it
+SOURCE_DEADLINES = {
+    "start_menu": 60,
+    "registry": 30,
+    "program_files": 120,
+    "system32": 10,
+    "portable": 60,
+    "store": 30,
+    "path": 30,
+    "powershell": 45,  # Its own subprocess timeout is 30s
+    "desktop": 30
+}
+DEFAULT_SOURCE_DEADLINE = 60
+# Sources whose apps' executables were just seen on disk by the scan itself (no exists check needed)
+CONFIRMING_SOURCES = {"program_files", "portable", "path"}
+DISCOVERY_WORKERS = 8
+# Threads listing directories within one large tree (Program Files, portable app folders)
+SCAN_WORKERS = 4
+
 def resolve_lnk(path):
     """Resolve Windows shortcut (.lnk) files to their target paths"""
     try:
@@ -26,147 +54,223 @@ def resolve_lnk(path):
 class AppDiscovery:
     """Comprehensive application discovery system for all platforms"""
     
-    def __init__(self):
+    def __init__(self, cache_path=CACHE_FILE, scan_depth=SCAN_DEPTH, scan_workers=SCAN_WORKERS):
         self.system = platform.system().lower()
         self.discovered_apps = []
         self.seen_names = set()
+        # Directory-level scan results from earlier runs; only changed directories are listed again
+        self.cache = DiscoveryCache(cache_path)
+        self._scan_lock = threading.Lock()
+        self._confirmed = set()  # Executables the scan itself just saw on disk
+        self.source_deadlines = dict(SOURCE_DEADLINES)
+        self.scan_depth = scan_depth
+        self.scan_workers = scan_workers
+        self._registry = None  # Receives partial results while a scan runs
+        self._previous_apps = []
+        self._partial_published = False
+        self._source_results = {}
+        self.last_scan = {}
         
     def discover_and_save(self, out="config/apps.json"):
         """Discover all applications and save to JSON file"""
-        logger.info("Starting comprehensive application discovery...")
-        
-        if self.system == "windows":
-            apps = self._discover_windows()
-        elif self.system == "darwin":
-            apps = self._discover_mac()
-        else:
-            apps = self._discover_linux()
-        
-        # Save to file
-        output_data = {
-            "apps": apps,
-            "total_count": len(apps),
-            "discovery_date": str(pathlib.Path().cwd()),
-            "system": self.system
-        }
-        
-        pathlib.Path(out).write_text(json.dumps(output_data, indent=2))
-        logger.info(f"Discovered {len(apps)} applications and saved to {out}")
-        return apps
+        with self._scan_lock:
+            logger.info("Starting comprehensive application discovery...")
+            start = time.perf_counter()
+            self.cache.reset_stats()
+            # Per-run objects: a source abandoned at its deadline only ever writes to its own run's
+            self._confirmed = set()
+            registry = AppRegistry.instance()
+            self._registry = registry if os.path.abspath(out) == os.path.abspath(registry.path) else None
+            # What the last scan found; sources that fail or miss their deadline keep these apps
+            self._previous_apps = self.discovered_apps or (self._registry.apps if self._registry else [])
+            self._partial_published = False
+            self._source_results = {}
+            self.cache.begin_run()
+            
+            try:
+                if self.system == "windows":
+                    apps = self._discover_windows()
+                elif self.system == "darwin":
+                    apps = self._discover_mac()
+                else:
+                    apps = self._discover_linux()
+            finally:
+                # Late scans from abandoned sources can no longer touch the cache
+                self.cache.end_run()
+            
+            # A rescan that finds exactly what is already in apps.json leaves the file, the catalog
+            # and the registry's subscribers (e.g. the recognizer's grammar) alone
+            fingerprint = hashlib.blake2b(json.dumps(apps, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+            out_stat = self.cache.stat(out)
+            changed = (fingerprint != self.cache.fingerprint or out_stat is None
+                       or out_stat.st_mtime_ns != self.cache.output_mtime_ns)
+            
+            if changed:
+                # Save to file
+                output_data = {
+                    "apps": apps,
+                    "total_count": len(apps),
+                    "discovery_date": str(pathlib.Path().cwd()),
+                    "system": self.system
+                }
+                
+                pathlib.Path(out).write_text(json.dumps(output_data, indent=2))
+                logger.info(f"Discovered {len(apps)} applications and saved to {out}")
+                
+                # Hand the fresh list to every executor through the shared registry (no re-reading the file),
+                # then write the binary catalog the next start maps instead of parsing the JSON
+                if self._registry:
+                    self._registry.publish(apps)
+                out_mtime_ns = pathlib.Path(out).stat().st_mtime_ns
+                write_catalog(catalog_path(out), apps, out_mtime_ns)
+                self.cache.fingerprint = fingerprint
+                self.cache.output_mtime_ns = out_mtime_ns
+            else:
+                logger.info(f"Discovered {len(apps)} applications, unchanged since the last scan")
+                if self._registry and self._partial_published:
+                    self._registry.publish(apps)
+            self.cache.save()
+            
+            self.discovered_apps = apps
+            self._registry = None
+            self.last_scan = dict(self.cache.get_stats(), apps=len(apps), changed=changed,
+                                  duration_ms=(time.perf_counter() - start) * 1000, finished_at=time.time(),
+                                  source_results=dict(self._source_results))
+            logger.info(f"Discovery took {self.last_scan['duration_ms']:.0f} ms: {self.last_scan['stat_calls']} stat calls, "
+                        f"{self.last_scan['dir_listings']} directories listed, {self.last_scan['dirs_reused']} reused")
+            return apps
+    
+    def get_stats(self):
+        """Filesystem work and outcome of the last discovery run"""
+        return dict(self.last_scan)
     
     def _discover_windows(self):
         """Comprehensive Windows application discovery"""
         logger.info("Discovering Windows applications...")
-        apps = []
-        
-        try:
-            # 1. Start Menu shortcuts (user and system)
-            logger.info("Scanning Start Menu shortcuts...")
-            apps.extend(self._discover_start_menu())
-            logger.info(f"Found {len(apps)} apps from Start Menu")
-        except Exception as e:
-            logger.warning(f"Error scanning Start Menu: {e}")
-        
-        try:
-            # 2. Registry-based discovery
-            logger.info("Scanning Windows Registry...")
-            registry_apps = self._discover_registry_apps()
-            apps.extend(registry_apps)
-            logger.info(f"Found {len(registry_apps)} apps from Registry")
-        except Exception as e:
-            logger.warning(f"Error scanning Registry: {e}")
-        
-        try:
-            # 3. Program Files directories
-            logger.info("Scanning Program Files...")
-            program_apps = self._discover_program_files()
-            apps.extend(program_apps)
-            logger.info(f"Found {len(program_apps)} apps from Program Files")
-        except Exception as e:
-            logger.warning(f"Error scanning Program Files: {e}")
-        
-        try:
-            # 4. System32 applications
-            logger.info("Scanning System32...")
-            system_apps = self._discover_system32_apps()
-            apps.extend(system_apps)
-            logger.info(f"Found {len(system_apps)} system apps")
-        except Exception as e:
-            logger.warning(f"Error scanning System32: {e}")
-        
-        try:
-            # 5. Portable applications
-            logger.info("Scanning portable applications...")
-            portable_apps = self._discover_portable_apps()
-            apps.extend(portable_apps)
-            logger.info(f"Found {len(portable_apps)} portable apps")
-        except Exception as e:
-            logger.warning(f"Error scanning portable apps: {e}")
-        
-        try:
-            # 6. Microsoft Store apps (may fail due to permissions)
-            logger.info("Scanning Microsoft Store apps...")
-            store_apps = self._discover_store_apps()
-            apps.extend(store_apps)
-            logger.info(f"Found {len(store_apps)} Store apps")
-        except Exception as e:
-            logger.warning(f"Error scanning Store apps: {e}")
-        
-        try:
-            # 7. Environment PATH applications
-            logger.info("Scanning PATH applications...")
-            path_apps = self._discover_path_apps()
-            apps.extend(path_apps)
-            logger.info(f"Found {len(path_apps)} PATH apps")
-        except Exception as e:
-            logger.warning(f"Error scanning PATH apps: {e}")
         
-        try:
-            # 8. PowerShell-based discovery (fallback)
-            logger.info("Using PowerShell for additional discovery...")
-            ps_apps = self._discover_powershell_apps()
-            apps.extend(ps_apps)
-            logger.info(f"Found {len(ps_apps)} apps via PowerShell")
-        except Exception as e:
-            logger.warning(f"Error using PowerShell discovery: {e}")
+        # (source, category of the apps it finds, scanner); Store apps may fail due to permissions,
+        # PowerShell is a slow fallback - neither holds up the others
+        sources = [
+            ("start_menu", "start_menu", self._discover_start_menu),
+            ("registry", "installed", self._discover_registry_apps),
+            ("program_files", "program_files", self._discover_program_files),
+            ("system32", "system", self._discover_system32_apps),
+            ("portable", "portable", self._discover_portable_apps),
+            ("store", "store", self._discover_store_apps),
+            ("path", "path", self._discover_path_apps),
+            ("powershell", "powershell", self._discover_powershell_apps)
+        ]
+        apps = self._run_sources(sources)
         
         # Remove duplicates and clean up
         logger.info(f"Total apps found before deduplication: {len(apps)}")
         return self._clean_and_deduplicate(apps)
     
+    def _run_sources(self, sources):
+        """Run discovery sources concurrently, each against its own deadline.
+        
+        Whenever a source finishes with something new, the apps found so far
+        (plus the last scan's apps of sources still running) are published to
+        the registry, so a slow source never delays apps from fast ones
+        becoming launchable. A source that fails or misses its deadline is
+        abandoned and the last scan's apps of its category are kept. Results
+        are merged in source order, whatever order the sources finish in.
+        """
+        results = {}
+        confirmed, source_results = self._confirmed, self._source_results
+        start = time.monotonic()
+        pool = ThreadPoolExecutor(max_workers=min(DISCOVERY_WORKERS, len(sources)), thread_name_prefix="app-discovery")
+        futures = {pool.submit(self._run_source, name, scan, source_results): name for name, _, scan in sources}
+        deadlines = {name: start + self.source_deadlines.get(name.split(":")[0], DEFAULT_SOURCE_DEADLINE)
+                     for name, _, _ in sources}
+        pending = set(futures)
+        try:
+            while pending:
+                # Wake up for the next finished source or the nearest deadline
+                timeout = max(0.0, min(deadlines[futures[f]] for f in pending) - time.monotonic())
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                news = False
+                for future in done:
+                    name = futures[future]
+                    try:
+                        results[name] = future.result()
+                        if name in CONFIRMING_SOURCES:
+                            confirmed.update(app["exec"] for app in results[name])
+                        news = news or self._source_changed(sources, name, results[name])
+                    except Exception as e:
+                        logger.warning(f"Error scanning {name}: {e}")
+                        source_results[name] = {"status": "failed", "error": str(e)}
+                now = time.monotonic()
+                for future in [f for f in pending if deadlines[futures[f]] <= now]:
+                    name = futures[future]
+                    logger.warning(f"Discovery source {name} missed its {deadlines[name] - start:.3g}s deadline, "
+                                   f"keeping its apps from the last scan")
+                    source_results[name] = {"status": "timeout"}
+                    future.cancel()
+                    pending.discard(future)
+                if news and pending and self._registry:
+                    self._registry.publish(self._merge_sources(sources, results))
+                    self._partial_published = True
+        finally:
+            # Threads stuck in a late source finish on their own; their results are dropped, and
+            # their cache writes too once the run has ended
+            pool.shutdown(wait=False, cancel_futures=True)
+        return self._merge_sources(sources, results)
+    
+    def _run_source(self, name, scan, source_results):
+        start = time.perf_counter()
+        apps = scan()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if source_results.get(name, {}).get("status") != "timeout":
+            source_results[name] = {"status": "ok", "apps": len(apps), "ms": elapsed_ms}
+        logger.info(f"Found {len(apps)} apps from {name} ({elapsed_ms:.0f} ms)")
+        return apps
+    
+    def _merge_sources(self, sources, results):
+        """Apps of finished sources in source order, then the last scan's apps of categories still unfinished"""
+        apps = []
+        for name, _, _ in sources:
+            apps.extend(results.get(name, []))
+        unfinished = {category for name, category, _ in sources if name not in results}
+        apps.extend(app for app in self._previous_apps if app.get("category") in unfinished)
+        return apps
+    
+    def _source_changed(self, sources, name, apps):
+        """Whether a finished source found something other than the last scan did for its category"""
+        category = next(category for source, category, _ in sources if source == name)
+        shared = sum(1 for source, other, _ in sources if other == category)
+        found = {(app.get("name"), app.get("exec")) for app in apps}
+        before = {(app.get("name"), app.get("exec")) for app in self._previous_apps if app.get("category") == category}
+        # A category split over several sources (one per .desktop directory) only compares as a subset
+        return not found <= before if shared > 1 else found != before
+    
     def _discover_start_menu(self):
         """Discover applications from Start Menu shortcuts"""
-        apps = []
         start_dirs = [
             os.path.join(os.environ.get("APPDATA", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
             os.path.join(os.environ.get("PROGRAMDATA", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
             os.path.join(os.environ.get("USERPROFILE", ""), "AppData", "Roaming", "Microsoft", "Windows", "Start Menu", "Programs")
         ]
         
-        for start_dir in start_dirs:
-            if not os.path.isdir(start_dir):
-                continue
-                
-            for root, dirs, files in os.walk(start_dir):
-                for file in files:
-                    if file.lower().endswith(".lnk"):
-                        name = os.path.splitext(file)[0]
-                        full_path = os.path.join(root, file)
-                        target = resolve_lnk(full_path)
-                        
-                        if target and os.path.exists(target):
-                            # Create aliases from the name
-                            aliases = [name.lower(), name.lower().replace(" ", ""), name.lower().replace(" ", "-")]
-                            
-                            apps.append({
-                                "name": name,
-                                "exec": target,
-                                "aliases": aliases,
-                                "category": "start_menu",
-                                "icon": None
-                            })
+        # Shortcuts are only resolved when new or changed; unchanged Start Menu folders are not even listed
+        return self.cache.scan("start_menu", start_dirs, lambda file: file.lower().endswith(".lnk"), self._start_menu_app)
+    
+    def _start_menu_app(self, full_path, file):
+        name = os.path.splitext(file)[0]
+        target = resolve_lnk(full_path)
         
-        return apps
+        if target and self.cache.exists(target):
+            # Create aliases from the name
+            aliases = [name.lower(), name.lower().replace(" ", ""), name.lower().replace(" ", "-")]
+            
+            return {
+                "name": name,
+                "exec": target,
+                "aliases": aliases,
+                "category": "start_menu",
+                "icon": None
+            }
+        return None
     
     def _discover_registry_apps(self):
         """Discover applications from Windows Registry"""
@@ -220,43 +324,47 @@ class AppDiscovery:
     
     def _discover_program_files(self):
         """Discover applications from Program Files directories"""
-        apps = []
         program_dirs = [
             os.environ.get("PROGRAMFILES", "C:\\Program Files"),
             os.environ.get("PROGRAMFILES(X86)", "C:\\Program Files (x86)"),
             os.path.join(os.environ.get("USERPROFILE", ""), "AppData", "Local", "Programs")
         ]
         
-        for program_dir in program_dirs:
-            if not os.path.exists(program_dir):
-                continue
-                
-            for root, dirs, files in os.walk(program_dir):
-                for file in files:
-                    if file.lower().endswith((".exe", ".bat", ".cmd")):
-                        full_path = os.path.join(root, file)
-                        name = os.path.splitext(file)[0]
-                        
-                        # Skip system files and common non-app executables
-                        if self._is_system_file(name):
-                            continue
-                        
-                        aliases = [
-                            name.lower(),
-                            name.lower().replace(" ", ""),
-                            name.lower().replace(" ", "-")
-                        ]
-                        
-                        apps.append({
-                            "name": name,
-                            "exec": full_path,
-                            "aliases": aliases,
-                            "category": "program_files",
-                            "icon": None
-                        })
-        
+        # Depth-limited and pruned: no descending into node_modules, locales or resources,
+        # nor below the folder where an app's main executable sits
+        apps = self.cache.scan("program_files", program_dirs,
+                               lambda file: file.lower().endswith((".exe", ".bat", ".cmd")),
+                               lambda full_path, file: self._executable_app(full_path, file, "program_files"),
+                               max_depth=self.scan_depth, ignore=is_ignored_dir,
+                               stop_when=self._has_primary_executable, workers=self.scan_workers)
         return apps
     
+    def _has_primary_executable(self, apps):
+        """Whether a folder's apps include more than uninstallers, updaters and crash handlers"""
+        return any(not is_helper_executable(os.path.basename(app["exec"])) for app in apps)
+    
+    def _executable_app(self, full_path, file, category):
+        """App entry for an executable found on disk"""
+        name = os.path.splitext(file)[0]
+        
+        # Skip system files and common non-app executables
+        if self._is_system_file(name):
+            return None
+        
+        aliases = [
+            name.lower(),
+            name.lower().replace(" ", ""),
+            name.lower().replace(" ", "-")
+        ]
+        
+        return {
+            "name": name,
+            "exec": full_path,
+            "aliases": aliases,
+            "category": category,
+            "icon": None
+        }
+    
     def _discover_system32_apps(self):
         """Discover system applications from System32"""
         apps = []
@@ -290,8 +398,6 @@ class AppDiscovery:
     
     def _discover_portable_apps(self):
         """Discover portable applications from common locations"""
-        apps = []
-        
         # Universal portable app directories
         portable_dirs = []
         
@@ -330,30 +436,11 @@ class AppDiscovery:
                 "/snap/bin"
             ])
         
-        for portable_dir in portable_dirs:
-            if not os.path.exists(portable_dir):
-                continue
-                
-            for root, dirs, files in os.walk(portable_dir):
-                for file in files:
-                    if file.lower().endswith(".exe") and not self._is_system_file(file):
-                        full_path = os.path.join(root, file)
-                        name = os.path.splitext(file)[0]
-                        
-                        aliases = [
-                            name.lower(),
-                            name.lower().replace(" ", ""),
-                            name.lower().replace(" ", "-")
-                        ]
-                        
-                        apps.append({
-                            "name": name,
-                            "exec": full_path,
-                            "aliases": aliases,
-                            "category": "portable",
-                            "icon": None
-                        })
-        
+        apps = self.cache.scan("portable", portable_dirs,
+                               lambda file: file.lower().endswith(".exe"),
+                               lambda full_path, file: self._executable_app(full_path, file, "portable"),
+                               max_depth=self.scan_depth, ignore=is_ignored_dir,
+                               stop_when=self._has_primary_executable, workers=self.scan_workers)
         return apps
     
     def _discover_store_apps(self):
@@ -395,34 +482,28 @@ class AppDiscovery:
     
     def _discover_path_apps(self):
         """Discover applications from PATH environment variable"""
-        apps = []
         path_dirs = os.environ.get("PATH", "").split(os.pathsep)
         
-        for path_dir in path_dirs:
-            if not os.path.exists(path_dir):
-                continue
-                
-            try:
-                for file in os.listdir(path_dir):
-                    if file.lower().endswith((".exe", ".bat", ".cmd")):
-                        full_path = os.path.join(path_dir, file)
-                        name = os.path.splitext(file)[0]
-                        
-                        if not self._is_system_file(name):
-                            aliases = [name.lower(), name.lower().replace(" ", "")]
-                            
-                            apps.append({
-                                "name": name,
-                                "exec": full_path,
-                                "aliases": aliases,
-                                "category": "path",
-                                "icon": None
-                            })
-            except (OSError, PermissionError):
-                continue
-        
+        apps = self.cache.scan("path", path_dirs,
+                               lambda file: file.lower().endswith((".exe", ".bat", ".cmd")),
+                               self._path_app, recursive=False)
         return apps
     
+    def _path_app(self, full_path, file):
+        name = os.path.splitext(file)[0]
+        
+        if self._is_system_file(name):
+            return None
+        aliases = [name.lower(), name.lower().replace(" ", "")]
+        
+        return {
+            "name": name,
+            "exec": full_path,
+            "aliases": aliases,
+            "category": "path",
+            "icon": None
+        }
+    
     def _discover_powershell_apps(self):
         """Discover applications using PowerShell (Windows fallback)"""
         apps = []
@@ -530,7 +611,6 @@ class AppDiscovery:
     def _discover_linux(self):
         """Comprehensive Linux application discovery"""
         logger.info("Discovering Linux applications...")
-        apps = []
         
         # Desktop files
         desktop_dirs = [
@@ -540,64 +620,59 @@ class AppDiscovery:
             "/var/lib/snapd/desktop/applications"
         ]
         
-        for desktop_dir in desktop_dirs:
-            if not os.path.exists(desktop_dir):
-                continue
-                
-            for file in os.listdir(desktop_dir):
-                if file.endswith(".desktop"):
-                    desktop_path = os.path.join(desktop_dir, file)
-                    
-                    try:
-                        with open(desktop_path, "r", encoding="utf-8", errors="ignore") as f:
-                            content = f.read()
-                        
-                        name = None
-                        exec_cmd = None
-                        icon = None
-                        categories = []
-                        
-                        for line in content.splitlines():
-                            if line.startswith("Name="):
-                                name = line.split("=", 1)[1].strip()
-                            elif line.startswith("Exec="):
-                                exec_cmd = line.split("=", 1)[1].strip().split("%")[0].strip()
-                            elif line.startswith("Icon="):
-                                icon = line.split("=", 1)[1].strip()
-                            elif line.startswith("Categories="):
-                                categories = line.split("=", 1)[1].strip().split(";")
-                        
-                        if name and exec_cmd:
-                            aliases = [
-                                name.lower(),
-                                name.lower().replace(" ", ""),
-                                name.lower().replace(" ", "-")
-                            ]
-                            
-                            apps.append({
-                                "name": name,
-                                "exec": exec_cmd,
-                                "aliases": aliases,
-                                "category": "desktop",
-                                "icon": icon
-                            })
-                    except Exception as e:
-                        logger.debug(f"Error reading desktop file {desktop_path}: {e}")
-                        continue
-        
-        return apps
+        # One source per directory; only new or modified .desktop files are parsed again
+        sources = [(f"desktop:{desktop_dir}", "desktop", lambda desktop_dir=desktop_dir: self._discover_desktop_dir(desktop_dir))
+                   for desktop_dir in desktop_dirs]
+        return self._run_sources(sources)
     
-    def _find_executable_in_dir(self, directory):
-        """Find the first executable file in a directory"""
-        if not os.path.exists(directory):
+    def _discover_desktop_dir(self, desktop_dir):
+        return self.cache.scan(f"desktop:{desktop_dir}", [desktop_dir], lambda file: file.endswith(".desktop"),
+                               self._desktop_app, recursive=False)
+    
+    def _desktop_app(self, desktop_path, file):
+        """Parse one .desktop file into an app entry"""
+        try:
+            with open(desktop_path, "r", encoding="utf-8", errors="ignore") as f:
+                content = f.read()
+        except Exception as e:
+            logger.debug(f"Error reading desktop file {desktop_path}: {e}")
             return None
         
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if file.lower().endswith((".exe", ".bat", ".cmd")):
-                    return os.path.join(root, file)
+        name = None
+        exec_cmd = None
+        icon = None
+        categories = []
+        
+        for line in content.splitlines():
+            if line.startswith("Name="):
+                name = line.split("=", 1)[1].strip()
+            elif line.startswith("Exec="):
+                exec_cmd = line.split("=", 1)[1].strip().split("%")[0].strip()
+            elif line.startswith("Icon="):
+                icon = line.split("=", 1)[1].strip()
+            elif line.startswith("Categories="):
+                categories = line.split("=", 1)[1].strip().split(";")
+        
+        if name and exec_cmd:
+            aliases = [
+                name.lower(),
+                name.lower().replace(" ", ""),
+                name.lower().replace(" ", "-")
+            ]
+            
+            return {
+                "name": name,
+                "exec": exec_cmd,
+                "aliases": aliases,
+                "category": "desktop",
+                "icon": icon
+            }
         return None
     
+    def _find_executable_in_dir(self, directory):
+        """Find the main executable in a directory (shallowest first, skipping helpers and resource folders)"""
+        return find_primary(directory, lambda file: file.lower().endswith((".exe", ".bat", ".cmd")), self.scan_depth)
+    
     def _is_system_file(self, filename):
         """Check if a file is a system file that shouldn't be launched directly"""
         system_files = {
@@ -623,7 +698,9 @@ class AppDiscovery:
             # Create a unique key based on name and executable path
             key = (app.get("name", "").lower(), app.get("exec", ""))
             
-            if key not in seen and app.get("exec") and os.path.exists(app.get("exec", "")):
+            # Executables the scan itself listed are known to exist; only the rest cost a stat
+            exec_path = app.get("exec")
+            if key not in seen and exec_path and (exec_path in self._confirmed or self.cache.exists(exec_path)):
                 seen.add(key)
                 cleaned_apps.append(app)
         
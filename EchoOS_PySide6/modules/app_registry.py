@@ -0,0 +1,246 @@
+"""
+App Registry for EchoOS
+Loads discovered applications once per process and serves exact, alias and fuzzy lookups
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from .app_catalog import AppCatalog, CatalogPaths, app_keys, catalog_path, key_variants, write_catalog
+from .fuzzy_index import FuzzyVocabulary
+
+APPS_FILE = "config/apps.json"
+
+
+class AppRegistry:
+    """Process-wide index of discovered apps.
+
+    apps.json is read and parsed once. Every name, alias and their
+    space/hyphen-free variants map to the app's executable in one dict, so
+    exact and alias lookups are O(1), and the same keys feed a FuzzyVocabulary
+    (built on the first fuzzy lookup) for near matches. Each (re)build swaps
+    in new objects, so readers never see a half-built index.
+
+    When the binary catalog next to apps.json is current, it is memory-mapped
+    instead of parsing the JSON: lookups go through its prebuilt hash index
+    and only the touched strings are decoded. After a JSON load the catalog
+    is rewritten so the next start can use it.
+
+    When `AppDiscovery.discover_and_save` finishes it publishes the fresh
+    list here and subscribers (executors, the recognizer's vocabulary) are
+    notified without anyone re-reading the file.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path: str = APPS_FILE, verify_paths: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.verify_paths = verify_paths  # Drop apps whose executable no longer exists
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._subscribers: List[Callable[["AppRegistry"], None]] = []
+        self._catalog: Optional[AppCatalog] = None
+        self._apps: Optional[List[Dict[str, Any]]] = []
+        self._paths: Mapping[str, str] = {}
+        self._names: Optional[List[str]] = []
+        self._fuzzy_ready = False
+        self.fuzzy_index = FuzzyVocabulary()
+        self.source = None  # 'catalog', 'json' or 'published'
+        self.version = 0
+        self.loaded_at = 0.0
+        self.last_build_ms = 0.0
+
+    @classmethod
+    def instance(cls) -> "AppRegistry":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    # Loading
+    @property
+    def catalog_path(self) -> str:
+        return catalog_path(self.path)
+
+    def ensure_loaded(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._load()
+
+    def _json_mtime_ns(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self):
+        """Map the binary catalog if it matches apps.json, otherwise parse the JSON and refresh the catalog"""
+        start = time.perf_counter()
+        mtime_ns = self._json_mtime_ns()
+        catalog = AppCatalog.open(self.catalog_path)
+        if catalog is not None and (mtime_ns is None or catalog.source_mtime_ns == mtime_ns):
+            self._use_catalog(catalog, start)
+            return
+        if catalog is not None:
+            catalog.close()
+        apps = self._read()
+        self._build(apps, source='json')
+        if mtime_ns is not None:
+            write_catalog(self.catalog_path, apps, mtime_ns)
+
+    def _use_catalog(self, catalog: AppCatalog, start: float):
+        self._release_catalog()
+        self._catalog = catalog
+        self._apps = None  # Decoded on demand
+        self._paths = CatalogPaths(catalog, verify=self.verify_paths)
+        self._names = None
+        self._fuzzy_ready = False
+        self.source = 'catalog'
+        self.version += 1
+        self.loaded_at = time.time()
+        self._loaded = True
+        self.last_build_ms = (time.perf_counter() - start) * 1000
+        self.logger.info(f"App registry: mapped catalog with {len(catalog)} apps ({self.last_build_ms:.2f} ms)")
+
+    def _release_catalog(self):
+        # Not closed explicitly: a reader may still be mid-lookup on the old mapping.
+        # The map is released as soon as the last reference goes away.
+        self._catalog = None
+
+    def _read(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('apps', [])
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            self.logger.error(f"Failed to load discovered apps from {self.path}: {e}")
+            return []
+
+    def _build(self, apps: List[Dict[str, Any]], source: str):
+        start = time.perf_counter()
+        paths: Dict[str, str] = {}
+        for app in apps:
+            exec_path = app.get('exec') or app.get('path') or ''
+            if not exec_path or (self.verify_paths and not os.path.exists(exec_path)):
+                continue
+            for key in app_keys(app):
+                paths[key] = exec_path
+        self._release_catalog()
+        self._apps = list(apps)
+        self._paths = paths
+        self._names = list(paths)
+        self._fuzzy_ready = False
+        self.source = source
+        self.version += 1
+        self.loaded_at = time.time()
+        self._loaded = True
+        self.last_build_ms = (time.perf_counter() - start) * 1000
+        self.logger.info(f"App registry: {len(apps)} apps, {len(paths)} lookup keys ({self.last_build_ms:.0f} ms)")
+
+    def publish(self, apps: List[Dict[str, Any]]):
+        """Replace the app list (e.g. right after discovery) and notify subscribers"""
+        with self._lock:
+            self._build(apps, source='published')
+        self._notify()
+
+    def reload(self):
+        """Re-read the apps file (e.g. after it was edited by hand) and notify subscribers"""
+        with self._lock:
+            self._release_catalog()
+            self._load()
+        self._notify()
+
+    # Change notifications
+    def subscribe(self, callback: Callable[["AppRegistry"], None]):
+        """Call `callback(registry)` whenever the app list changes"""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[["AppRegistry"], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _notify(self):
+        for callback in list(self._subscribers):
+            try:
+                callback(self)
+            except Exception as e:
+                self.logger.error(f"App registry subscriber failed: {e}")
+
+    # Lookups
+    @property
+    def apps(self) -> List[Dict[str, Any]]:
+        """Raw app entries, as in apps.json (decoded from the catalog on first access)"""
+        self.ensure_loaded()
+        apps = self._apps
+        if apps is None:
+            with self._lock:
+                if self._apps is None and self._catalog is not None:
+                    self._apps = self._catalog.apps()
+                apps = self._apps or []
+        return apps
+
+    @property
+    def paths(self) -> Mapping[str, str]:
+        """Lookup key -> executable (treat as read-only)"""
+        self.ensure_loaded()
+        return self._paths
+
+    @property
+    def names(self) -> List[str]:
+        """Every lookup key, for callers that score candidates themselves"""
+        self.ensure_loaded()
+        names = self._names
+        if names is None:
+            names = self._names = list(self._paths)
+        return names
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Executable for an app name or alias (exact, then space/hyphen-free), or None"""
+        paths = self.paths
+        for key in key_variants(name):
+            if key in paths:
+                return paths[key]
+        return None
+
+    def _ensure_fuzzy(self):
+        if not self._fuzzy_ready:
+            self.fuzzy_index.set_source('apps', self.names)
+            self._fuzzy_ready = True
+
+    def fuzzy(self, name: str, threshold: float = 60) -> Optional[Tuple[str, str, float]]:
+        """Closest lookup key scoring above `threshold`, as (key, executable, score), or None"""
+        paths = self.paths
+        self._ensure_fuzzy()
+        match = self.fuzzy_index.match(name.lower().strip(), threshold)
+        if match is None or match[0] not in paths:
+            return None
+        return match[0], paths[match[0]], match[1]
+
+    def get_stats(self) -> dict:
+        return {
+            'path': self.path,
+            'source': self.source,
+            'apps': len(self._catalog) if self._catalog is not None else len(self._apps or []),
+            'lookup_keys': len(self._names) if self._names is not None else None,
+            'version': self.version,
+            'loaded_at': self.loaded_at,
+            'last_build_ms': self.last_build_ms,
+            'subscribers': len(self._subscribers),
+            'fuzzy_index': self.fuzzy_index.get_stats()
+        }
+
+
+def get_app_registry() -> AppRegistry:
+    """Return the process-wide app registry, loading apps.json on first use"""
+    registry = AppRegistry.instance()
+    registry.ensure_loaded()
+    return registry
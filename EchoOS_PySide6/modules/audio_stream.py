@@ -0,0 +1,172 @@
+"""
+Streaming Audio Capture for EchoOS
+Continuous microphone capture through a ring buffer instead of fixed-length recordings
+"""
+
+import threading
+import logging
+from typing import Optional
+
+# NumPy for the sample buffer
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# sounddevice for microphone input
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except ImportError:
+    sd = None
+    SOUNDDEVICE_AVAILABLE = False
+
+SAMPLE_RATE = 16000
+
+
+class AudioRingBuffer:
+    """Single-producer / single-consumer ring buffer of int16 samples.
+
+    The audio callback is the only writer and the recognizer thread is the only
+    reader. Each side only ever advances its own position counter, so no lock is
+    taken on the audio path. When the reader falls behind, new samples are
+    dropped (and counted) rather than overwriting unread audio.
+    """
+
+    def __init__(self, capacity: int):
+        # Round up to a power of two so positions can be masked instead of modded
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self._buffer = np.zeros(size, dtype=np.int16)
+        self._mask = size - 1
+        self._write_pos = 0
+        self._read_pos = 0
+        self._data_ready = threading.Event()
+        self.overruns = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._mask + 1
+
+    def available(self) -> int:
+        """Number of samples written but not yet read"""
+        return self._write_pos - self._read_pos
+
+    def write(self, samples) -> int:
+        """Append samples (producer side). Returns the number of samples stored."""
+        samples = np.asarray(samples, dtype=np.int16).reshape(-1)
+        free = self.capacity - (self._write_pos - self._read_pos)
+        count = min(len(samples), free)
+        if count < len(samples):
+            self.overruns += len(samples) - count
+        if count <= 0:
+            return 0
+
+        start = self._write_pos & self._mask
+        first = min(count, self.capacity - start)
+        self._buffer[start:start + first] = samples[:first]
+        if first < count:
+            self._buffer[:count - first] = samples[first:count]
+
+        # Publish only after the samples are in place
+        self._write_pos += count
+        self._data_ready.set()
+        return count
+
+    def read(self, count: int) -> Optional["np.ndarray"]:
+        """Read exactly `count` samples (consumer side), or None if not enough are buffered"""
+        if self.available() < count:
+            return None
+
+        start = self._read_pos & self._mask
+        first = min(count, self.capacity - start)
+        if first == count:
+            out = self._buffer[start:start + count].copy()
+        else:
+            out = np.concatenate((self._buffer[start:], self._buffer[:count - first]))
+
+        self._read_pos += count
+        return out
+
+    def wait(self, count: int, timeout: float) -> bool:
+        """Block until at least `count` samples are buffered or the timeout expires"""
+        if self.available() >= count:
+            return True
+        self._data_ready.clear()
+        # Re-check after clearing so a write between the check and clear is not missed
+        if self.available() >= count:
+            return True
+        self._data_ready.wait(timeout)
+        return self.available() >= count
+
+    def clear(self):
+        """Discard all buffered samples (consumer side)"""
+        self._read_pos = self._write_pos
+
+
+class StreamingCapture:
+    """Microphone capture that feeds a ring buffer from a sounddevice InputStream callback"""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = 30,
+                 buffer_seconds: float = 10.0, device=None):
+        self.logger = logging.getLogger(__name__)
+        self.sample_rate = sample_rate
+        self.frame_samples = int(sample_rate * frame_ms / 1000)
+        self.device = device
+        self.ring = AudioRingBuffer(int(sample_rate * buffer_seconds))
+        self._stream = None
+        self.status_errors = 0
+
+    @staticmethod
+    def is_available() -> bool:
+        return NUMPY_AVAILABLE and SOUNDDEVICE_AVAILABLE
+
+    def _on_audio(self, indata, frames, time_info, status):
+        """sounddevice callback - runs on the audio thread, must not block"""
+        if status:
+            self.status_errors += 1
+        self.ring.write(indata[:, 0] if indata.ndim > 1 else indata)
+
+    def start(self):
+        """Open the input stream and start filling the ring buffer"""
+        if self._stream is not None:
+            return
+        self.ring.clear()
+        self._stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype='int16',
+            blocksize=self.frame_samples,
+            device=self.device,
+            callback=self._on_audio
+        )
+        self._stream.start()
+        self.logger.debug(f"Streaming capture started ({self.frame_samples} samples per frame)")
+
+    def stop(self):
+        """Stop and close the input stream"""
+        stream, self._stream = self._stream, None
+        if stream is None:
+            return
+        try:
+            stream.stop()
+            stream.close()
+        except Exception as e:
+            self.logger.debug(f"Error closing input stream: {e}")
+        if self.ring.overruns:
+            self.logger.warning(f"Audio ring buffer dropped {self.ring.overruns} samples")
+
+    def read_frame(self, timeout: float = 0.5) -> Optional["np.ndarray"]:
+        """Return the next frame of int16 samples, or None if none arrived within the timeout"""
+        if not self.ring.wait(self.frame_samples, timeout):
+            return None
+        return self.ring.read(self.frame_samples)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
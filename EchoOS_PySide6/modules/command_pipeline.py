@@ -0,0 +1,268 @@
+"""
+Command Pipeline for EchoOS
+Parses an utterance once, builds one shared context and dispatches it through a handler registry
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .intent_router import IntentRouter, RouteResult
+from .window_state import get_window_state
+
+
+class CommandIntent:
+    """An utterance parsed once: normalized text, words, verb/target split and keyword routes.
+
+    The legacy dictionary parse (`parsed()`) is only computed if a handler asks
+    for it, and then at most once per parser.
+    """
+
+    def __init__(self, voice_text: str, route: RouteResult):
+        self.raw_text = voice_text
+        self.text = route.text
+        self.words = self.text.split()
+        self.verb = self.words[0] if self.words else ""
+        self.target = self.text[len(self.verb):].strip()
+        self.route = route
+        self.candidates: Dict[str, Optional[Dict[str, Any]]] = {}  # classifier name -> candidate intent
+        self._parsed: Dict[int, Optional[Dict[str, Any]]] = {}
+
+    @property
+    def categories(self) -> List[str]:
+        return self.route.categories
+
+    def parsed(self, parser) -> Optional[Dict[str, Any]]:
+        """Legacy parser output for this utterance (memoized per parser instance)"""
+        key = id(parser)
+        if key not in self._parsed:
+            self._parsed[key] = parser.parse(self.raw_text)
+        return self._parsed[key]
+
+    def __repr__(self):
+        return f"CommandIntent({self.text!r}, {self.categories})"
+
+
+class CommandContext:
+    """Context shared by every handler for one command.
+
+    Cheap facts (user, window snapshot) are captured up front. Anything
+    expensive is built through `get(name, factory)`, so each facet is computed
+    at most once per command no matter how many handlers ask for it - also when
+    classifiers ask for it from several threads at once.
+    """
+
+    def __init__(self, user: Optional[str] = None, window=None):
+        self.user = user
+        self.window = window
+        self.created_at = time.time()
+        self._facets: Dict[str, Any] = {}
+        self._facet_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.facet_timings: Dict[str, float] = {}
+
+    def get(self, name: str, factory: Callable[[], Any]) -> Any:
+        if name in self._facets:
+            return self._facets[name]
+        with self._lock:
+            facet_lock = self._facet_locks.setdefault(name, threading.Lock())
+        with facet_lock:
+            if name not in self._facets:
+                start = time.perf_counter()
+                self._facets[name] = factory()
+                self.facet_timings[name] = (time.perf_counter() - start) * 1000
+        return self._facets[name]
+
+    def has(self, name: str) -> bool:
+        return name in self._facets
+
+
+class CommandPipeline:
+    """Runs one command through: auth -> parse -> context -> first handler that succeeds.
+
+    Handlers are `handler(intent, context) -> bool`, tried in registration
+    order. Each executor contributes its own `handle_intent` so authentication,
+    normalization and context building happen once here instead of in every
+    executor.
+
+    In speculative mode, handlers registered with a side-effect-free
+    `classifier(intent, context) -> candidate dict or None` are classified
+    concurrently. The winner is the confident candidate (confidence at or
+    above `confidence_threshold`) of the earliest-registered classifier, so
+    the outcome never depends on which thread finishes first: a confident
+    answer is accepted as soon as every higher-priority classifier has
+    answered without one. Classifiers that have not started are then
+    cancelled and late results are ignored. If nothing is confident (or the
+    winner fails) the remaining handlers run in order, minus those whose
+    classifier rejected the command outright.
+    """
+
+    def __init__(self, auth=None, tts=None, router: Optional[IntentRouter] = None, check_auth: bool = True):
+        self.auth = auth
+        self.tts = tts
+        self.check_auth = check_auth  # False when the caller has already gated on authentication
+        self.logger = logging.getLogger(__name__)
+        self.router = router or IntentRouter()
+        self._handlers: List[Tuple[str, Callable]] = []
+        self._classifiers: Dict[str, Callable] = {}
+        self._lock = threading.Lock()
+        self.speculative = False
+        self.confidence_threshold = 0.8
+        self.classify_timeout = 2.0  # Seconds to wait for classifiers before falling back to sequential
+        self._pool = None
+        self.last_timings: Dict[str, float] = {}
+        self.stage_totals: Dict[str, List[float]] = {}  # stage -> [count, total ms]
+        self.handled_by: Dict[str, int] = {}
+
+    def register(self, name: str, handler: Callable[[CommandIntent, CommandContext], bool],
+                 classifier: Optional[Callable[[CommandIntent, CommandContext], Optional[Dict[str, Any]]]] = None):
+        """Add a handler (or replace the one registered under the same name)"""
+        self._handlers = [(n, h) for n, h in self._handlers if n != name] + [(name, handler)]
+        if classifier:
+            self._classifiers[name] = classifier
+        else:
+            self._classifiers.pop(name, None)
+
+    def set_speculative(self, enabled: bool):
+        """Turn concurrent classification on or off"""
+        self.speculative = enabled
+        if enabled and self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="intent-classifier")
+        self.logger.info(f"Speculative intent resolution {'enabled' if enabled else 'disabled'}")
+
+    def handlers(self) -> List[str]:
+        return [name for name, _ in self._handlers]
+
+    def parse(self, voice_text: str) -> CommandIntent:
+        return CommandIntent(voice_text, self.router.route(voice_text.lower().strip()))
+
+    def _authorized(self) -> bool:
+        if not self.auth or not self.check_auth:
+            return True
+        if not self.auth.is_authenticated():
+            self.logger.warning("Command execution blocked: User not authenticated")
+            if self.tts:
+                self.tts.say("Please authenticate first by clicking 'Wake / Authenticate'")
+            return False
+        if not self.auth.is_session_valid():
+            self.logger.warning("Command execution blocked: Session expired")
+            if self.tts:
+                self.tts.say("Session expired. Please authenticate again.")
+            return False
+        return True
+
+    def execute(self, voice_text: str) -> bool:
+        """Execute a command. Returns True if a handler handled it."""
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+
+        if not self._authorized():
+            return False
+        timings['auth'] = (time.perf_counter() - start) * 1000
+
+        mark = time.perf_counter()
+        intent = self.parse(voice_text)
+        timings['parse'] = (time.perf_counter() - mark) * 1000
+
+        mark = time.perf_counter()
+        user = self.auth.get_current_user() if self.auth else None
+        context = CommandContext(user=user, window=get_window_state().snapshot)
+        timings['context'] = (time.perf_counter() - mark) * 1000
+
+        order = self._handlers
+        if self.speculative and self._classifiers and self._pool is not None:
+            mark = time.perf_counter()
+            order = self._speculate(intent, context, timings)
+            timings['speculate'] = (time.perf_counter() - mark) * 1000
+
+        handled_by = None
+        for name, handler in order:
+            mark = time.perf_counter()
+            try:
+                handled = handler(intent, context)
+            except Exception as e:
+                self.logger.error(f"Handler '{name}' failed on '{intent.text}': {e}")
+                handled = False
+            timings[f'handler:{name}'] = (time.perf_counter() - mark) * 1000
+            if handled:
+                handled_by = name
+                break
+
+        for facet, ms in context.facet_timings.items():
+            timings[f'facet:{facet}'] = ms
+        timings['total'] = (time.perf_counter() - start) * 1000
+        self._record(timings, handled_by)
+        self.logger.info(f"Pipeline: '{intent.text}' -> {handled_by or 'unhandled'} in {timings['total']:.1f} ms")
+        return handled_by is not None
+
+    def _classify(self, name: str, intent: CommandIntent, context: CommandContext):
+        start = time.perf_counter()
+        try:
+            candidate = self._classifiers[name](intent, context)
+        except Exception as e:
+            self.logger.debug(f"Classifier '{name}' failed: {e}")
+            candidate = None
+        return candidate, (time.perf_counter() - start) * 1000
+
+    def _confident(self, candidate: Optional[Dict[str, Any]]) -> bool:
+        return bool(candidate) and candidate.get('confidence', 0.5) >= self.confidence_threshold
+
+    def _pick_winner(self, names: List[str], answered: Dict[str, Optional[Dict[str, Any]]]):
+        """First confident classifier in priority order - (decided, winner)"""
+        for name in names:
+            if name not in answered:
+                return False, None  # A higher-priority classifier may still be confident
+            if self._confident(answered[name]):
+                return True, name
+        return True, None
+
+    def _speculate(self, intent: CommandIntent, context: CommandContext, timings: Dict[str, float]):
+        """Classify concurrently; return handlers to try, the confident winner first"""
+        names = [name for name, _ in self._handlers if name in self._classifiers]
+        futures = {self._pool.submit(self._classify, name, intent, context): name for name in names}
+        winner = None
+        try:
+            for future in as_completed(futures, timeout=self.classify_timeout):
+                name = futures[future]
+                candidate, ms = future.result()
+                intent.candidates[name] = candidate
+                timings[f'classify:{name}'] = ms
+                decided, winner = self._pick_winner(names, intent.candidates)
+                if decided:
+                    break
+        except FuturesTimeout:
+            winner = None
+            self.logger.debug("Intent classifiers timed out - falling back to sequential dispatch")
+        for future in futures:
+            future.cancel()
+
+        # A classifier that answered None has rejected the command; unanswered ones stay eligible
+        rejected = {name for name, candidate in intent.candidates.items() if candidate is None}
+        order = [(name, handler) for name, handler in self._handlers if name not in rejected and name != winner]
+        if winner:
+            self.logger.debug(f"Speculative winner: {winner} ({intent.candidates[winner]})")
+            order = [(name, handler) for name, handler in self._handlers if name == winner] + order
+        return order
+
+    def _record(self, timings: Dict[str, float], handled_by: Optional[str]):
+        with self._lock:
+            self.last_timings = timings
+            for stage, ms in timings.items():
+                entry = self.stage_totals.setdefault(stage, [0, 0.0])
+                entry[0] += 1
+                entry[1] += ms
+            key = handled_by or 'unhandled'
+            self.handled_by[key] = self.handled_by.get(key, 0) + 1
+
+    def get_stats(self) -> dict:
+        """Per-stage call counts and mean latency, plus which handler served each command"""
+        with self._lock:
+            return {
+                'handlers': self.handlers(),
+                'speculative': self.speculative,
+                'last_timings_ms': dict(self.last_timings),
+                'mean_ms': {stage: total / count for stage, (count, total) in self.stage_totals.items() if count},
+                'handled_by': dict(self.handled_by)
+            }
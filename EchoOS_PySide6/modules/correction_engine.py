@@ -0,0 +1,118 @@
+"""
+Speech Correction Engine for EchoOS
+Single-pass phrase corrections and a memo cache for corrected utterances
+"""
+
+import re
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class CorrectionEngine:
+    """Longest-match, single-pass phrase replacement.
+
+    All misrecognition phrases are compiled into one word-bounded alternation,
+    ordered longest first so that at any position the longest phrase wins
+    (e.g. "close all tabs" is kept intact instead of "close all" matching).
+    Each matched span is replaced exactly once - replacements are never
+    re-scanned, so corrections do not cascade into each other.
+    """
+
+    def __init__(self, mappings: Dict[str, str] = None):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._mappings: Dict[str, str] = {}
+        self._pattern = None
+        self.rebuild(mappings or {})
+
+    def rebuild(self, mappings: Dict[str, str]):
+        """Replace the whole mapping table and recompile"""
+        normalized = {' '.join(k.lower().split()): v.lower() for k, v in mappings.items() if k and k.strip()}
+        with self._lock:
+            self._mappings = normalized
+            self._pattern = self._compile(normalized)
+
+    def add(self, incorrect: str, correct: str):
+        """Add or replace one mapping and recompile"""
+        key = ' '.join(incorrect.lower().split())
+        if not key:
+            return
+        with self._lock:
+            self._mappings[key] = correct.lower()
+            self._pattern = self._compile(self._mappings)
+
+    @staticmethod
+    def _compile(mappings: Dict[str, str]):
+        if not mappings:
+            return None
+        phrases = sorted(mappings, key=len, reverse=True)
+        alternation = '|'.join(re.escape(p) for p in phrases)
+        return re.compile(r'\b(?:' + alternation + r')\b')
+
+    def apply(self, text: str) -> Tuple[str, List[Tuple[str, str]]]:
+        """Correct `text` in one pass. Returns the new text and the (incorrect, correct) pairs applied."""
+        with self._lock:
+            pattern, mappings = self._pattern, self._mappings
+        if pattern is None or not text:
+            return text, []
+
+        applied = []
+
+        def replace(match):
+            phrase = match.group(0)
+            correct = mappings[phrase]
+            if correct != phrase:
+                applied.append((phrase, correct))
+            return correct
+
+        return pattern.sub(replace, text), applied
+
+    def __len__(self):
+        return len(self._mappings)
+
+
+class LRUCache:
+    """Small thread-safe LRU map with hit/miss counters"""
+
+    def __init__(self, max_size: int = 512):
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, str]" = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'invalidations': self.invalidations
+            }
@@ -0,0 +1,72 @@
+"""
+Directory Scanning for EchoOS
+Depth limits, pruning patterns and primary-executable search shared by app discovery
+"""
+
+import fnmatch
+import os
+import re
+from typing import Callable, Iterable, List, Optional
+
+# Directories below a scan root that are walked at most this deep (the root itself is depth 0)
+SCAN_DEPTH = 3
+
+# Folders that never hold an app's main executable, but often hold thousands of files
+IGNORED_DIRS = (
+    ".*", "$*", "__pycache__", "node_modules", "bower_components", "site-packages",
+    "locale", "locales", "lang", "langs", "languages", "translations", "i18n", "l10n",
+    "resources", "res", "assets", "images", "icons", "fonts", "themes", "skins", "sounds",
+    "doc", "docs", "help", "manual", "samples", "examples", "licenses",
+    "cache", "logs", "temp", "tmp", "dictionaries", "swiftshader", "package cache"
+)
+
+# Executables that ship next to an app but are not the app
+HELPER_EXECUTABLES = (
+    "unins*", "uninst*", "uninstall*", "setup*", "install*", "update*", "updater*",
+    "*crashhandler*", "*crashpad*", "*crashreporter*", "*helper*", "notification_helper*"
+)
+
+
+def name_matcher(patterns: Iterable[str]) -> Callable[[str], bool]:
+    """Case-insensitive glob matcher for file or folder names, compiled to one regex"""
+    regex = re.compile('|'.join(fnmatch.translate(pattern.lower()) for pattern in patterns))
+    return lambda name: regex.match(name.lower()) is not None
+
+
+is_ignored_dir = name_matcher(IGNORED_DIRS)
+is_helper_executable = name_matcher(HELPER_EXECUTABLES)
+
+
+def find_primary(directory: str, match: Callable[[str], bool], max_depth: int = SCAN_DEPTH,
+                 ignore: Optional[Callable[[str], bool]] = is_ignored_dir) -> Optional[str]:
+    """The main executable under `directory`, searched breadth-first.
+
+    Returns the first matching file in the shallowest folder that has one,
+    skipping helpers (uninstallers, updaters, crash handlers) as long as a
+    deeper folder might still hold the real thing. Ignored folders and
+    anything below `max_depth` are never listed.
+    """
+    frontier = [directory]
+    fallback = None
+    for depth in range(max_depth + 1):
+        next_frontier: List[str] = []
+        for folder in frontier:
+            try:
+                with os.scandir(folder) as it:
+                    for item in it:
+                        try:
+                            if item.is_dir(follow_symlinks=False):
+                                if depth < max_depth and not (ignore and ignore(item.name)):
+                                    next_frontier.append(item.path)
+                            elif match(item.name):
+                                if not is_helper_executable(item.name):
+                                    return item.path
+                                fallback = fallback or item.path
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return fallback
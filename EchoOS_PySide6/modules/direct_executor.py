@@ -12,6 +12,46 @@ import platform
 import webbrowser
 from typing import Optional, Dict, List, Any
 
+from .app_registry import get_app_registry
+from .window_state import get_window_state
+
+# Commands that open, close or rearrange windows - the window snapshot is stale after them
+WINDOW_COMMANDS = ('open ', 'close ', 'file explorer', 'minimize', 'minimise', 'maximize', 'maximise')
+
+
+def _has(*words):
+    return lambda text: any(word in text for word in words)
+
+
+def _starts(*prefixes):
+    return lambda text: text.startswith(prefixes)
+
+
+# The command families execute_command handles, in the order it checks them (for side-effect-free classification)
+COMMAND_FAMILIES = (
+    ('system', _has('shutdown', 'shut down', 'turn off', 'restart', 'reboot', 'lock screen', 'lock', 'sleep', 'hibernate')),
+    ('volume', _has('volume', 'louder', 'quieter', 'mute', 'silent')),
+    ('file', lambda text: text.startswith(('open file ', 'copy file ')) or text in ('copy', 'copy all', 'copy selected', 'paste', 'paste all')),
+    ('open', _starts('open ')),
+    ('close', _starts('close ')),
+    ('search', lambda text: (text.startswith(('google ', 'search ', 'look for ', 'look up ', 'find '))
+                             or any(word in text for word in ('google for', 'google about', 'search for', 'search about')))),
+    ('type', _starts('type ')),
+    ('window', _has('minimize', 'minimise', 'maximize', 'maximise')),
+    ('system_info', _has('system info', 'system information', 'computer info')),
+    ('directory', _has('back directory', 'previous directory', 'navigate back', 'parent directory')),
+    ('web_navigation', _has('go back', 'back', 'previous page', 'go forward', 'forward', 'next page', 'scroll up', 'scroll down')),
+    ('media', _has('play', 'pause', 'stop', 'next', 'previous')),
+    ('file', _has('create file', 'delete file', 'copy file', 'save file', 'save', 'save as')),
+    ('accessibility', _has('read screen', 'screen read', 'describe screen', 'screen describe', 'navigation mode',
+                           'enable navigation', 'disable navigation', 'turn off navigation')),
+    ('directory', lambda text: (text.startswith(('navigate to ', 'go to '))
+                                or any(word in text for word in ('list directory', 'list files', 'show files',
+                                                                 'current directory', 'where am i', 'pwd')))),
+    ('cursor', _has('navigate up', 'move up', 'cursor up', 'navigate down', 'move down', 'cursor down',
+                    'navigate left', 'move left', 'cursor left', 'navigate right', 'move right', 'cursor right')),
+)
+
 class DirectExecutor:
     """Direct command executor that actually executes commands"""
     
@@ -21,34 +61,13 @@ class DirectExecutor:
         self.logger = logging.getLogger(__name__)
         self.platform = platform.system().lower()
         
-        # Load discovered apps (NO HARDCODING - all apps discovered dynamically)
-        self.discovered_apps = self._load_discovered_apps()
+        # Discovered apps (NO HARDCODING - all apps discovered dynamically), shared process-wide
+        self.app_registry = get_app_registry()
     
-    def _load_discovered_apps(self) -> Dict[str, str]:
-        """Load discovered apps from apps.json"""
-        try:
-            import json
-            with open('config/apps.json', 'r', encoding='utf-8') as f:
-                apps_data = json.load(f)
-            
-            discovered_apps = {}
-            for app in apps_data.get('apps', []):
-                name = app.get('name', '').lower()
-                path = app.get('path', '')
-                if name and path:
-                    discovered_apps[name] = path
-                    # Also add variations
-                    if ' ' in name:
-                        discovered_apps[name.replace(' ', '')] = path
-                    if '-' in name:
-                        discovered_apps[name.replace('-', '')] = path
-            
-            self.logger.info(f"Loaded {len(discovered_apps)} discovered apps")
-            return discovered_apps
-            
-        except Exception as e:
-            self.logger.error(f"Failed to load discovered apps: {e}")
-            return {}
+    @property
+    def discovered_apps(self) -> Dict[str, str]:
+        """App name/alias -> executable, always the registry's latest discovery"""
+        return self.app_registry.paths
     
     def _find_app_fuzzy(self, target: str) -> Optional[str]:
         """Find app using fuzzy matching"""
@@ -56,7 +75,7 @@ class DirectExecutor:
             from rapidfuzz import fuzz, process
             
             # Get all app names
-            app_names = list(self.discovered_apps.keys())
+            app_names = self.app_registry.names
             
             # Find best match
             result = process.extractOne(target, app_names, scorer=fuzz.ratio)
@@ -289,17 +308,13 @@ Disk Usage: {psutil.disk_usage('/').percent}%
         """Read screen content using OCR"""
         try:
             import pyautogui
-            import cv2
-            import pytesseract
-            from PIL import Image
-            import numpy as np
+            from .ocr_service import get_ocr_service
             
             # Take screenshot
             screenshot = pyautogui.screenshot()
-            img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
             
-            # Perform OCR
-            text = pytesseract.image_to_string(img)
+            # Perform OCR on the shared worker pool
+            text = get_ocr_service().text(screenshot)
             
             if text.strip():
                 # Limit text length for TTS
@@ -655,11 +670,26 @@ Disk Usage: {psutil.disk_usage('/').percent}%
                 self.tts.say("Cursor navigation failed.")
             return False
     
-    def execute_command(self, voice_text: str) -> bool:
+    def classify_intent(self, intent, context) -> Optional[Dict]:
+        """Side-effect-free guess at which branch of execute_command would take the command (for speculative dispatch)"""
+        text = intent.text
+        if text.startswith('find ') and any(word in text[5:] for word in ('file', 'folder')):
+            return None  # Left to the file-operation executors
+        for category, matches in COMMAND_FAMILIES:
+            if matches(text):
+                return {'category': category, 'confidence': 0.9}
+        # Anything else ends up as a web search here - a last resort, not a confident match
+        return {'category': 'search_fallback', 'confidence': 0.2}
+    
+    def handle_intent(self, intent, context) -> bool:
+        """Command pipeline entry point - the pipeline has already checked authentication"""
+        return self.execute_command(intent.text, authorized=True)
+    
+    def execute_command(self, voice_text: str, authorized: bool = False) -> bool:
         """Execute voice command directly - REQUIRES AUTHENTICATION"""
         try:
             # CRITICAL: Check authentication first - this is a main pillar of the project
-            if self.auth:
+            if self.auth and not authorized:
                 if not self.auth.is_authenticated():
                     self.logger.warning("Command execution blocked: User not authenticated")
                     if self.tts:
@@ -921,6 +951,9 @@ Disk Usage: {psutil.disk_usage('/').percent}%
             if self.tts:
                 self.tts.say("Sorry, I couldn't execute that command.")
             return False
+        finally:
+            if any(word in voice_text for word in WINDOW_COMMANDS):
+                get_window_state().invalidate()
     
     def _is_file_explorer_open(self) -> bool:
         """Check if File Explorer is currently open"""
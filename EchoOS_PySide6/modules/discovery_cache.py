@@ -0,0 +1,257 @@
+"""
+Discovery Cache for EchoOS
+Persistent per-directory scan results, so app discovery only re-lists directories that changed since the last run
+"""
+
+import json
+import logging
+import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+CACHE_FILE = "config/discovery_cache.json"
+CACHE_VERSION = 1
+
+# Unchanged directories are still re-listed this often: editing a file in place leaves its directory's mtime alone
+MAX_ENTRY_AGE = 24 * 3600
+
+
+class DiscoveryCache:
+    """What each discovery source found in each directory, keyed by the directory's mtime and inode.
+
+    A directory's mtime changes whenever an entry is added, removed or
+    renamed in it, so a directory whose (mtime, inode, device) still match
+    the cache is not listed again: its cached apps and subdirectory names
+    are reused and only the subdirectories are stat-ed. In a directory that
+    did change, files seen before keep their cached result unless their own
+    mtime moved, and only new ones are built (resolving a .lnk, parsing a
+    .desktop file). Directories that disappeared drop out of the cache.
+
+    `stats` counts the filesystem work of the current run, so the cost of a
+    rescan is visible. Several sources may scan at once; a scan only commits
+    its results if the run it started in (`begin_run()` .. `end_run()`) is
+    still going, so a source abandoned at its deadline cannot overwrite the
+    next run's entries.
+    """
+
+    def __init__(self, path: str = CACHE_FILE, max_age: float = MAX_ENTRY_AGE):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._generation = 0
+        self._sources: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.fingerprint: Optional[str] = None  # Of the app list last written to apps.json
+        self.output_mtime_ns: Optional[int] = None  # apps.json's mtime right after that write
+        self.stats: Dict[str, int] = {}
+        self.reset_stats()
+
+    # Persistence
+    def load(self):
+        """Read the saved cache once; concurrent scans wait for it rather than seeing it empty"""
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                data = None
+            except Exception as e:
+                self.logger.warning(f"Ignoring unreadable discovery cache {self.path}: {e}")
+                data = None
+            if data and data.get('version') == CACHE_VERSION:
+                self._sources = data.get('sources', {})
+                self.fingerprint = data.get('fingerprint')
+                self.output_mtime_ns = data.get('output_mtime_ns')
+            self._loaded = True
+
+    def save(self):
+        with self._lock:
+            data = {
+                'version': CACHE_VERSION,
+                'fingerprint': self.fingerprint,
+                'output_mtime_ns': self.output_mtime_ns,
+                'sources': dict(self._sources)
+            }
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write discovery cache {self.path}: {e}")
+
+    def clear(self):
+        """Forget everything, so the next scan lists every directory again"""
+        with self._lock:
+            self._loaded = True
+            self._sources = {}
+            self.fingerprint = None
+            self.output_mtime_ns = None
+
+    def begin_run(self):
+        """Start a discovery run; scans started from now on belong to it"""
+        self.load()
+        with self._lock:
+            self._generation += 1
+
+    def end_run(self):
+        """End the current run; scans still in flight from it will not commit"""
+        with self._lock:
+            self._generation += 1
+
+    # Counted filesystem access
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {
+                'stat_calls': 0,
+                'dir_listings': 0,
+                'dirs_reused': 0,
+                'files_built': 0,
+                'files_reused': 0
+            }
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def stat(self, path: str) -> Optional[os.stat_result]:
+        self._count('stat_calls')
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def exists(self, path: str) -> bool:
+        return self.stat(path) is not None
+
+    # Scanning
+    def scan(self, source: str, roots: List[str], match: Callable[[str], bool],
+             build: Callable[[str, str], Optional[Dict[str, Any]]], recursive: bool = True,
+             max_depth: Optional[int] = None, ignore: Optional[Callable[[str], bool]] = None,
+             stop_when: Optional[Callable[[List[Dict[str, Any]]], bool]] = None,
+             workers: int = 1) -> List[Dict[str, Any]]:
+        """Apps one discovery source finds under `roots`.
+
+        `match(filename)` selects candidate files and `build(full_path, filename)`
+        turns a candidate into an app dict (or None). With `recursive`, the
+        tree under each root is walked breadth-first without following
+        symlinked directories, down to `max_depth` levels below the root.
+        Subdirectories whose name `ignore` accepts are never entered, and
+        below a non-root directory whose apps satisfy `stop_when` (its primary
+        executable was found) the walk stops. With `workers` > 1 each level's
+        directories are listed on a thread pool.
+        """
+        self.load()
+        with self._lock:
+            generation = self._generation
+            previous = self._sources.get(source, {})
+        entries: Dict[str, Dict[str, Any]] = {}
+        apps = []
+        now = time.time()
+
+        def visit(directory: str) -> Optional[Dict[str, Any]]:
+            st = self.stat(directory)
+            if st is None or not stat.S_ISDIR(st.st_mode):
+                return None
+            entry = previous.get(directory)
+            if entry is not None and self._fresh(entry, st, now):
+                self._count('dirs_reused')
+                return entry
+            return self._list(directory, st, entry, match, build, recursive, now)
+
+        frontier = [root for root in dict.fromkeys(roots) if root]
+        depth = 0
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="discovery-scan") if workers > 1 else None
+        try:
+            while frontier:
+                visited = list(pool.map(visit, frontier)) if pool and len(frontier) > 1 else [visit(d) for d in frontier]
+                next_frontier = []
+                for directory, entry in zip(frontier, visited):
+                    if entry is None:
+                        continue
+                    entries[directory] = entry
+                    found = [app for _, app in entry['files'].values() if app]
+                    apps.extend(found)
+                    if not recursive or (max_depth is not None and depth >= max_depth):
+                        continue
+                    if depth > 0 and stop_when and found and stop_when(found):
+                        continue
+                    next_frontier.extend(os.path.join(directory, name) for name in entry['dirs']
+                                         if not (ignore and ignore(name)))
+                frontier = next_frontier
+                depth += 1
+        finally:
+            if pool:
+                pool.shutdown()
+        # Swapped in whole: directories no longer reachable from the roots are dropped
+        with self._lock:
+            if generation == self._generation:
+                self._sources[source] = entries
+            else:
+                self.logger.debug(f"Dropping {source} scan results from a discovery run that has ended")
+        return apps
+
+    def _fresh(self, entry: Dict[str, Any], st: os.stat_result, now: float) -> bool:
+        return (entry['mtime_ns'] == st.st_mtime_ns and entry['ino'] == st.st_ino and entry['dev'] == st.st_dev
+                and now - entry['scanned_at'] < self.max_age)
+
+    def _list(self, directory: str, st: os.stat_result, previous: Optional[Dict[str, Any]],
+              match: Callable[[str], bool], build: Callable[[str, str], Optional[Dict[str, Any]]],
+              recursive: bool, now: float) -> Optional[Dict[str, Any]]:
+        """List one directory, building only files that are new or changed since `previous`"""
+        known = previous['files'] if previous else {}
+        files: Dict[str, list] = {}
+        dirs: List[str] = []
+        self._count('dir_listings')
+        try:
+            with os.scandir(directory) as it:
+                for item in it:
+                    try:
+                        if item.is_dir(follow_symlinks=False):
+                            if recursive:
+                                dirs.append(item.name)
+                            continue
+                        if not match(item.name):
+                            continue
+                        self._count('stat_calls')  # Free on Windows, where scandir already returns it
+                        mtime_ns = item.stat().st_mtime_ns
+                        cached = known.get(item.name)
+                        if cached is not None and cached[0] == mtime_ns:
+                            files[item.name] = cached
+                            self._count('files_reused')
+                            continue
+                        files[item.name] = [mtime_ns, self._build(build, item.path, item.name)]
+                        self._count('files_built')
+                    except OSError:
+                        continue
+        except OSError as e:
+            self.logger.debug(f"Could not list {directory}: {e}")
+            return None
+        return {
+            'mtime_ns': st.st_mtime_ns,
+            'ino': st.st_ino,
+            'dev': st.st_dev,
+            'scanned_at': now,
+            'dirs': dirs,
+            'files': files
+        }
+
+    def _build(self, build: Callable[[str, str], Optional[Dict[str, Any]]], path: str, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            return build(path, name)
+        except Exception as e:
+            self.logger.debug(f"Could not read {path}: {e}")
+            return None
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['sources'] = {source: len(entries) for source, entries in self._sources.items()}
+        stats['path'] = self.path
+        return stats
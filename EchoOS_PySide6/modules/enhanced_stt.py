@@ -11,7 +11,6 @@ import logging
 import json
 import re
 from typing import Optional, Callable, Dict, List, Any
-from rapidfuzz import fuzz, process
 
 # NumPy for audio processing
 try:
@@ -37,20 +36,27 @@ try:
 except ImportError:
     SPEECH_RECOGNITION_AVAILABLE = False
 
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
+# Whisper is only ever imported inside the fallback worker process
+from .whisper_fallback import WhisperFallback, WHISPER_AVAILABLE
+
+from .audio_stream import StreamingCapture
+from .vad import VoiceActivityDetector, SPEECH_START, SPEECH, SPEECH_END
+from .partial_dispatch import PartialCommandDispatcher
+from .stt_grammar import CommandGrammar, UNKNOWN_TOKEN, strip_unknown
+from .vosk_registry import get_model_registry
+from .correction_engine import CorrectionEngine, LRUCache
+from .fuzzy_index import FuzzyVocabulary
+from .app_registry import AppRegistry, get_app_registry
 
 class EnhancedSTT:
     """Enhanced Speech-to-Text with error correction and multiple backends"""
     
-    def __init__(self, tts=None, model_path="models/vosk-model-small-en-us-0.15"):
+    def __init__(self, tts=None, model_path="models/vosk-model-small-en-us-0.15", universal_config=None, config_dir="config"):
         self.tts = tts
         self.logger = logging.getLogger(__name__)
         self.model_path = model_path
         self.model = None
+        self.model_ready = None  # Future resolving to the shared Vosk model
         self.recognizer = None
         self._listening = False
         self._current_callback = None
@@ -61,14 +67,69 @@ class EnhancedSTT:
         self.min_speech_duration = 0.3  # Minimum duration of speech to process
         self.min_text_length = 3  # Minimum number of characters in recognized text
         self.min_word_count = 2  # Minimum number of words for a valid command
-        self.confidence_threshold = 0.3  # Minimum confidence (Vosk doesn't provide this directly, but we can infer)
+        self.confidence_threshold = 0.3  # Minimum mean Vosk word confidence before the Whisper second pass is tried
+        
+        # Streaming capture settings
+        self.sample_rate = 16000
+        self.streaming_enabled = True  # Use InputStream + ring buffer instead of fixed-length sd.rec() chunks
+        self.frame_duration_ms = 30  # Frame size fed to the recognizer (20-50 ms)
+        self.stream_buffer_seconds = 10.0  # Ring buffer capacity
+        
+        # Frame-level voice activity detection (only voiced frames reach the recognizer)
+        self.vad_enabled = True
+        self.vad = VoiceActivityDetector(
+            sample_rate=self.sample_rate,
+            frame_ms=10,
+            min_energy=self.energy_threshold
+        ) if NUMPY_AVAILABLE else None
         
         # Speech correction mappings
         self.correction_mappings = self._build_correction_mappings()
+        self.corrector = CorrectionEngine(self.correction_mappings)
+        
+        # Raw recognizer text -> corrected text, cleared whenever a correction table changes
+        self.correction_cache = LRUCache(max_size=512)
         
         # Common commands for better recognition
         self.common_commands = self._build_common_commands()
         
+        # Prebuilt fuzzy indexes (rebuilt incrementally when commands or apps change)
+        self.app_corrections = self._build_app_corrections()
+        self.command_index = FuzzyVocabulary()
+        self.command_index.set_source('common_commands', self.common_commands)
+        self.word_index = FuzzyVocabulary()
+        self.word_index.set_source('common_words', self._build_common_words())
+        self.app_index = FuzzyVocabulary()
+        self.app_index.set_source('app_corrections', self.app_corrections.values())
+        self.command_match_threshold = 85  # Whole-utterance match against common commands
+        self.command_rewrite_threshold = 90  # ...when a multi-word command's verb or object differs from what was heard
+        self.word_match_threshold = 80  # Per-word match against common words
+        self.app_match_threshold = 85  # App names are a large, noisy vocabulary
+        
+        # Early dispatch of short commands from stable partial results (streaming mode only)
+        self.early_dispatch_enabled = True
+        self.partial_dispatcher = PartialCommandDispatcher(self.common_commands, stable_frames=3)
+        
+        # Grammar-constrained recognition in command mode, full model in dictation (typing) mode
+        self.config_dir = config_dir
+        self.universal_config = universal_config
+        self.grammar_enabled = True
+        self.recognition_mode = 'command'
+        self.grammar = CommandGrammar()
+        self._apps_loaded = False
+        AppRegistry.instance().subscribe(self._load_registry_apps)  # Fresh vocabulary after every discovery
+        self._dictation_recognizer = None
+        self._utterance_audio = []
+        self.max_utterance_seconds = 15
+        
+        # Optional Whisper second pass for rejected or low-confidence Vosk results
+        self.whisper_fallback_enabled = WhisperFallback.is_available()
+        self.whisper_deadline = 3.0  # Seconds to wait for a second-pass result before giving up
+        self.whisper_fallback = WhisperFallback(max_seconds=self.max_utterance_seconds) if self.whisper_fallback_enabled else None
+        if self.whisper_fallback:
+            # One worker for the whole session: the model loads once and stays warm across listen toggles
+            self.whisper_fallback.start()
+        
         # Initialize STT backend
         self._initialize_stt()
         
@@ -229,7 +290,7 @@ class EnhancedSTT:
             'volume up', 'volume down', 'mute', 'unmute',
             
             # Window commands
-            'minimize', 'maximize', 'close', 'close all tabs',
+            'minimize', 'maximize', 'close', 'close all tabs', 'close all apps',
             'new tab', 'close tab', 'next tab', 'previous tab',
             
             # Navigation commands
@@ -259,20 +320,62 @@ class EnhancedSTT:
             'scroll up', 'scroll down', 'scroll', 'page up', 'page down'
         ]
     
+    def _build_common_words(self) -> List[str]:
+        """Build list of words that commonly get misrecognized"""
+        return [
+            'notepad', 'calculator', 'chrome', 'edge', 'firefox', 'paint', 
+            'word', 'excel', 'powerpoint', 'hackathon', 'java', 'python',
+            'javascript', 'react', 'node', 'echo', 'open', 'close', 'copy',
+            'paste', 'type', 'save', 'create', 'delete', 'folder', 'file',
+            'document', 'documents', 'downloads', 'desktop',
+            'vscode', 'code', 'visual studio', 'cursor', 'notepad++',
+            'slack', 'discord', 'teams', 'zoom', 'outlook', 'gmail',
+            'spotify', 'youtube', 'netflix', 'steam', 'git', 'github'
+        ]
+    
+    def _build_app_corrections(self) -> Dict[str, str]:
+        """Build mappings for commonly misheard application names"""
+        return {
+            'notepad': 'notepad',
+            'not bad': 'notepad',
+            'nor bad': 'notepad',
+            'knot bad': 'notepad',
+            'chrome': 'chrome',
+            'crow': 'chrome',
+            'crown': 'chrome',
+            'edge': 'edge',
+            'edgy': 'edge',
+            'calculator': 'calculator',
+            'calc': 'calculator',
+            'paint': 'paint',
+            'word': 'word',
+            'excel': 'excel',
+            'powerpoint': 'powerpoint',
+            'cmd': 'cmd',
+            'command prompt': 'cmd',
+            'powershell': 'powershell'
+        }
+    
     def _initialize_stt(self):
-        """Initialize STT backend"""
+        """Initialize STT backend (the Vosk model loads in the background)"""
         if VOSK_AVAILABLE and os.path.exists(self.model_path):
-            try:
-                self.model = Model(self.model_path)
-                self.recognizer = KaldiRecognizer(self.model, 16000)
-                self.logger.info("Vosk STT initialized successfully")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize Vosk: {e}")
-                self._initialize_fallback_stt()
+            # Shared with any other component using the same model - loaded once per process
+            self.model_ready = get_model_registry().preload(self.model_path)
+            self.model_ready.add_done_callback(self._on_model_loaded)
         else:
             self.logger.warning("Vosk not available, using fallback STT")
             self._initialize_fallback_stt()
     
+    def _on_model_loaded(self, future):
+        """Called on the loader thread once the shared Vosk model is available"""
+        try:
+            self.model = future.result()
+            self.logger.info("Vosk STT initialized successfully")
+        except Exception as e:
+            self.logger.error(f"Failed to initialize Vosk: {e}")
+            self.model_ready = None
+            self._initialize_fallback_stt()
+    
     def _initialize_fallback_stt(self):
         """Initialize fallback STT system"""
         if SPEECH_RECOGNITION_AVAILABLE:
@@ -296,27 +399,41 @@ class EnhancedSTT:
         self._current_callback = callback
         self._listening = True
         
+        if self.grammar_enabled:
+            self.refresh_grammar()
+        
         # Calibrate energy threshold based on ambient noise if first time
         if not hasattr(self, '_energy_calibrated'):
             self._calibrate_energy_threshold()
             self._energy_calibrated = True
         
-        if VOSK_AVAILABLE and self.model:
-            self._thread = threading.Thread(
-                target=self._vosk_listening_loop, 
-                args=(callback, timeout), 
-                daemon=True
-            )
-        else:
-            self._thread = threading.Thread(
-                target=self._fallback_listening_loop, 
-                args=(callback, timeout), 
-                daemon=True
-            )
-        
+        self._thread = threading.Thread(
+            target=self._run_listening,
+            args=(callback, timeout),
+            daemon=True
+        )
         self._thread.start()
         return True
     
+    def _run_listening(self, callback: Callable[[str], None], timeout: int):
+        """Wait for the Vosk model if it is still loading, then run the matching loop"""
+        if self.model is None and self.model_ready is not None:
+            self.logger.info("Waiting for Vosk model to finish loading...")
+            try:
+                self.model = self.model_ready.result()
+            except Exception:
+                pass
+        
+        if not self._listening:
+            return
+        
+        if VOSK_AVAILABLE and self.model and self.streaming_enabled and StreamingCapture.is_available():
+            self._vosk_streaming_loop(callback)
+        elif VOSK_AVAILABLE and self.model:
+            self._vosk_listening_loop(callback, timeout)
+        else:
+            self._fallback_listening_loop(callback, timeout)
+    
     def _calibrate_energy_threshold(self):
         """Calibrate energy threshold based on ambient noise"""
         try:
@@ -333,12 +450,16 @@ class EnhancedSTT:
             )
             sd.wait()
             
-            # Calculate baseline energy
+            # Calculate baseline energy (RMS in int16 units)
             baseline_energy = self._calculate_audio_energy(calibration_data)
             
             # Set threshold to 1.5x baseline (speech should be louder than ambient)
             if baseline_energy > 0:
-                self.energy_threshold = max(300, int(baseline_energy * 1.5 * 32767))
+                self.energy_threshold = min(32767, max(300, int(baseline_energy * 1.5)))
+                if self.vad:
+                    # The VAD keeps tracking the noise floor from here on
+                    self.vad.seed_noise_floor(baseline_energy)
+                    self.vad.min_energy = self.energy_threshold
                 self.logger.info(f"Energy threshold calibrated to: {self.energy_threshold} (baseline: {baseline_energy:.2f})")
             else:
                 self.logger.info(f"Using default energy threshold: {self.energy_threshold}")
@@ -348,6 +469,8 @@ class EnhancedSTT:
     def set_energy_threshold(self, threshold: int):
         """Manually set energy threshold (0-32767)"""
         self.energy_threshold = max(0, min(32767, threshold))
+        if self.vad:
+            self.vad.min_energy = self.energy_threshold
         self.logger.info(f"Energy threshold set to: {self.energy_threshold}")
     
     def set_min_word_count(self, count: int):
@@ -360,6 +483,12 @@ class EnhancedSTT:
         self._listening = False
         self._current_callback = None
     
+    def shutdown(self):
+        """Stop listening and release the Whisper worker process (at application exit)"""
+        self.stop_listening()
+        if self.whisper_fallback:
+            self.whisper_fallback.stop()
+    
     def _calculate_audio_energy(self, audio_data) -> float:
         """Calculate RMS energy of audio signal"""
         try:
@@ -383,6 +512,9 @@ class EnhancedSTT:
     def _has_speech(self, audio_data) -> bool:
         """Check if audio contains speech based on energy threshold"""
         try:
+            if self.vad_enabled and self.vad:
+                return self.vad.has_speech(np.asarray(audio_data).reshape(-1))
+            
             energy = self._calculate_audio_energy(audio_data)
             # Normalize energy threshold (int16 range is -32768 to 32767)
             # For int16, max value is 32767, so we normalize
@@ -398,11 +530,19 @@ class EnhancedSTT:
     
     def _vosk_listening_loop(self, callback: Callable[[str], None], timeout: int):
         """Vosk-based listening loop with improved filtering"""
+        rec, rec_key = None, None
         try:
-            rec = KaldiRecognizer(self.model, 16000)
+            rec_key = self._recognizer_key()
+            rec = self._create_recognizer(rec_key)
             
             while self._listening:
                 try:
+                    # Switch between grammar and full-model decoding between chunks
+                    if self._recognizer_key() != rec_key:
+                        self._release_recognizer(rec, rec_key)
+                        rec_key = self._recognizer_key()
+                        rec = self._create_recognizer(rec_key)
+                    
                     # Record audio
                     data = sd.rec(
                         int(timeout * 16000), 
@@ -415,8 +555,13 @@ class EnhancedSTT:
                     if not self._listening:
                         break
                     
-                    # Check if audio has sufficient energy (not silence/background noise)
-                    if not self._has_speech(data):
+                    # Keep only voiced frames (not silence/background noise)
+                    if self.vad_enabled and self.vad:
+                        data = self.vad.extract_voiced(data.reshape(-1))
+                        if len(data) == 0:
+                            self.logger.debug("No voiced frames in chunk, skipping...")
+                            continue
+                    elif not self._has_speech(data):
                         self.logger.debug("Audio energy too low, skipping...")
                         continue
                     
@@ -424,46 +569,278 @@ class EnhancedSTT:
                     rec.AcceptWaveform(data.tobytes())
                     result = rec.Result()
                     result_dict = json.loads(result)
-                    text = result_dict.get("text", "")
+                    self._utterance_audio = [data]
+                    self._finish_utterance(result_dict, callback)
+                            
+                except Exception as e:
+                    self.logger.error(f"Vosk listening error: {e}")
+                    # Continue listening instead of breaking - don't stop on single errors
+                    import traceback
+                    self.logger.debug(traceback.format_exc())
+                    continue
                     
-                    # Additional filtering: check if result seems valid
-                    if not text or len(text.strip()) < self.min_text_length:
+        except Exception as e:
+            self.logger.error(f"Vosk listening loop error: {e}")
+            import traceback
+            self.logger.debug(traceback.format_exc())
+            # Loop will exit naturally - user can restart listening manually
+        finally:
+            self._release_recognizer(rec, rec_key)
+    
+    def _vosk_streaming_loop(self, callback: Callable[[str], None]):
+        """Vosk listening loop fed continuously from a microphone ring buffer"""
+        capture = None
+        rec, rec_key = None, None
+        try:
+            rec_key = self._recognizer_key()
+            rec = self._create_recognizer(rec_key)
+            capture = StreamingCapture(
+                sample_rate=self.sample_rate,
+                frame_ms=self.frame_duration_ms,
+                buffer_seconds=self.stream_buffer_seconds
+            )
+            use_vad = self.vad_enabled and self.vad is not None
+            if use_vad:
+                self.vad.reset()
+            self.partial_dispatcher.reset()
+            self._utterance_audio = []
+            capture.start()
+            self.logger.info(f"Streaming recognition started ({self.frame_duration_ms} ms frames, VAD {'on' if use_vad else 'off'})")
+            
+            while self._listening:
+                try:
+                    frame = capture.read_frame(timeout=0.5)
+                    if frame is None:
                         continue
                     
-                    # Check word count
-                    words = text.strip().split()
-                    if len(words) < self.min_word_count:
-                        # Allow single-word commands only if they're common commands
-                        if words and words[0].lower() not in ['open', 'close', 'minimize', 'maximize', 'lock', 'mute', 'unmute', 'play', 'pause', 'stop']:
-                            self.logger.debug(f"Ignoring short text: '{text}' (only {len(words)} word(s))")
-                            continue
+                    # Switch between grammar and full-model decoding only between utterances
+                    if self._recognizer_key() != rec_key and not (use_vad and self.vad.in_speech):
+                        self._release_recognizer(rec, rec_key)
+                        rec_key = self._recognizer_key()
+                        rec = self._create_recognizer(rec_key)
+                        self.partial_dispatcher.reset()
+                        self._utterance_audio = []
                     
-                    # Check for partial results (low confidence) - Vosk uses empty text for low confidence
-                    # But we can also check if the text is too short or seems like noise
-                    if self._is_likely_noise(text):
-                        self.logger.debug(f"Filtered out likely noise: '{text}'")
+                    if not use_vad:
+                        self._accept_stream_audio(rec, frame, callback)
                         continue
                     
-                    # Correct and process the text
-                    corrected_text = self._correct_speech_text(text.strip())
-                    if corrected_text and len(corrected_text.strip()) >= self.min_text_length:
-                        self.logger.info(f"Recognized: '{text}' -> '{corrected_text}'")
-                        callback(corrected_text)
-                    else:
-                        self.logger.debug(f"Corrected text too short or empty: '{corrected_text}'")
-                            
+                    for event, audio in self.vad.process(frame):
+                        if event in (SPEECH_START, SPEECH):
+                            self._accept_stream_audio(rec, audio, callback)
+                        elif event == SPEECH_END:
+                            # Utterance closed by the VAD - flush without waiting for Vosk's own endpoint
+                            result_dict = json.loads(rec.FinalResult())
+                            self._finish_utterance(result_dict, callback)
+                        
                 except Exception as e:
-                    self.logger.error(f"Vosk listening error: {e}")
-                    # Continue listening instead of breaking - don't stop on single errors
+                    self.logger.error(f"Vosk streaming error: {e}")
                     import traceback
                     self.logger.debug(traceback.format_exc())
                     continue
                     
         except Exception as e:
-            self.logger.error(f"Vosk listening loop error: {e}")
+            self.logger.error(f"Vosk streaming loop error: {e}")
             import traceback
             self.logger.debug(traceback.format_exc())
-            # Loop will exit naturally - user can restart listening manually
+        finally:
+            if capture:
+                capture.stop()
+            self._release_recognizer(rec, rec_key)
+    
+    def _accept_stream_audio(self, rec, audio, callback: Callable[[str], None]):
+        """Feed audio to the recognizer and dispatch final or stable partial results"""
+        if sum(len(a) for a in self._utterance_audio) < self.max_utterance_seconds * self.sample_rate:
+            self._utterance_audio.append(audio)
+        
+        # AcceptWaveform returns True as soon as Vosk detects an endpoint
+        if rec.AcceptWaveform(audio.tobytes()):
+            result_dict = json.loads(rec.Result())
+            self._finish_utterance(result_dict, callback)
+            return
+        
+        if not self.early_dispatch_enabled:
+            return
+        
+        partial = json.loads(rec.PartialResult()).get("partial", "")
+        command = self.partial_dispatcher.observe(partial)
+        if command:
+            self.logger.info(f"Early dispatch from partial result: '{command}'")
+            callback(command)
+    
+    def _finish_utterance(self, result_dict: Dict[str, Any], callback: Callable[[str], None]) -> bool:
+        """Handle a final result, skipping it if the command was already dispatched early"""
+        audio, self._utterance_audio = self._utterance_audio, []
+        text = result_dict.get("text", "")
+        heard_words = bool(strip_unknown(text).strip())
+        confidence = self._result_confidence(result_dict)
+        
+        # Words outside the command grammar come back as [unk] - re-decode with the full model
+        if UNKNOWN_TOKEN in text.split():
+            if audio:
+                text = self._decode_with_full_model(audio)
+                confidence = None
+                self.logger.debug(f"Out-of-grammar utterance re-decoded as '{text}'")
+            else:
+                text = strip_unknown(text)
+        
+        if self.partial_dispatcher.reconcile(text):
+            self.logger.debug(f"Final result '{text}' already dispatched from partial result")
+            return False
+        
+        low_confidence = confidence is not None and confidence < self.confidence_threshold
+        # Nothing (or only [unk]) from Vosk is a VAD false trigger - Whisper would only hallucinate on it
+        second_pass = heard_words and text.strip() and (low_confidence or self._is_likely_noise(text))
+        if audio and second_pass and self._submit_to_whisper(audio, text, callback):
+            self.logger.debug(f"Vosk result '{text}' (confidence {confidence}) sent to Whisper second pass")
+            return False
+        return self._handle_recognized_text(text, callback)
+    
+    @staticmethod
+    def _result_confidence(result_dict: Dict[str, Any]) -> Optional[float]:
+        """Mean per-word confidence of a Vosk result, or None if word details are missing"""
+        words = result_dict.get("result") or []
+        scores = [w.get("conf", 0.0) for w in words if isinstance(w, dict)]
+        return sum(scores) / len(scores) if scores else None
+    
+    def _submit_to_whisper(self, audio_chunks, vosk_text: str, callback: Callable[[str], None]) -> bool:
+        """Queue the utterance for the Whisper second pass. False if the fallback cannot take it.
+        
+        If the second pass fails, misses its deadline or hears nothing, the Vosk text is used after all.
+        """
+        fallback = self.whisper_fallback
+        if not self.whisper_fallback_enabled or fallback is None or not fallback.ready.is_set():
+            return False
+        audio = np.concatenate([np.asarray(c, dtype=np.int16).reshape(-1) for c in audio_chunks])
+        if len(audio) < self.min_speech_duration * self.sample_rate:
+            return False
+        
+        future = fallback.submit(audio, deadline=self.whisper_deadline)
+        if future.done() and future.exception() is not None:
+            self.logger.debug(f"Whisper second pass skipped: {future.exception()}")
+            return False
+    
+        def on_done(done):
+            try:
+                text = done.result()
+            except Exception as e:
+                self.logger.debug(f"Whisper second pass failed: {e}")
+                text = ""
+            if not self._listening:
+                return
+            if text:
+                self.logger.info(f"Whisper second pass: '{text}'")
+            else:
+                self.logger.debug(f"Whisper second pass gave nothing, falling back to Vosk result '{vosk_text}'")
+                text = vosk_text
+            self._handle_recognized_text(text, callback)
+        
+        future.add_done_callback(on_done)
+        return True
+    
+    def _recognizer_key(self):
+        """Identify which recognizer the current mode needs"""
+        if self.grammar_enabled and self.recognition_mode == 'command' and len(self.grammar):
+            return ('grammar', self.grammar.version)
+        return ('full', 0)
+    
+    def _create_recognizer(self, key):
+        """Check out a grammar-constrained or full-vocabulary recognizer from the shared pool"""
+        registry = get_model_registry()
+        if key[0] == 'grammar':
+            self.logger.info(f"Using command grammar v{key[1]} for recognition")
+            rec = registry.acquire_recognizer(self.model_path, self.sample_rate, self.grammar.compile())
+        else:
+            rec = registry.acquire_recognizer(self.model_path, self.sample_rate)
+        if rec is not None:
+            # Per-word confidences decide whether the Whisper second pass is worth running
+            rec.SetWords(True)
+        return rec
+    
+    def _release_recognizer(self, rec, key):
+        """Return a recognizer to the pool, dropping it if its grammar is outdated"""
+        if rec is None:
+            return
+        stale = key[0] == 'grammar' and key[1] != self.grammar.version
+        get_model_registry().release_recognizer(rec, discard=stale)
+    
+    def _decode_with_full_model(self, audio_chunks) -> str:
+        """Decode buffered utterance audio with the unconstrained model"""
+        if self._dictation_recognizer is None:
+            self._dictation_recognizer = get_model_registry().acquire_recognizer(self.model_path, self.sample_rate)
+        rec = self._dictation_recognizer
+        for chunk in audio_chunks:
+            rec.AcceptWaveform(chunk.tobytes())
+        return json.loads(rec.FinalResult()).get("text", "")
+    
+    def set_recognition_mode(self, mode: str):
+        """Switch between 'command' (grammar-constrained) and 'dictation' (full model) recognition"""
+        if mode not in ('command', 'dictation'):
+            raise ValueError(f"Unknown recognition mode: {mode}")
+        if mode == self.recognition_mode:
+            return
+        self.recognition_mode = mode
+        if mode == 'command' and self.grammar_enabled:
+            self.refresh_grammar()
+        self.logger.info(f"Recognition mode set to: {mode}")
+    
+    def refresh_grammar(self):
+        """Re-collect the command vocabulary; the grammar only recompiles if something changed"""
+        try:
+            self.grammar.set_source('common_commands', self.common_commands)
+            self.command_index.set_source('common_commands', self.common_commands)
+            self.grammar.load_commands_file(os.path.join(self.config_dir, "commands.json"))
+            self.grammar.load_custom_patterns(self.universal_config)
+            if not self._apps_loaded:
+                self._load_registry_apps(get_app_registry())
+        except Exception as e:
+            self.logger.error(f"Error refreshing command grammar: {e}")
+    
+    def _load_registry_apps(self, registry):
+        """Feed the shared registry's discovered apps into the grammar and fuzzy index"""
+        self.update_app_vocabulary(registry.apps)
+    
+    def update_app_vocabulary(self, apps: List[Dict[str, Any]]):
+        """Update the grammar and app fuzzy index after app discovery"""
+        self._apps_loaded = True
+        if self.grammar.load_apps(apps):
+            self.logger.info(f"Command grammar updated with {len(apps)} apps")
+        terms = []
+        for app in apps:
+            terms.append(app.get('name', ''))
+            terms.extend(app.get('aliases') or [])
+        if self.app_index.set_source('apps', terms):
+            self.correction_cache.clear()
+    
+    def _handle_recognized_text(self, text: str, callback: Callable[[str], None]) -> bool:
+        """Filter, correct and dispatch a recognizer result. Returns True if the callback fired."""
+        # Additional filtering: check if result seems valid
+        if not text or len(text.strip()) < self.min_text_length:
+            return False
+        
+        # Check word count
+        words = text.strip().split()
+        if len(words) < self.min_word_count:
+            # Allow single-word commands only if they're common commands
+            if words and words[0].lower() not in ['open', 'close', 'minimize', 'maximize', 'lock', 'mute', 'unmute', 'play', 'pause', 'stop']:
+                self.logger.debug(f"Ignoring short text: '{text}' (only {len(words)} word(s))")
+                return False
+        
+        # Check for partial results (low confidence) - Vosk uses empty text for low confidence
+        # But we can also check if the text is too short or seems like noise
+        if self._is_likely_noise(text):
+            self.logger.debug(f"Filtered out likely noise: '{text}'")
+            return False
+        
+        # Correct and process the text
+        corrected_text = self._correct_speech_text(text.strip())
+        if corrected_text and len(corrected_text.strip()) >= self.min_text_length:
+            self.logger.info(f"Recognized: '{text}' -> '{corrected_text}'")
+            callback(corrected_text)
+            return True
+        
+        self.logger.debug(f"Corrected text too short or empty: '{corrected_text}'")
+        return False
     
     def _is_likely_noise(self, text: str) -> bool:
         """Check if recognized text is likely background noise or false positive"""
@@ -548,24 +925,29 @@ class EnhancedSTT:
             # Loop will exit naturally - user can restart listening manually
     
     def _correct_speech_text(self, text: str) -> Optional[str]:
-        """Correct common speech recognition errors"""
+        """Correct common speech recognition errors (memoized per utterance)"""
+        key = ' '.join(text.lower().split())
+        cached = self.correction_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        corrected = self._run_correction_pipeline(text)
+        if corrected:
+            self.correction_cache.put(key, corrected)
+        return corrected
+    
+    def _run_correction_pipeline(self, text: str) -> Optional[str]:
+        """Clean, correct, fuzzy-match and de-duplicate recognized text"""
         try:
             original_text = text.lower().strip()
             
             # First, clean up common issues
             original_text = self._clean_text(original_text)
             
-            # Apply direct corrections - check for longer phrases first
-            # Sort by length (longest first) to match longer phrases before shorter ones
-            sorted_mappings = sorted(self.correction_mappings.items(), key=lambda x: len(x[0]), reverse=True)
-            
-            for incorrect, correct in sorted_mappings:
-                # Use word boundary matching for better accuracy
-                import re
-                pattern = r'\b' + re.escape(incorrect) + r'\b'
-                if re.search(pattern, original_text):
-                    original_text = re.sub(pattern, correct, original_text)
-                    self.logger.info(f"Applied correction: '{incorrect}' -> '{correct}'")
+            # Apply direct corrections in one pass (longest phrase wins at each position)
+            original_text, applied = self.corrector.apply(original_text)
+            for incorrect, correct in applied:
+                self.logger.info(f"Applied correction: '{incorrect}' -> '{correct}'")
             
             # Special case: Fix "fine" -> "file" pattern (CRITICAL - common misrecognition)
             # "create file" is often misheard as "create fine"
@@ -628,12 +1010,15 @@ class EnhancedSTT:
     def _fuzzy_match_commands(self, text: str) -> str:
         """Use fuzzy matching to correct commands"""
         try:
+            # Text that already is a known command (or a correction target) is never rewritten
+            if text in self.common_commands or text in self.correction_mappings.values():
+                return text
+            
             # First try to match the entire text against common commands
-            result = process.extractOne(text, self.common_commands, scorer=fuzz.ratio)
-            if result and len(result) == 2:
-                best_match, best_ratio = result
-                if best_ratio > 70:
-                    return best_match
+            # (a command that is already a word-prefix of the text is left alone so arguments survive)
+            result = self.command_index.match(text, self.command_match_threshold)
+            if result and not text.startswith(result[0] + ' ') and self._accept_command_match(text, *result):
+                return result[0]
             
             # If no good match, try word-by-word correction
             words = text.split()
@@ -647,41 +1032,25 @@ class EnhancedSTT:
                     words = ['file' if w == 'fine' else w for w in words]
                     self.logger.info("Corrected 'fine' to 'file' in file operation context (fuzzy match)")
             
-            corrected_words = []
+            # Skip command words (open, close, etc.) - they're usually correct
+            command_words = {'open', 'close', 'copy', 'paste', 'type', 'save', 'create', 'delete', 'go', 'to', 'navigate'}
+            # Words after these are free text (what to type or search for) and are never corrected
+            free_text_verbs = {'type', 'write', 'search', 'find'}
+            free_text_start = next((i + 1 for i, w in enumerate(words) if w.lower() in free_text_verbs), len(words))
+            positions = [i for i, w in enumerate(words[:free_text_start]) if w.lower() not in command_words]
             
-            # Common words that get misrecognized - expanded list
-            common_words = [
-                'notepad', 'calculator', 'chrome', 'edge', 'firefox', 'paint', 
-                'word', 'excel', 'powerpoint', 'hackathon', 'java', 'python',
-                'javascript', 'react', 'node', 'echo', 'open', 'close', 'copy',
-                'paste', 'type', 'save', 'create', 'delete', 'folder', 'file',
-                'document', 'document', 'documents', 'downloads', 'desktop',
-                'vscode', 'code', 'visual studio', 'cursor', 'notepad++',
-                'slack', 'discord', 'teams', 'zoom', 'outlook', 'gmail',
-                'spotify', 'youtube', 'netflix', 'steam', 'git', 'github'
-            ]
+            # Score all remaining words against the word index in one batch
+            scored = self.word_index.match_many([words[i] for i in positions], self.word_match_threshold)
+            matches = dict(zip(positions, scored))
             
-            for word in words:
-                # Skip command words (open, close, etc.) - they're usually correct
-                if word.lower() in ['open', 'close', 'copy', 'paste', 'type', 'save', 'create', 'delete', 'go', 'to', 'navigate']:
-                    corrected_words.append(word)
-                    continue
-                
-                # Try to match against common words with fuzzy matching
-                try:
-                    result = process.extractOne(word, common_words, scorer=fuzz.ratio)
-                    if result and len(result) == 2:
-                        best_word_match, best_word_ratio = result
-                        # Lower threshold for better correction (50% similarity)
-                        if best_word_ratio > 50:
-                            corrected_words.append(best_word_match)
-                            self.logger.info(f"Fuzzy matched '{word}' -> '{best_word_match}' (score: {best_word_ratio:.1f}%)")
-                        else:
-                            corrected_words.append(word)
-                    else:
-                        corrected_words.append(word)
-                except Exception as e:
-                    self.logger.debug(f"Fuzzy match error for word '{word}': {e}")
+            corrected_words = []
+            for i, word in enumerate(words):
+                match = matches.get(i)
+                if match:
+                    corrected_words.append(match[0])
+                    if match[0] != word:
+                        self.logger.info(f"Fuzzy matched '{word}' -> '{match[0]}' (score: {match[1]:.1f}%)")
+                else:
                     corrected_words.append(word)
             
             corrected_text = ' '.join(corrected_words)
@@ -700,6 +1069,18 @@ class EnhancedSTT:
             self.logger.error(f"Error in fuzzy matching: {e}")
             return text
     
+    def _accept_command_match(self, text: str, command: str, score: float) -> bool:
+        """Whether a whole-utterance fuzzy match may replace the text.
+        
+        A multi-word command whose verb or object differs from what was heard
+        needs a higher score, so a typo is fixed ("scrol down") but a
+        different command is never substituted ("close all apps" -> "close all tabs").
+        """
+        spoken, words = text.split(), command.split()
+        if len(words) < 2 or (spoken and spoken[0] == words[0] and spoken[-1] == words[-1]):
+            return True
+        return score >= self.command_rewrite_threshold
+    
     def _context_aware_correction(self, text: str) -> str:
         """Apply context-aware corrections"""
         try:
@@ -742,28 +1123,18 @@ class EnhancedSTT:
     
     def _correct_app_name(self, app_name: str) -> str:
         """Correct application names"""
-        app_corrections = {
-            'notepad': 'notepad',
-            'not bad': 'notepad',
-            'nor bad': 'notepad',
-            'knot bad': 'notepad',
-            'chrome': 'chrome',
-            'crow': 'chrome',
-            'crown': 'chrome',
-            'edge': 'edge',
-            'edgy': 'edge',
-            'calculator': 'calculator',
-            'calc': 'calculator',
-            'paint': 'paint',
-            'word': 'word',
-            'excel': 'excel',
-            'powerpoint': 'powerpoint',
-            'cmd': 'cmd',
-            'command prompt': 'cmd',
-            'powershell': 'powershell'
-        }
+        name = app_name.lower()
+        if name in self.app_corrections:
+            return self.app_corrections[name]
+        
+        # Close misrecognitions of known or discovered apps
+        match = self.app_index.match(name, self.app_match_threshold)
+        if match:
+            corrected = self.app_corrections.get(match[0], match[0])
+            self.logger.debug(f"Fuzzy matched app '{app_name}' -> '{corrected}' (score: {match[1]:.1f}%)")
+            return corrected
         
-        return app_corrections.get(app_name.lower(), app_name)
+        return app_name
     
     def _clean_text(self, text: str) -> str:
         """Clean up the text"""
@@ -814,11 +1185,17 @@ class EnhancedSTT:
     def add_custom_correction(self, incorrect: str, correct: str):
         """Add custom speech correction mapping"""
         self.correction_mappings[incorrect.lower()] = correct.lower()
+        self.corrector.add(incorrect, correct)
+        self.correction_cache.clear()
     
     def add_custom_command(self, command: str):
         """Add custom command to recognition list"""
         if command not in self.common_commands:
             self.common_commands.append(command)
+            self.partial_dispatcher.set_commands(self.common_commands)
+            self.grammar.set_source('common_commands', self.common_commands)
+            self.command_index.set_source('common_commands', self.common_commands)
+            self.correction_cache.clear()
     
     def get_status(self) -> Dict[str, Any]:
         """Get STT system status"""
@@ -827,7 +1204,31 @@ class EnhancedSTT:
             'speech_recognition_available': SPEECH_RECOGNITION_AVAILABLE,
             'whisper_available': WHISPER_AVAILABLE,
             'model_loaded': self.model is not None,
+            'model_loading': self.model_ready is not None and not self.model_ready.done(),
+            'model_registry': get_model_registry().get_stats(),
             'listening': self._listening,
+            'streaming': self.streaming_enabled and StreamingCapture.is_available(),
+            'vad': self.vad.get_stats() if self.vad_enabled and self.vad else None,
+            'recognition_mode': self.recognition_mode,
+            'grammar': {
+                'enabled': self.grammar_enabled,
+                'version': self.grammar.version,
+                'phrases': len(self.grammar)
+            },
+            'whisper_fallback': self.whisper_fallback.get_stats() if self.whisper_fallback else None,
+            'correction_cache': self.correction_cache.get_stats(),
+            'fuzzy_index': {
+                'commands': self.command_index.get_stats(),
+                'words': self.word_index.get_stats(),
+                'apps': self.app_index.get_stats()
+            },
+            'early_dispatch': {
+                'enabled': self.early_dispatch_enabled,
+                'eligible_commands': len(self.partial_dispatcher.eligible),
+                'dispatched': self.partial_dispatcher.dispatched_count,
+                'suppressed_finals': self.partial_dispatcher.suppressed_count,
+                'extended_finals': self.partial_dispatcher.extended_count
+            },
             'correction_mappings': len(self.correction_mappings),
             'common_commands': len(self.common_commands)
         }
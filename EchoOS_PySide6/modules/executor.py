@@ -13,6 +13,15 @@ from datetime import datetime
 
 from .universal_keybindings import UniversalKeybindings
 from .universal_filesystem import UniversalFileSystem
+from .window_state import get_window_state
+
+# Actions that open, close or switch windows - the window snapshot is stale after them
+WINDOW_ACTIONS = {
+    "open_app", "close_all_apps", "close_specific_app", "switch_to_app", "new_window",
+    "open_website", "open_file", "open_file_explorer", "navigate_folder",
+    "close_browser_tabs", "close_all_tabs", "new_tab", "close_tab", "next_tab", "previous_tab",
+    "close_window", "minimize_window", "maximize_window", "switch_window"
+}
 
 class Executor:
     def __init__(self, tts, auth=None, ui_automator=None):
@@ -27,6 +36,21 @@ class Executor:
         self.current_directory = self.filesystem.get_current_directory()
         self.logger = logging.getLogger(__name__)
 
+    def classify_intent(self, intent, context, parser=None):
+        """Legacy parse as a speculative-dispatch candidate (None if the parser has no match)"""
+        command = intent.parsed(parser) if parser else None
+        if not command or command.get('action') in (None, 'unknown'):
+            return None
+        return {'action': command['action'], 'confidence': 0.8}
+
+    def handle_intent(self, intent, context, parser=None) -> bool:
+        """Command pipeline entry point: legacy parse (shared through the intent), then execute"""
+        if parser:
+            command = intent.parsed(parser)
+            if command:
+                return self.execute(command)
+        return self.execute({'action': 'unknown', 'text': intent.raw_text})
+    
     def execute(self, command):
         """Execute a command based on action dictionary"""
         if not command or 'action' not in command:
@@ -207,6 +231,9 @@ class Executor:
             self.logger.error(f"Error executing command {action}: {e}")
             self.tts.say(f"Sorry, I encountered an error: {str(e)}")
             return False
+        finally:
+            if action in WINDOW_ACTIONS:
+                get_window_state().invalidate()
 
     def open_app(self, app_path, app_name):
         # Check if application is already running
@@ -0,0 +1,190 @@
+"""
+Fuzzy Vocabulary Index for EchoOS
+Prefiltered, batch-scored fuzzy matching against commands, app names and aliases
+"""
+
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rapidfuzz import fuzz, process
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def _bigrams(term: str) -> Set[str]:
+    return {term[i:i + 2] for i in range(len(term) - 1)}
+
+
+class FuzzyVocabulary:
+    """Incrementally maintained fuzzy index over one or more named term sources.
+
+    Candidates for a query are narrowed by length (fuzz.ratio cannot exceed the
+    threshold outside a length window) and, for queries of 3+ characters, by
+    shared character bigrams, then scored together with `process.cdist`.
+    Results are memoized in an LRU cache keyed by (token, threshold) that is
+    cleared whenever a source changes.
+    """
+
+    def __init__(self, cache_size: int = 2048):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._terms: List[Optional[str]] = []  # term id -> term (None once removed)
+        self._ids: Dict[str, int] = {}
+        self._refs: Dict[int, int] = {}  # how many sources contain each term
+        self._sources: Dict[str, Set[str]] = {}
+        self._by_gram: Dict[str, Set[int]] = defaultdict(set)
+        self._by_length: Dict[int, Set[int]] = defaultdict(set)
+        self._cache: "OrderedDict[Tuple[str, float], Optional[Tuple[str, float]]]" = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def set_source(self, name: str, terms: Iterable[str]) -> bool:
+        """Replace the terms of one source, updating only the changed entries. Returns True if anything changed."""
+        ordered = []
+        seen = set()
+        for term in terms:
+            if not isinstance(term, str):
+                continue
+            term = term.lower().strip()
+            if term and term not in seen:
+                seen.add(term)
+                ordered.append(term)
+
+        with self._lock:
+            previous = self._sources.get(name, set())
+            if previous == seen:
+                return False
+            for term in previous - seen:
+                self._release(term)
+            for term in ordered:
+                if term not in previous:
+                    self._retain(term)
+            self._sources[name] = seen
+            self._cache.clear()
+        self.logger.debug(f"Fuzzy source '{name}' updated ({len(seen)} terms, {len(self._ids)} total)")
+        return True
+
+    def _retain(self, term: str):
+        term_id = self._ids.get(term)
+        if term_id is not None:
+            self._refs[term_id] += 1
+            return
+        term_id = len(self._terms)
+        self._terms.append(term)
+        self._ids[term] = term_id
+        self._refs[term_id] = 1
+        self._by_length[len(term)].add(term_id)
+        for gram in _bigrams(term):
+            self._by_gram[gram].add(term_id)
+
+    def _release(self, term: str):
+        term_id = self._ids.get(term)
+        if term_id is None:
+            return
+        self._refs[term_id] -= 1
+        if self._refs[term_id] > 0:
+            return
+        del self._refs[term_id]
+        del self._ids[term]
+        self._terms[term_id] = None
+        self._by_length[len(term)].discard(term_id)
+        for gram in _bigrams(term):
+            self._by_gram[gram].discard(term_id)
+
+    def _candidates(self, token: str, threshold: float) -> Set[int]:
+        """Term ids that can possibly score above `threshold` against `token`"""
+        n = len(token)
+        # fuzz.ratio <= 200 * min(n, L) / (n + L), so L must lie inside (n / k, n * k)
+        k = 200.0 / max(threshold, 1.0) - 1.0
+        candidates = set()
+        for length, ids in self._by_length.items():
+            if ids and n / k < length < n * k:
+                candidates |= ids
+
+        if n >= 3 and candidates:
+            shared = set()
+            for gram in _bigrams(token):
+                shared |= self._by_gram.get(gram, set())
+            candidates &= shared
+        return candidates
+
+    def match(self, token: str, threshold: float) -> Optional[Tuple[str, float]]:
+        """Best term scoring strictly above `threshold`, as (term, score), or None"""
+        return self.match_many([token], threshold)[0]
+
+    def match_many(self, tokens: List[str], threshold: float) -> List[Optional[Tuple[str, float]]]:
+        """Batch version of match(); uncached tokens are scored in a single cdist call"""
+        results: List[Optional[Tuple[str, float]]] = [None] * len(tokens)
+        pending: Dict[str, List[int]] = {}
+
+        with self._lock:
+            for i, token in enumerate(tokens):
+                key = (token, threshold)
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    results[i] = self._cache[key]
+                    self.cache_hits += 1
+                else:
+                    pending.setdefault(token, []).append(i)
+                    self.cache_misses += 1
+            if not pending:
+                return results
+
+            queries = list(pending)
+            per_query = [self._candidates(q, threshold) for q in queries]
+            union = sorted(set().union(*per_query))
+            choices = [self._terms[i] for i in union]
+            scored = self._score(queries, choices, union, per_query, threshold)
+
+            for query, best in zip(queries, scored):
+                self._cache[(query, threshold)] = best
+                for i in pending[query]:
+                    results[i] = best
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return results
+
+    def _score(self, queries, choices, union, per_query, threshold) -> List[Optional[Tuple[str, float]]]:
+        if not choices:
+            return [None] * len(queries)
+
+        if not NUMPY_AVAILABLE:
+            best = []
+            for query, allowed in zip(queries, per_query):
+                subset = [self._terms[i] for i in union if i in allowed]
+                result = process.extractOne(query, subset, scorer=fuzz.ratio) if subset else None
+                best.append((result[0], result[1]) if result and result[1] > threshold else None)
+            return best
+
+        scores = process.cdist(queries, choices, scorer=fuzz.ratio, score_cutoff=threshold)
+        column = {term_id: col for col, term_id in enumerate(union)}
+        best = []
+        for row, allowed in enumerate(per_query):
+            cols = sorted(column[i] for i in allowed)
+            if not cols:
+                best.append(None)
+                continue
+            row_scores = scores[row, cols]
+            pick = int(np.argmax(row_scores))
+            score = float(row_scores[pick])
+            best.append((choices[cols[pick]], score) if score > threshold else None)
+        return best
+
+    def get_stats(self) -> dict:
+        return {
+            'terms': len(self._ids),
+            'sources': {name: len(terms) for name, terms in self._sources.items()},
+            'cache_size': len(self._cache),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses
+        }
@@ -0,0 +1,259 @@
+"""
+Incremental OCR for EchoOS
+Splits a frame into content tiles, hashes them and only re-OCRs the tiles whose pixels changed
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Image processing imports
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .ocr_service import OCR_AVAILABLE, get_ocr_service, join_lines
+
+
+class OCRResult:
+    """Merged OCR output for one frame: text in reading order plus word boxes in frame coordinates"""
+
+    def __init__(self, text: str = "", words: Optional[List[Dict[str, Any]]] = None,
+                 tiles: int = 0, dirty_tiles: int = 0, elapsed_ms: float = 0.0):
+        self.text = text
+        self.words = words or []
+        self.tiles = tiles
+        self.dirty_tiles = dirty_tiles
+        self.elapsed_ms = elapsed_ms
+
+
+class IncrementalOCR:
+    """Tile-hashing OCR cache.
+
+    Tiles follow the content: the thresholded frame is cut recursively
+    (XY-cut) into bands at blank rows and columns at wide blank gaps, each
+    column re-cut by its own rows, so a tile boundary never slices through a
+    line of text and blank areas are never OCRed at all. Ruling lines -
+    window borders, separators, scrollbar tracks - do not count as content,
+    so they neither glue the frame into one block nor become tiles of their
+    own. A block still taller than `max_band_height` (no blank row to cut
+    at) is split at its least-inked rows. Each tile is keyed by a hash of its pixels, so a
+    tile that is unchanged - or has only moved, e.g. after scrolling - is
+    served from cache. When most of the frame is new (first frame, app
+    switch) one full-frame OCR pass is run and its words are distributed to
+    the tiles instead of OCRing every tile separately. Otherwise the dirty
+    tiles are submitted to the shared OCR service together and recognized in
+    parallel.
+    """
+
+    def __init__(self, config: str = '--psm 6', max_band_height: int = 120, column_gap: int = 32,
+                 row_gap: int = 3, padding: int = 8, full_refresh_ratio: float = 0.5, cache_size: int = 2048,
+                 min_tile_size: int = 5, rule_ratio: float = 0.9, rule_width: int = 3, rule_min_length: int = 48):
+        self.logger = logging.getLogger(__name__)
+        self.config = config
+        self.max_band_height = max_band_height
+        self.column_gap = column_gap
+        self.row_gap = row_gap
+        self.padding = padding
+        self.min_tile_size = min_tile_size  # Narrower or shorter than this cannot hold a glyph
+        self.rule_ratio = rule_ratio  # Rows/columns inked along this share of a region, at most
+        self.rule_width = rule_width  # this many pixels thick, are a ruling line...
+        self.rule_min_length = rule_min_length  # ...if the region is at least this tall (text lines never are)
+        self.full_refresh_ratio = full_refresh_ratio
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.tiles_seen = 0
+        self.tiles_ocred = 0
+        self.full_refreshes = 0
+        self.last_elapsed_ms = 0.0
+
+    @staticmethod
+    def is_available() -> bool:
+        return OCR_AVAILABLE and NUMPY_AVAILABLE
+
+    # Tiling
+    @staticmethod
+    def _runs(mask) -> List[Tuple[int, int]]:
+        """(start, end) index runs where `mask` is True"""
+        padded = np.concatenate(([False], mask, [False]))
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        return list(zip(edges[0::2], edges[1::2]))
+
+    def _merge_gaps(self, runs: List[Tuple[int, int]], gap: int) -> List[Tuple[int, int]]:
+        merged: List[Tuple[int, int]] = []
+        for start, end in runs:
+            if merged and start - merged[-1][1] < gap:
+                merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
+
+    @staticmethod
+    def _background(binary) -> int:
+        """Background value of a binarized frame (dark-on-light or light-on-dark)"""
+        return 255 if binary.mean() > 127 else 0
+
+    def tiles(self, binary, background: Optional[int] = None) -> List[Tuple[int, int, int, int]]:
+        """Content tiles as (x, y, w, h), in reading order"""
+        if background is None:
+            background = self._background(binary)
+        ink = binary != background
+        tiles: List[Tuple[int, int, int, int]] = []
+        self._cut(ink, (0, 0, ink.shape[1], ink.shape[0]), tiles)
+        return tiles
+
+    def _content(self, counts, length: int, height: int):
+        """Rows/columns holding content: inked, but not part of a thin ruling line running along the whole region.
+        Only a region several lines tall can have rules - inside a single text line every row spans it."""
+        content = counts > 0
+        if height < self.rule_min_length:
+            return content
+        for start, end in self._runs(counts >= self.rule_ratio * length):
+            if end - start <= self.rule_width:
+                content[start:end] = False
+        return content
+
+    def _cut(self, ink, region: Tuple[int, int, int, int], tiles: List[Tuple[int, int, int, int]]):
+        """XY-cut `region`: bands at blank rows, columns at wide gaps, recursing until a block cannot be cut further"""
+        x, y, w, h = region
+        block = ink[y:y + h, x:x + w]
+        cols = self._content(block.sum(axis=0), h, h)
+        rows = self._content(block[:, cols].sum(axis=1), int(cols.sum()), h)
+        for top, bottom in self._merge_gaps(self._runs(rows), self.row_gap):
+            band = block[top:bottom][rows[top:bottom]]
+            band_cols = cols & band.any(axis=0)
+            for left, right in self._merge_gaps(self._runs(band_cols), self.column_gap):
+                tile = (x + int(left), y + int(top), int(right - left), int(bottom - top))
+                if tile == region:
+                    self._emit(ink, tile, tiles)
+                else:
+                    self._cut(ink, tile, tiles)
+
+    def _emit(self, ink, tile: Tuple[int, int, int, int], tiles: List[Tuple[int, int, int, int]]):
+        """Add a block as tiles, splitting it at its least-inked rows if it is too tall"""
+        x, y, w, h = tile
+        if w < self.min_tile_size:
+            return
+        while h > self.max_band_height:
+            low = self.max_band_height // 2
+            profile = ink[y + low:y + self.max_band_height, x:x + w].sum(axis=1)
+            cut = low + int(np.argmin(profile))
+            if cut >= self.min_tile_size:
+                tiles.append((x, y, w, cut))
+            y, h = y + cut, h - cut
+        if h >= self.min_tile_size:
+            tiles.append((x, y, w, h))
+
+    # OCR
+    def _ocr_words(self, image) -> List[Dict[str, Any]]:
+        """Word boxes for one image from the shared OCR service"""
+        return get_ocr_service().recognize(image, config=self.config)
+
+    def _ocr_tiles(self, binary, tiles, background: int) -> List[List[Dict[str, Any]]]:
+        """OCR tiles in parallel, each with a background border; boxes come back tile-relative"""
+        service = get_ocr_service()
+        futures = []
+        for x, y, w, h in tiles:
+            crop = np.pad(binary[y:y + h, x:x + w], self.padding, constant_values=background)
+            futures.append(service.submit(crop, config=self.config))
+        results = []
+        for future in futures:
+            words = future.result()
+            for word in words:
+                bx, by, bw, bh = word['box']
+                word['box'] = (bx - self.padding, by - self.padding, bw, bh)
+            results.append(words)
+        return results
+
+    def _distribute(self, words, tiles) -> List[List[Dict[str, Any]]]:
+        """Assign full-frame words to the tile containing each word's centre (tile-relative boxes)"""
+        per_tile: List[List[Dict[str, Any]]] = [[] for _ in tiles]
+        for word in words:
+            bx, by, bw, bh = word['box']
+            cx, cy = bx + bw / 2, by + bh / 2
+            for i, (x, y, w, h) in enumerate(tiles):
+                if x <= cx < x + w and y <= cy < y + h:
+                    per_tile[i].append(dict(word, box=(bx - x, by - y, bw, bh)))
+                    break
+        return per_tile
+
+    def _tile_key(self, binary, tile) -> bytes:
+        x, y, w, h = tile
+        digest = hashlib.blake2b(np.ascontiguousarray(binary[y:y + h, x:x + w]).tobytes(), digest_size=16)
+        digest.update(f"{w}x{h}".encode())
+        return digest.digest()
+
+    def recognize(self, binary) -> OCRResult:
+        """OCR a binarized frame (e.g. `ScreenFrame.thresholded`), reusing cached tiles"""
+        start = time.perf_counter()
+        background = self._background(binary)
+        tiles = self.tiles(binary, background)
+        keys = [self._tile_key(binary, tile) for tile in tiles]
+
+        with self._lock:
+            cached = [self._cache.get(key) for key in keys]
+        dirty = [i for i, words in enumerate(cached) if words is None]
+
+        if dirty:
+            dirty_area = sum(tiles[i][2] * tiles[i][3] for i in dirty)
+            total_area = sum(w * h for _, _, w, h in tiles) or 1
+            if dirty_area / total_area >= self.full_refresh_ratio:
+                # Mostly new content - one full pass is cheaper than many tile passes
+                self.full_refreshes += 1
+                fresh = self._distribute(self._ocr_words(binary), tiles)
+                for i in dirty:
+                    cached[i] = fresh[i]
+            else:
+                fresh = self._ocr_tiles(binary, [tiles[i] for i in dirty], background)
+                for i, words in zip(dirty, fresh):
+                    cached[i] = words
+            with self._lock:
+                for i in dirty:
+                    self._cache[keys[i]] = cached[i]
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        with self._lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+
+        words: List[Dict[str, Any]] = []
+        lines: List[str] = []
+        for (x, y, _, _), tile_words in zip(tiles, cached):
+            for word in tile_words:
+                bx, by, bw, bh = word['box']
+                words.append(dict(word, box=(bx + x, by + y, bw, bh)))
+            if tile_words:
+                lines.append(join_lines(tile_words))
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.frames += 1
+        self.tiles_seen += len(tiles)
+        self.tiles_ocred += len(dirty)
+        self.last_elapsed_ms = elapsed
+        if dirty:
+            self.logger.debug(f"Incremental OCR: {len(dirty)}/{len(tiles)} tiles dirty, {elapsed:.0f} ms")
+        return OCRResult('\n'.join(lines), words, len(tiles), len(dirty), elapsed)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            'frames': self.frames,
+            'tiles_seen': self.tiles_seen,
+            'tiles_ocred': self.tiles_ocred,
+            'tile_hit_rate': 1 - self.tiles_ocred / self.tiles_seen if self.tiles_seen else 0.0,
+            'full_refreshes': self.full_refreshes,
+            'cached_tiles': len(self._cache),
+            'last_ms': self.last_elapsed_ms
+        }
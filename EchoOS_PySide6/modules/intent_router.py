@@ -0,0 +1,162 @@
+"""
+Intent Router for EchoOS
+Routes a command to every matching category in one pass with a compiled keyword automaton
+"""
+
+import logging
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (category, priority, keywords) - lower priority wins. Matching is plain substring
+# matching, the same as the `any(keyword in text ...)` checks this table replaces.
+ROUTE_TABLE = [
+    ('system', 10, [
+        'shutdown', 'restart', 'reboot', 'sleep', 'hibernate',
+        'lock screen', 'lock', 'logout', 'log out',
+        'volume up', 'volume down', 'mute', 'unmute',
+        'system info', 'battery', 'disk space', 'memory', 'cpu'
+    ]),
+    ('go_back', 15, [
+        'go back', 'back directory', 'previous directory', 'navigate back', 'go up', 'parent directory'
+    ]),
+    ('file', 20, [
+        'open file', 'create file', 'delete file', 'copy file', 'move file',
+        'rename file', 'create folder', 'delete folder', 'navigate to',
+        'go to', 'list files', 'show files', 'save file', 'open file explorer',
+        'file explorer', 'explorer', 'go back', 'back directory', 'previous directory',
+        'navigate back', 'go up', 'parent directory', 'current directory'
+    ]),
+    ('app', 30, [
+        'open app', 'close app', 'minimize', 'maximize', 'restore',
+        'switch to', 'switch app', 'go to app', 'bring to front',
+        'close all apps', 'close all', 'next app', 'previous app',
+        'list apps', 'list open apps'
+    ]),
+    ('media', 40, ['play', 'pause', 'stop', 'next', 'previous', 'seek', 'start from beginning']),
+    ('text', 50, [
+        'type', 'write', 'enter', 'select all', 'copy all', 'paste all',
+        'copy', 'paste', 'cut', 'undo', 'redo'
+    ]),
+    ('accessibility', 60, [
+        'read screen', 'screen read', 'describe screen', 'screen describe',
+        'navigation mode', 'enable navigation', 'disable navigation'
+    ]),
+    ('navigation', 70, [
+        'click', 'double click', 'right click', 'scroll up', 'scroll down',
+        'zoom in', 'zoom out', 'navigate up', 'navigate down'
+    ]),
+    ('web', 80, [
+        'search', 'google', 'youtube', 'amazon', 'open website', 'go to website',
+        'next tab', 'previous tab', 'switch tab', 'close tab', 'new tab',
+        'list tabs', 'tab number'
+    ]),
+    ('cmd', 90, [
+        'command prompt', 'cmd', 'powershell', 'terminal', 'execute command',
+        'run command', 'type command'
+    ]),
+]
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a fixed keyword set.
+
+    Finds every occurrence of every keyword in a single left-to-right pass, so
+    the cost of a scan depends on the text length (plus matches found), not on
+    the number of keywords.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, str]]] = [[]]  # state -> (keyword, label) ending here
+
+        for keyword, label in keywords:
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((keyword, label))
+
+        # Breadth-first failure links; outputs of the failure state are merged in
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for ch, nxt in self._goto[state].items():
+                pending.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def find_all(self, text: str) -> List[Tuple[str, str, int, int]]:
+        """All (keyword, label, start, end) occurrences in `text`"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for keyword, label in out[state]:
+                found.append((keyword, label, i + 1 - len(keyword), i + 1))
+        return found
+
+    def __len__(self):
+        return len(self._goto)
+
+
+class RouteResult:
+    """Categories matched by one command, ordered by priority, with the keyword spans that matched"""
+
+    def __init__(self, text: str, spans: Dict[str, List[Tuple[str, int, int]]], priorities: Dict[str, int]):
+        self.text = text
+        self.spans = spans
+        self.categories = sorted(spans, key=lambda c: priorities[c])
+
+    def has(self, category: str) -> bool:
+        return category in self.spans
+
+    def first(self) -> Optional[str]:
+        """Highest-priority matching category"""
+        return self.categories[0] if self.categories else None
+
+    def keywords(self, category: str) -> List[str]:
+        return [keyword for keyword, _, _ in self.spans.get(category, [])]
+
+    def __repr__(self):
+        return f"RouteResult({self.text!r}, {self.categories})"
+
+
+class IntentRouter:
+    """Compiles a route table once and classifies commands in one pass"""
+
+    def __init__(self, table=None):
+        self.logger = logging.getLogger(__name__)
+        self.table = list(table if table is not None else ROUTE_TABLE)
+        self.priorities = {category: priority for category, priority, _ in self.table}
+        self._automaton = KeywordAutomaton(
+            (keyword, category) for category, _, keywords in self.table for keyword in keywords
+        )
+        self._last: Optional[RouteResult] = None
+        self.logger.debug(f"Intent router compiled: {len(self.table)} categories, {len(self._automaton)} states")
+
+    def route(self, text: str) -> RouteResult:
+        """Every matching category for `text` (expects lowercased text, like the executor uses)"""
+        last = self._last
+        if last is not None and last.text == text:
+            return last
+        spans: Dict[str, List[Tuple[str, int, int]]] = {}
+        for keyword, category, start, end in self._automaton.find_all(text):
+            spans.setdefault(category, []).append((keyword, start, end))
+        result = RouteResult(text, spans, self.priorities)
+        self._last = result
+        return result
@@ -0,0 +1,289 @@
+"""
+OCR Service for EchoOS
+One shared pool of long-lived Tesseract workers that every screen reader submits region jobs to
+"""
+
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# In-process Tesseract (preferred: no subprocess or temp file per call, releases the GIL while recognizing)
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+# Subprocess Tesseract (fallback)
+try:
+    import pytesseract
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+OCR_AVAILABLE = (TESSEROCR_AVAILABLE or PYTESSERACT_AVAILABLE) and PIL_AVAILABLE
+
+DEFAULT_CONFIG = '--psm 3'  # Tesseract's own default: fully automatic page segmentation
+
+
+def join_lines(words: Sequence[Dict[str, Any]]) -> str:
+    """Text of `words` (in recognition order), one output line per Tesseract text line"""
+    lines: List[str] = []
+    current_line, parts = None, []
+    for word in words:
+        if word['line'] != current_line and parts:
+            lines.append(' '.join(parts))
+            parts = []
+        current_line = word['line']
+        parts.append(word['text'])
+    if parts:
+        lines.append(' '.join(parts))
+    return '\n'.join(lines)
+
+
+class OCRJob:
+    """One recognition request: an image (or a region of one) and the Future its words are delivered to"""
+
+    def __init__(self, image, region: Optional[Tuple[int, int, int, int]] = None, config: str = DEFAULT_CONFIG):
+        self.image = image
+        self.region = region  # (x, y, w, h) in image coordinates, None for the whole image
+        self.config = config
+        self.future: Future = Future()
+        self.submitted_at = time.perf_counter()
+
+
+class OCRService:
+    """Shared Tesseract worker pool.
+
+    Each worker thread owns one long-lived engine. With tesserocr that is an
+    in-process `PyTessBaseAPI` that loads the language data once and drops the
+    GIL while recognizing, so region jobs run in parallel across cores. Without
+    tesserocr the workers fall back to pytesseract, which still spawns one
+    `tesseract` process per job but at least runs `workers` of them at once
+    instead of one at a time on the caller's thread.
+
+    Jobs return word dicts - `text`, `box` (x, y, w, h in the submitted
+    image's coordinates), `conf` and `line` (block, paragraph, line) - so every
+    caller gets word-level boxes, and `join_lines()` turns them into text.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, workers: Optional[int] = None, lang: str = 'eng'):
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.lang = lang
+        self.backend = 'tesserocr' if TESSEROCR_AVAILABLE else 'pytesseract' if PYTESSERACT_AVAILABLE else None
+        self._queue: "queue.Queue[Optional[OCRJob]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self._latencies: "deque[float]" = deque(maxlen=200)  # submit -> result, ms
+        self._waits: "deque[float]" = deque(maxlen=200)  # time spent queued, ms
+        self.last_latency_ms = 0.0
+
+    @classmethod
+    def instance(cls) -> "OCRService":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @staticmethod
+    def is_available() -> bool:
+        return OCR_AVAILABLE
+
+    # Worker pool
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"ocr-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            self.logger.info(f"OCR service started: {self.workers} {self.backend} workers")
+
+    def shutdown(self):
+        """Stop the workers once the queued jobs are done"""
+        with self._start_lock:
+            for _ in self._threads:
+                self._queue.put(None)
+            self._threads = []
+
+    def _run(self):
+        api = None
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    break
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                started = time.perf_counter()
+                try:
+                    image = self._prepare(job)
+                    if self.backend == 'tesserocr':
+                        if api is None:
+                            api = tesserocr.PyTessBaseAPI(lang=self.lang)
+                        words = self._recognize_tesserocr(api, image, job.config)
+                    else:
+                        words = self._recognize_pytesseract(image, job.config)
+                    if job.region:
+                        x, y = job.region[0], job.region[1]
+                        for word in words:
+                            bx, by, bw, bh = word['box']
+                            word['box'] = (bx + x, by + y, bw, bh)
+                    job.future.set_result(words)
+                    failed = False
+                except Exception as e:
+                    job.future.set_exception(e)
+                    failed = True
+                self._record(job, started, failed)
+        finally:
+            if api is not None:
+                api.End()
+
+    def _record(self, job: OCRJob, started: float, failed: bool):
+        now = time.perf_counter()
+        latency = (now - job.submitted_at) * 1000
+        with self._stats_lock:
+            if failed:
+                self.jobs_failed += 1
+            else:
+                self.jobs_done += 1
+            self._latencies.append(latency)
+            self._waits.append((started - job.submitted_at) * 1000)
+            self.last_latency_ms = latency
+
+    # Backends
+    @staticmethod
+    def _prepare(job: OCRJob):
+        image = job.image
+        if not hasattr(image, 'crop'):
+            image = Image.fromarray(image)
+        if job.region:
+            x, y, w, h = job.region
+            image = image.crop((x, y, x + w, y + h))
+        return image
+
+    @staticmethod
+    def _psm(config: str) -> int:
+        match = re.search(r'--psm\s+(\d+)', config or '')
+        return int(match.group(1)) if match else 3
+
+    def _recognize_tesserocr(self, api, image, config: str) -> List[Dict[str, Any]]:
+        RIL = tesserocr.RIL
+        api.SetPageSegMode(self._psm(config))
+        api.SetImage(image)
+        api.Recognize()
+        iterator = api.GetIterator()
+        words = []
+        if iterator is None:
+            return words
+        block = par = line = 0
+        for item in tesserocr.iterate_level(iterator, RIL.WORD):
+            if item.IsAtBeginningOf(RIL.BLOCK):
+                block, par, line = block + 1, 0, 0
+            if item.IsAtBeginningOf(RIL.PARA):
+                par, line = par + 1, 0
+            if item.IsAtBeginningOf(RIL.TEXTLINE):
+                line += 1
+            text = (item.GetUTF8Text(RIL.WORD) or '').strip()
+            box = item.BoundingBox(RIL.WORD)
+            if not text or not box:
+                continue
+            x1, y1, x2, y2 = box
+            words.append({
+                'text': text,
+                'box': (x1, y1, x2 - x1, y2 - y1),
+                'conf': float(item.Confidence(RIL.WORD)),
+                'line': (block, par, line)
+            })
+        return words
+
+    def _recognize_pytesseract(self, image, config: str) -> List[Dict[str, Any]]:
+        data = pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+        words = []
+        for i, text in enumerate(data.get('text', [])):
+            text = (text or '').strip()
+            if not text:
+                continue
+            words.append({
+                'text': text,
+                'box': (data['left'][i], data['top'][i], data['width'][i], data['height'][i]),
+                'conf': float(data['conf'][i]),
+                'line': (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            })
+        return words
+
+    # Public API
+    def submit(self, image, region: Optional[Tuple[int, int, int, int]] = None,
+               config: str = DEFAULT_CONFIG) -> Future:
+        """Queue a job. `image` is a PIL image or numpy array; `region` is (x, y, w, h).
+        The Future resolves to word dicts with boxes in `image` coordinates."""
+        if not OCR_AVAILABLE:
+            raise RuntimeError("No OCR backend available (install tesserocr or pytesseract)")
+        self._ensure_started()
+        job = OCRJob(image, region, config)
+        self._queue.put(job)
+        return job.future
+
+    def recognize(self, image, region: Optional[Tuple[int, int, int, int]] = None,
+                  config: str = DEFAULT_CONFIG, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Word boxes for `image` (or one region of it), blocking until done"""
+        return self.submit(image, region, config).result(timeout=timeout)
+
+    def recognize_regions(self, image, regions: Sequence[Tuple[int, int, int, int]],
+                          config: str = DEFAULT_CONFIG, timeout: Optional[float] = None) -> List[List[Dict[str, Any]]]:
+        """OCR several regions of one image in parallel; one word list per region, in order"""
+        futures = [self.submit(image, region, config) for region in regions]
+        return [future.result(timeout=timeout) for future in futures]
+
+    def text(self, image, region: Optional[Tuple[int, int, int, int]] = None,
+             config: str = DEFAULT_CONFIG, timeout: Optional[float] = None) -> str:
+        """Drop-in for `pytesseract.image_to_string`"""
+        return join_lines(self.recognize(image, region, config, timeout))
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            waits = list(self._waits)
+            return {
+                'backend': self.backend,
+                'workers': self.workers,
+                'running': bool(self._threads),
+                'queue_depth': self.queue_depth,
+                'jobs_done': self.jobs_done,
+                'jobs_failed': self.jobs_failed,
+                'last_latency_ms': self.last_latency_ms,
+                'mean_latency_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+                'p95_latency_ms': latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+                'mean_queue_wait_ms': sum(waits) / len(waits) if waits else 0.0
+            }
+
+
+def get_ocr_service() -> OCRService:
+    """Return the process-wide OCR service (workers start on the first job)"""
+    return OCRService.instance()
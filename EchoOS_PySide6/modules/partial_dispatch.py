@@ -0,0 +1,98 @@
+"""
+Partial-Result Early Dispatch for EchoOS
+Fires short, unambiguous commands from stable Vosk partial hypotheses before the final result
+"""
+
+import logging
+from typing import Iterable, Optional, Set
+
+# Commands that take an argument or are destructive are never dispatched from a partial
+EARLY_DISPATCH_EXCLUDED = {
+    'type', 'write', 'enter', 'find', 'replace', 'click on',
+    'search for', 'search about', 'search google', 'search youtube', 'search amazon',
+    'shutdown', 'restart', 'sleep', 'hibernate',
+    'create file', 'create folder', 'delete file', 'copy file', 'move file', 'rename file',
+}
+
+
+class PartialCommandDispatcher:
+    """Tracks partial hypotheses for one utterance at a time.
+
+    A command is eligible for early dispatch when it is a known command, not in
+    EARLY_DISPATCH_EXCLUDED, and not a word-prefix of another known command
+    (so "next" never fires while the user is still saying "next tab").
+    """
+
+    def __init__(self, commands: Iterable[str], stable_frames: int = 3):
+        self.logger = logging.getLogger(__name__)
+        self.stable_frames = max(1, stable_frames)
+        self.eligible: Set[str] = set()
+        self.set_commands(commands)
+        self.dispatched_count = 0
+        self.suppressed_count = 0
+        self.extended_count = 0  # Finals that went on past an early-dispatched command
+        self.reset()
+
+    def set_commands(self, commands: Iterable[str]):
+        """Rebuild the set of commands that may be dispatched early"""
+        known = {' '.join(c.lower().split()) for c in commands if c and c.strip()}
+        prefixes = set()
+        for command in known:
+            words = command.split()
+            for i in range(1, len(words)):
+                prefixes.add(' '.join(words[:i]))
+        self.eligible = {c for c in known if c not in prefixes and c not in EARLY_DISPATCH_EXCLUDED}
+
+    def reset(self):
+        """Start tracking a new utterance"""
+        self._candidate = None
+        self._stable = 0
+        self.dispatched: Optional[str] = None
+
+    def observe(self, partial_text: str) -> Optional[str]:
+        """Feed one partial hypothesis. Returns the command to dispatch now, if any."""
+        if self.dispatched:
+            return None
+
+        text = ' '.join(partial_text.lower().split()) if partial_text else ''
+        if text not in self.eligible:
+            self._candidate = None
+            self._stable = 0
+            return None
+
+        if text == self._candidate:
+            self._stable += 1
+        else:
+            self._candidate = text
+            self._stable = 1
+
+        if self._stable >= self.stable_frames:
+            self.dispatched = text
+            self.dispatched_count += 1
+            return text
+        return None
+
+    def reconcile(self, final_text: str) -> bool:
+        """Close the utterance. Returns True if the final result must be suppressed
+        because it was already dispatched from a partial hypothesis.
+
+        Only a final identical to the dispatched command is suppressed. One that
+        goes on after it ("go to documents" -> "go to documents projects") is
+        what the user actually meant, so it is dispatched as well.
+        """
+        dispatched = self.dispatched
+        self.reset()
+        if not dispatched:
+            return False
+
+        final = ' '.join(final_text.lower().split()) if final_text else ''
+        if not final or final == dispatched:
+            self.suppressed_count += 1
+            return True
+
+        if final.startswith(dispatched + ' '):
+            self.extended_count += 1
+            self.logger.info(f"Final result '{final}' extends early-dispatched '{dispatched}' - dispatching it too")
+        else:
+            self.logger.warning(f"Final result '{final}' differs from early-dispatched '{dispatched}'")
+        return False
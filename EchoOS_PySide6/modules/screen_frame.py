@@ -0,0 +1,167 @@
+"""
+Screen Frame Acquisition for EchoOS
+One screen capture per analysis, with derived image planes computed once and shared by every detector
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+# Image processing imports
+try:
+    import cv2
+    import numpy as np
+    from PIL import ImageGrab
+    IMAGE_PROCESSING_AVAILABLE = True
+except ImportError:
+    IMAGE_PROCESSING_AVAILABLE = False
+
+from .ui_detection import ImagePyramid
+
+logger = logging.getLogger(__name__)
+
+# Focus regions inside the active window, as fractions (left, top, right, bottom) of its rectangle
+FOCUS_REGIONS = {
+    'file_list': (0.22, 0.18, 1.0, 0.96),      # Explorer: right of the navigation pane, below ribbon and address bar
+    'browser_content': (0.0, 0.14, 1.0, 1.0),  # Browser: below tabs, address bar and bookmarks bar
+}
+
+# Our own window - scoping OCR to it would only ever read EchoOS itself
+OWN_WINDOW_TITLE = "EchoOS"
+
+# Windows smaller than this (e.g. minimized ones, parked at -32000 as a 160x28 stub) are not worth scoping to
+MIN_SCOPE_SIZE = 64
+
+
+def window_capture_bbox(window_info: Optional[Dict[str, Any]],
+                        focus: Optional[Union[str, Tuple[float, float, float, float]]] = None) -> Optional[Tuple[int, int, int, int]]:
+    """Capture bbox (left, top, right, bottom) for the active window, narrowed to `focus` if given.
+
+    `window_info` needs a 'bbox' entry in screen coordinates. `focus` is a
+    FOCUS_REGIONS name or a fraction tuple. Returns None when there is no
+    usable window, meaning the caller should capture the whole desktop.
+    """
+    if not window_info or not window_info.get('bbox'):
+        return None
+    if (window_info.get('title') or '').startswith(OWN_WINDOW_TITLE):
+        return None
+    left, top, right, bottom = (int(v) for v in window_info['bbox'])
+    if right - left < MIN_SCOPE_SIZE or bottom - top < MIN_SCOPE_SIZE:
+        return None
+    if focus:
+        fractions = FOCUS_REGIONS.get(focus) if isinstance(focus, str) else focus
+        if fractions:
+            width, height = right - left, bottom - top
+            fl, ft, fr, fb = fractions
+            left, top, right, bottom = (left + int(fl * width), top + int(ft * height),
+                                        left + int(fr * width), top + int(fb * height))
+    return left, top, right, bottom
+
+
+class ScreenFrame:
+    """A single captured frame and its lazily derived planes.
+
+    `rgb` wraps the captured image without copying it. `gray`,
+    `thresholded`, `bgr` and `edges()` are each computed the first time a
+    detector asks for them and cached, so OCR and UI-element detection share
+    one grab and one grayscale conversion. `origin` is the screen position of
+    the frame's top-left pixel, for mapping boxes back to screen coordinates.
+    """
+
+    def __init__(self, image, origin: Tuple[int, int] = (0, 0), captured_at: Optional[float] = None,
+                 scope: str = 'desktop'):
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        self.image = image
+        self.origin = origin
+        self.scope = scope  # 'desktop', 'window' or 'focus'
+        self.captured_at = captured_at or time.time()
+        self._lock = threading.RLock()  # Planes build on other planes (thresholded -> gray -> rgb)
+        self._planes: Dict[str, "np.ndarray"] = {}
+
+    @classmethod
+    def capture(cls, bbox: Optional[Tuple[int, int, int, int]] = None, all_screens: bool = False) -> Optional["ScreenFrame"]:
+        """Grab the screen (or the `bbox` = (left, top, right, bottom) region). None if capture is unavailable."""
+        if not IMAGE_PROCESSING_AVAILABLE:
+            return None
+        try:
+            start = time.perf_counter()
+            if all_screens:
+                image = ImageGrab.grab(bbox=bbox, all_screens=True)
+            else:
+                image = ImageGrab.grab(bbox=bbox)
+            origin = (bbox[0], bbox[1]) if bbox else (0, 0)
+            frame = cls(image, origin)
+            logger.debug(f"Captured {frame.width}x{frame.height} frame in {(time.perf_counter() - start) * 1000:.0f} ms")
+            return frame
+        except Exception as e:
+            logger.error(f"Screen capture failed: {e}")
+            return None
+
+    @classmethod
+    def capture_scoped(cls, window_info: Optional[Dict[str, Any]] = None,
+                       focus: Optional[Union[str, Tuple[float, float, float, float]]] = None) -> Optional["ScreenFrame"]:
+        """Capture only the active window (or a focus region of it); the whole desktop if there is no usable window"""
+        bbox = window_capture_bbox(window_info, focus)
+        if bbox is not None:
+            # all_screens so windows on secondary monitors (negative coordinates) can be grabbed
+            frame = cls.capture(bbox, all_screens=True)
+            if frame is not None:
+                frame.scope = 'focus' if focus else 'window'
+                return frame
+        return cls.capture()
+
+    @property
+    def width(self) -> int:
+        return self.image.width
+
+    @property
+    def height(self) -> int:
+        return self.image.height
+
+    def _plane(self, name: str, build):
+        plane = self._planes.get(name)
+        if plane is None:
+            with self._lock:
+                plane = self._planes.get(name)
+                if plane is None:
+                    plane = build()
+                    self._planes[name] = plane
+        return plane
+
+    @property
+    def rgb(self) -> "np.ndarray":
+        """H x W x 3 view of the captured pixels"""
+        return self._plane('rgb', lambda: np.asarray(self.image))
+
+    @property
+    def bgr(self) -> "np.ndarray":
+        """OpenCV channel order (only built if a detector needs colour in BGR)"""
+        return self._plane('bgr', lambda: cv2.cvtColor(self.rgb, cv2.COLOR_RGB2BGR))
+
+    @property
+    def gray(self) -> "np.ndarray":
+        """Grayscale plane, converted straight from RGB"""
+        return self._plane('gray', lambda: cv2.cvtColor(self.rgb, cv2.COLOR_RGB2GRAY))
+
+    @property
+    def thresholded(self) -> "np.ndarray":
+        """Otsu-binarized grayscale, the OCR input"""
+        def build():
+            _, thresh = cv2.threshold(self.gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            return thresh
+        return self._plane('thresholded', build)
+
+    def edges(self, low: int = 50, high: int = 150) -> "np.ndarray":
+        """Canny edge map of the grayscale plane, cached per threshold pair"""
+        return self._plane(f'edges:{low}:{high}', lambda: cv2.Canny(self.gray, low, high))
+
+    @property
+    def pyramid(self) -> ImagePyramid:
+        """Downscaled levels of the grayscale plane for UI element detection"""
+        return self._plane('pyramid', lambda: ImagePyramid(self.gray))
+
+    def to_screen(self, x: int, y: int) -> Tuple[int, int]:
+        """Map frame pixel coordinates to screen coordinates"""
+        return x + self.origin[0], y + self.origin[1]
@@ -4,6 +4,7 @@ try:
     import sounddevice as sd
 except Exception:
     Model=None; KaldiRecognizer=None; sd=None
+from .vosk_registry import get_model_registry
 MODEL_BASE = "https://alphacephei.com/vosk/models/"
 def download_vosk_model(model_dir="models/vosk-model-small-en-us-0.15"):
     try:
@@ -19,19 +20,25 @@ def download_vosk_model(model_dir="models/vosk-model-small-en-us-0.15"):
 class VoskManager:
     def __init__(self, tts=None, model_path="models/vosk-model-small-en-us-0.15"):
         self.model_path = model_path; self.model=None; self._listening=False; self.tts=tts
-        if Model is not None and os.path.exists(self.model_path):
-            try: self.model = Model(self.model_path)
-            except Exception as e: print("model load", e)
+        # Shared with EnhancedSTT through the registry - loaded once, in the background
+        self.model_ready = get_model_registry().preload(self.model_path) if Model is not None else None
     def start_listening(self, callback, timeout=4):
-        if self.model is None or sd is None: return False
+        if self.model_ready is None or sd is None: return False
+        if self.model_ready.done() and self.model_ready.exception() is not None: print("model load", self.model_ready.exception()); return False
         if self._listening: return False
         self._listening=True
         self._thread = threading.Thread(target=self._loop, args=(callback,timeout), daemon=True); self._thread.start(); return True
     def stop_listening(self):
         self._listening=False
     def _loop(self, callback, timeout):
+        registry = get_model_registry()
+        self.model = registry.get_model(self.model_path)
+        rec = registry.acquire_recognizer(self.model_path, 16000) if self.model is not None else None
+        if rec is None: self._listening=False; return
+        try: self._recognize(rec, callback, timeout)
+        finally: registry.release_recognizer(rec)
+    def _recognize(self, rec, callback, timeout):
         import json
-        rec = KaldiRecognizer(self.model, 16000)
         while self._listening:
             try:
                 data = sd.rec(int(timeout*16000), samplerate=16000, channels=1, dtype='int16'); sd.wait()
@@ -0,0 +1,122 @@
+"""
+Command Grammar for EchoOS
+Builds a Vosk phrase-list grammar from the live command and app vocabulary
+"""
+
+import json
+import re
+import logging
+import threading
+from typing import Dict, Iterable, List, Set, Optional, Any
+
+UNKNOWN_TOKEN = "[unk]"
+
+# Vosk grammars cannot contain digits or punctuation; app names longer than this are skipped
+MAX_PHRASE_WORDS = 4
+
+
+def normalize_phrase(text: str) -> str:
+    """Lowercase a phrase and keep only the characters a Vosk grammar accepts"""
+    text = text.lower().replace('_', ' ').replace('-', ' ').replace('.', ' ')
+    text = re.sub(r"[^a-z' ]+", ' ', text)
+    return ' '.join(text.split())
+
+
+class CommandGrammar:
+    """Phrase-list grammar assembled from named vocabulary sources.
+
+    Each source (common commands, commands.json, custom patterns, app names)
+    is stored separately, so replacing one source only recompiles the grammar
+    when its phrases actually changed. `version` increases on every change,
+    which lets callers cache recognizers per grammar version.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._sources: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._compiled: Optional[str] = None
+        self.version = 0
+
+    def set_source(self, name: str, phrases: Iterable[str]) -> bool:
+        """Replace the phrases of one source. Returns True if the grammar changed."""
+        normalized = set()
+        for phrase in phrases:
+            if not isinstance(phrase, str):
+                continue
+            phrase = normalize_phrase(phrase)
+            if phrase and len(phrase.split()) <= MAX_PHRASE_WORDS:
+                normalized.add(phrase)
+
+        with self._lock:
+            if self._sources.get(name) == normalized:
+                return False
+            self._sources[name] = normalized
+            self._compiled = None
+            self.version += 1
+        self.logger.debug(f"Grammar source '{name}' updated ({len(normalized)} phrases)")
+        return True
+
+    def load_commands_file(self, path) -> bool:
+        """Add the synonyms from config/commands.json"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                commands = json.load(f)
+        except Exception as e:
+            self.logger.debug(f"Could not read {path}: {e}")
+            return False
+        phrases = []
+        for synonyms in commands.values():
+            if isinstance(synonyms, list):
+                phrases.extend(synonyms)
+        return self.set_source('commands_file', phrases)
+
+    def load_custom_patterns(self, universal_config) -> bool:
+        """Add UniversalConfig custom patterns and command aliases"""
+        if universal_config is None:
+            return False
+        phrases = []
+        for patterns in universal_config.get_custom_patterns().values():
+            if isinstance(patterns, dict):
+                phrases.extend(patterns.keys())
+        aliases = universal_config.get_command_aliases()
+        phrases.extend(aliases.keys())
+        phrases.extend(v for v in aliases.values() if isinstance(v, str))
+        return self.set_source('custom_patterns', phrases)
+
+    def load_apps(self, apps: List[Dict[str, Any]]) -> bool:
+        """Add discovered app names and their aliases"""
+        phrases = []
+        for app in apps:
+            phrases.append(app.get('name', ''))
+            phrases.extend(app.get('aliases') or [])
+        return self.set_source('apps', phrases)
+
+    def phrases(self) -> List[str]:
+        """All phrases currently in the grammar"""
+        with self._lock:
+            merged = set()
+            for phrases in self._sources.values():
+                merged |= phrases
+        return sorted(merged)
+
+    def compile(self) -> str:
+        """JSON phrase list for KaldiRecognizer (cached until a source changes)"""
+        with self._lock:
+            if self._compiled is not None:
+                return self._compiled
+            merged = set()
+            for phrases in self._sources.values():
+                merged |= phrases
+            self._compiled = json.dumps(sorted(merged) + [UNKNOWN_TOKEN])
+            self.logger.info(f"Compiled command grammar v{self.version} ({len(merged)} phrases)")
+            return self._compiled
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(p) for p in self._sources.values())
+
+
+def strip_unknown(text: str) -> str:
+    """Remove [unk] tokens from a grammar-constrained result"""
+    return ' '.join(w for w in text.split() if w != UNKNOWN_TOKEN)
@@ -37,11 +37,10 @@ except ImportError:
     IMAGE_PROCESSING_AVAILABLE = False
     print("Image processing not available - screen analysis will be limited")
 
-try:
-    import pytesseract
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+from .ocr_service import OCR_AVAILABLE, get_ocr_service
+from .screen_frame import ScreenFrame, window_capture_bbox
+from .ui_detection import DETECTION_SCALE, ImagePyramid, size_mask
+if not OCR_AVAILABLE:
     print("OCR not available - text recognition will be limited")
 
 # Platform-specific imports
@@ -103,6 +102,10 @@ class UniversalUIAutomator:
         # Screen analysis settings
         self.screen_analysis_enabled = True
         self.element_detection_confidence = 0.7
+        self.capture_scope = 'window'  # 'window' (active window only) or 'desktop'
+        self.focus_region = None  # FOCUS_REGIONS name or (left, top, right, bottom) fractions of the window
+        self.capture_origin = (0, 0)  # Screen position of the last capture's top-left pixel
+        self.detection_scale = DETECTION_SCALE  # Pyramid level UI elements are detected on
         
     def _initialize_platform_components(self):
         """Initialize platform-specific components"""
@@ -154,16 +157,24 @@ class UniversalUIAutomator:
     def analyze_screen(self) -> ScreenContext:
         """Analyze current screen and return context"""
         try:
-            # Capture screen
-            screenshot = self._capture_screen()
-            if screenshot is None:
-                return self.current_context
-            
             # Get active window info
             self.current_context.active_window = self._get_active_window()
             
-            # Detect UI elements
-            self.current_context.screen_elements = self._detect_ui_elements(screenshot)
+            # Capture the active window (the whole screen if there is no usable window)
+            screenshot = self._capture_screen(self.current_context.active_window)
+            if screenshot is None:
+                return self.current_context
+            
+            # Detect UI elements, in screen coordinates
+            elements = self._detect_ui_elements(screenshot)
+            ox, oy = self.capture_origin
+            if ox or oy:
+                for element in elements:
+                    element.x += ox
+                    element.y += oy
+                    element.center_x += ox
+                    element.center_y += oy
+            self.current_context.screen_elements = elements
             
             # Extract text content
             self.current_context.current_text = self._extract_text(screenshot)
@@ -185,10 +196,20 @@ class UniversalUIAutomator:
             )
             raise e
     
-    def _capture_screen(self) -> Optional[Image.Image]:
-        """Capture current screen"""
+    def set_capture_scope(self, scope: str = 'window', focus_region=None):
+        """Choose what gets captured: the active window (default), a focus region of it, or the desktop"""
+        self.capture_scope = scope
+        self.focus_region = focus_region
+    
+    def _capture_screen(self, window: Optional[Dict] = None) -> Optional[Image.Image]:
+        """Capture the active window, or the whole screen"""
         try:
             if IMAGE_PROCESSING_AVAILABLE:
+                bbox = window_capture_bbox(window, self.focus_region) if self.capture_scope != 'desktop' else None
+                if bbox is not None:
+                    self.capture_origin = (bbox[0], bbox[1])
+                    return ImageGrab.grab(bbox=bbox, all_screens=True)
+                self.capture_origin = (0, 0)
                 return ImageGrab.grab()
             return None
         except Exception as e:
@@ -222,6 +243,7 @@ class UniversalUIAutomator:
                 'title': window_text,
                 'hwnd': hwnd,
                 'rect': rect,
+                'bbox': rect,
                 'app_name': self._get_app_name_from_hwnd(hwnd)
             }
         except Exception as e:
@@ -270,7 +292,9 @@ class UniversalUIAutomator:
                 if active_windows:
                     return {
                         'title': active_windows.title,
-                        'app_name': active_windows.title.split(' - ')[-1] if ' - ' in active_windows.title else active_windows.title
+                        'app_name': active_windows.title.split(' - ')[-1] if ' - ' in active_windows.title else active_windows.title,
+                        'bbox': (active_windows.left, active_windows.top,
+                                 active_windows.left + active_windows.width, active_windows.top + active_windows.height)
                     }
             return None
         except Exception as e:
@@ -282,107 +306,77 @@ class UniversalUIAutomator:
         elements = []
         
         try:
-            # Convert PIL image to OpenCV format
             if IMAGE_PROCESSING_AVAILABLE:
-                cv_image = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+                # One grayscale conversion and one downscaled edge/contour pass, shared by all detectors
+                pyramid = ScreenFrame(screenshot).pyramid
                 
                 # Detect buttons (rectangular elements)
-                elements.extend(self._detect_buttons(cv_image))
+                elements.extend(self._detect_buttons(pyramid))
                 
                 # Detect text areas
-                elements.extend(self._detect_text_areas(cv_image))
+                elements.extend(self._detect_text_areas(pyramid))
                 
                 # Detect input fields
-                elements.extend(self._detect_input_fields(cv_image))
+                elements.extend(self._detect_input_fields(pyramid))
             
         except Exception as e:
             self.logger.error(f"Error detecting UI elements: {e}")
         
         return elements
     
-    def _detect_buttons(self, cv_image: np.ndarray) -> List[UIElement]:
+    def _detect_buttons(self, pyramid: ImagePyramid) -> List[UIElement]:
         """Detect button-like elements on screen"""
         buttons = []
         
         try:
-            # Convert to grayscale
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-            
-            # Edge detection
-            edges = cv2.Canny(gray, 50, 150)
+            contours = pyramid.contours(self.detection_scale)
+            rects = pyramid.rects(self.detection_scale)
             
-            # Find contours
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            for contour in contours:
-                # Approximate contour to polygon
-                epsilon = 0.02 * cv2.arcLength(contour, True)
-                approx = cv2.approxPolyDP(contour, epsilon, True)
-                
+            # Filter by size first (reasonable button size), then shape-check only the survivors
+            for i in np.flatnonzero(size_mask(rects, (50, 300), (20, 100))):
                 # Check if it's roughly rectangular (button-like)
-                if len(approx) >= 4:
-                    x, y, w, h = cv2.boundingRect(contour)
-                    
-                    # Filter by size (reasonable button size)
-                    if 50 <= w <= 300 and 20 <= h <= 100:
-                        button = UIElement(x, y, w, h, "button", confidence=0.7)
-                        buttons.append(button)
+                contour = contours[i]
+                epsilon = 0.02 * cv2.arcLength(contour, True)
+                if len(cv2.approxPolyDP(contour, epsilon, True)) >= 4:
+                    x, y, w, h = (int(v) for v in rects[i])
+                    buttons.append(UIElement(x, y, w, h, "button", confidence=0.7))
         
         except Exception as e:
             self.logger.error(f"Error detecting buttons: {e}")
         
         return buttons
     
-    def _detect_text_areas(self, cv_image: np.ndarray) -> List[UIElement]:
+    def _detect_text_areas(self, pyramid: ImagePyramid) -> List[UIElement]:
         """Detect text areas on screen"""
         text_areas = []
         
         try:
             # This is a simplified implementation
             # A full implementation would use more sophisticated text detection
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-            
-            # Use morphological operations to detect text regions
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1))
-            dilated = cv2.dilate(gray, kernel, iterations=1)
+            # Horizontally dilated edges merge the letters of a line into one region
+            rects = pyramid.rects(self.detection_scale, source='dilated')
             
-            # Find contours of text regions
-            contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            for contour in contours:
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Filter by aspect ratio (text is usually wider than tall)
-                aspect_ratio = w / h
-                if 2 <= aspect_ratio <= 20 and w >= 100 and h >= 10:
-                    text_area = UIElement(x, y, w, h, "text", confidence=0.6)
-                    text_areas.append(text_area)
+            # Filter by aspect ratio (text is usually wider than tall)
+            for x, y, w, h in rects[size_mask(rects, (100, float('inf')), (10, float('inf')), aspect=(2, 20))].tolist():
+                text_areas.append(UIElement(x, y, w, h, "text", confidence=0.6))
         
         except Exception as e:
             self.logger.error(f"Error detecting text areas: {e}")
         
         return text_areas
     
-    def _detect_input_fields(self, cv_image: np.ndarray) -> List[UIElement]:
+    def _detect_input_fields(self, pyramid: ImagePyramid) -> List[UIElement]:
         """Detect input field elements on screen"""
         input_fields = []
         
         try:
             # This is a simplified implementation
             # A full implementation would use more sophisticated detection
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
+            rects = pyramid.rects(self.detection_scale)
             
-            # Detect rectangular elements that could be input fields
-            edges = cv2.Canny(gray, 50, 150)
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            for contour in contours:
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Input fields are usually rectangular and medium-sized
-                if 100 <= w <= 500 and 20 <= h <= 50:
-                    input_field = UIElement(x, y, w, h, "input", confidence=0.5)
-                    input_fields.append(input_field)
+            # Input fields are usually rectangular and medium-sized
+            for x, y, w, h in rects[size_mask(rects, (100, 500), (20, 50))].tolist():
+                input_fields.append(UIElement(x, y, w, h, "input", confidence=0.5))
         
         except Exception as e:
             self.logger.error(f"Error detecting input fields: {e}")
@@ -393,7 +387,7 @@ class UniversalUIAutomator:
         """Extract text from screenshot using OCR"""
         try:
             if OCR_AVAILABLE:
-                return pytesseract.image_to_string(screenshot)
+                return get_ocr_service().text(screenshot)
             return ""
         except Exception as e:
             # Silently return empty string for OCR errors
@@ -558,6 +552,8 @@ class UniversalUIAutomator:
             'windows_apis_available': WINDOWS_APIS_AVAILABLE if self.platform == "windows" else False,
             'macos_apis_available': MACOS_APIS_AVAILABLE if self.platform == "darwin" else False,
             'screen_analysis_enabled': self.screen_analysis_enabled,
+            'capture_scope': self.capture_scope,
+            'focus_region': self.focus_region,
             'current_context': {
                 'active_window': self.current_context.active_window,
                 'element_count': len(self.current_context.screen_elements),
@@ -0,0 +1,92 @@
+"""
+UI Element Detection for EchoOS
+Shared image pyramid and vectorized contour filtering for button, text-area and input-field detection
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Image processing imports
+try:
+    import cv2
+    import numpy as np
+    IMAGE_PROCESSING_AVAILABLE = True
+except ImportError:
+    IMAGE_PROCESSING_AVAILABLE = False
+
+# Detection runs on this pyramid level; UI chrome survives halving, and the pixel count drops 4x
+DETECTION_SCALE = 0.5
+
+
+class ImagePyramid:
+    """A grayscale image and its lazily built downscaled levels.
+
+    Every plane a detector needs - the downscaled level, its Canny edges, the
+    dilated edges, their external contours and the contours' bounding rects -
+    is computed once per (scale, parameters) and shared, so button, text-area
+    and input-field detection no longer each redo the grayscale conversion,
+    edge detection and contour search. Rects are returned in full-resolution
+    coordinates.
+    """
+
+    def __init__(self, gray: "np.ndarray"):
+        self.gray = gray
+        self._lock = threading.RLock()
+        self._planes: Dict[Tuple, Any] = {}
+
+    def _plane(self, key: Tuple, build: Callable[[], Any]) -> Any:
+        plane = self._planes.get(key)
+        if plane is None:
+            with self._lock:
+                plane = self._planes.get(key)
+                if plane is None:
+                    plane = build()
+                    self._planes[key] = plane
+        return plane
+
+    def level(self, scale: float = DETECTION_SCALE) -> "np.ndarray":
+        """The image downscaled by `scale` (area interpolation keeps thin UI borders visible)"""
+        if scale >= 1.0:
+            return self.gray
+        return self._plane(('level', scale), lambda: cv2.resize(
+            self.gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA))
+
+    def edges(self, scale: float = DETECTION_SCALE, low: int = 50, high: int = 150) -> "np.ndarray":
+        return self._plane(('edges', scale, low, high), lambda: cv2.Canny(self.level(scale), low, high))
+
+    def dilated(self, scale: float = DETECTION_SCALE, kernel_width: int = 9) -> "np.ndarray":
+        """Edges smeared horizontally so the letters of a text line merge into one region"""
+        def build():
+            width = max(1, int(round(kernel_width * scale)))
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (width, 1))
+            return cv2.dilate(self.edges(scale), kernel, iterations=1)
+        return self._plane(('dilated', scale, kernel_width), build)
+
+    def contours(self, scale: float = DETECTION_SCALE, source: str = 'edges') -> List["np.ndarray"]:
+        """External contours of the `edges` or `dilated` plane, in level coordinates"""
+        def build():
+            plane = self.dilated(scale) if source == 'dilated' else self.edges(scale)
+            found, _ = cv2.findContours(plane, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            return list(found)
+        return self._plane(('contours', scale, source), build)
+
+    def rects(self, scale: float = DETECTION_SCALE, source: str = 'edges') -> "np.ndarray":
+        """N x 4 (x, y, w, h) bounding rects of `contours()`, mapped back to full resolution"""
+        def build():
+            contours = self.contours(scale, source)
+            if not contours:
+                return np.zeros((0, 4), dtype=np.int32)
+            rects = np.array([cv2.boundingRect(c) for c in contours], dtype=np.float32)
+            return np.round(rects / scale).astype(np.int32)
+        return self._plane(('rects', scale, source), build)
+
+
+def size_mask(rects: "np.ndarray", width: Tuple[int, int], height: Tuple[int, int],
+              aspect: Optional[Tuple[float, float]] = None) -> "np.ndarray":
+    """Boolean mask of rects whose width, height (and optionally w/h aspect ratio) fall in the given inclusive ranges"""
+    w, h = rects[:, 2], rects[:, 3]
+    mask = (w >= width[0]) & (w <= width[1]) & (h >= height[0]) & (h <= height[1])
+    if aspect is not None:
+        ratio = w / np.maximum(h, 1)
+        mask &= (ratio >= aspect[0]) & (ratio <= aspect[1])
+    return mask
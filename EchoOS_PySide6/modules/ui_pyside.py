@@ -4,6 +4,8 @@ from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QLabel, QPushB
 from PySide6.QtCore import Qt, Signal, QThread, QPropertyAnimation, QEasingCurve, QRect, QTimer
 import json, os, webbrowser
 from .direct_executor import DirectExecutor
+from .command_pipeline import CommandPipeline
+from .app_registry import get_app_registry
 
 class WorkerThread(QThread):
     def __init__(self, fn, *args, **kwargs):
@@ -40,6 +42,7 @@ class EchoMainWindow(QMainWindow):
         self.typing_mode = False
         self.typing_buffer = []
         self.typing_timer = None
+        self.command_pipeline = self._build_command_pipeline()
         self._build_ui()
 
     def update_components(self, auth, stt_mgr, app_disc, parser, executor, accessibility):
@@ -50,9 +53,33 @@ class EchoMainWindow(QMainWindow):
         self.parser = parser
         self.executor = executor
         self.accessibility = accessibility
+        self.command_pipeline = self._build_command_pipeline()
         self.components_loaded = True
         print("✅ Components updated successfully!")
 
+    def _build_command_pipeline(self):
+        """One parse and one shared context per command; executors tried in priority order"""
+        previous = getattr(self, 'command_pipeline', None)
+        router = self.universal_executor_v2.intent_router if self.universal_executor_v2 else None
+        # Authentication is checked in _stt_callback before a command ever reaches the pipeline
+        pipeline = CommandPipeline(auth=self.auth, tts=self.tts, router=router, check_auth=False)
+        if self.universal_executor_v2:
+            pipeline.register('universal_v2', self.universal_executor_v2.handle_intent,
+                              classifier=self.universal_executor_v2.classify_intent)
+        if self.direct_executor:
+            pipeline.register('direct', self.direct_executor.handle_intent,
+                              classifier=self.direct_executor.classify_intent)
+        if self.universal_executor:
+            pipeline.register('universal', self.universal_executor.handle_intent,
+                              classifier=self.universal_executor.classify_intent)
+        if self.executor:
+            executor, parser = self.executor, self.parser
+            pipeline.register('legacy', lambda intent, context: executor.handle_intent(intent, context, parser),
+                              classifier=lambda intent, context: executor.classify_intent(intent, context, parser))
+        if previous is not None and previous.speculative:
+            pipeline.set_speculative(True)
+        return pipeline
+
     def _styled_button(self, text, color="#4CAF50"):
         btn = QPushButton(text)
         btn.setStyleSheet(f"""
@@ -553,6 +580,7 @@ class EchoMainWindow(QMainWindow):
         """Enter typing mode - will listen for multiple phrases"""
         self.typing_mode = True
         self.typing_buffer = []
+        self._set_stt_mode('dictation')
         if initial_text:
             self.typing_buffer.append(initial_text)
         if self.tts:
@@ -562,6 +590,7 @@ class EchoMainWindow(QMainWindow):
     def _cancel_typing(self):
         """Cancel typing mode without typing anything"""
         self.typing_mode = False
+        self._set_stt_mode('command')
         if self.typing_timer:
             self.typing_timer.stop()
             self.typing_timer = None
@@ -569,6 +598,11 @@ class EchoMainWindow(QMainWindow):
         if self.tts:
             self.tts.say("Typing cancelled.")
     
+    def _set_stt_mode(self, mode):
+        """Use the command grammar outside typing mode and free dictation inside it"""
+        if self.stt_mgr and hasattr(self.stt_mgr, 'set_recognition_mode'):
+            self.stt_mgr.set_recognition_mode(mode)
+    
     def _reset_typing_timer(self):
         """Reset the timer that will finish typing after silence"""
         if self.typing_timer:
@@ -585,6 +619,7 @@ class EchoMainWindow(QMainWindow):
             return
         
         self.typing_mode = False
+        self._set_stt_mode('command')
         if self.typing_timer:
             self.typing_timer.stop()
             self.typing_timer = None
@@ -654,38 +689,9 @@ class EchoMainWindow(QMainWindow):
             return False
     
     def _execute_universal_command(self, voice_text):
-        """Execute commands using universal executor V2 first (most advanced)"""
+        """Execute commands through the pipeline: V2, direct, universal, then the legacy executor"""
         try:
-            # Try universal executor V2 first (most advanced, uses screen context)
-            if hasattr(self, 'universal_executor_v2') and self.universal_executor_v2:
-                result = self.universal_executor_v2.execute_command(voice_text)
-                if result:
-                    return True
-            
-            # Try direct executor second (reliable fallback)
-            if hasattr(self, 'direct_executor') and self.direct_executor:
-                result = self.direct_executor.execute_command(voice_text)
-                if result:
-                    return True
-            
-            # Try universal executor third
-            if self.universal_executor:
-                result = self.universal_executor.execute_command(voice_text)
-                if result:
-                    return True
-            
-            # Fallback to legacy executor
-            if self.executor:
-                # Parse command using context-aware parser
-                if hasattr(self, 'parser') and self.parser:
-                    command = self.parser.parse(voice_text)
-                    if command:
-                        return self.executor.execute(command)
-                
-                # Try direct execution
-                return self.executor.execute({'action': 'unknown', 'text': voice_text})
-            
-            return False
+            return self.command_pipeline.execute(voice_text)
             
         except Exception as e:
             print(f"Command execution error: {e}")
@@ -735,6 +741,7 @@ class EchoMainWindow(QMainWindow):
         
         def scan_complete():
             try:
+                # The app registry notifies the executors and the recognizer's vocabulary
                 discovered_apps = self.app_disc.discover_and_save("config/apps.json")
                 self.load_apps()
                 self.apps_status.setText(f"✅ Discovery complete! Found {len(discovered_apps)} applications")
@@ -758,7 +765,9 @@ class EchoMainWindow(QMainWindow):
 
     def on_save_apps(self):
         try:
-            with open("config/apps.json","w",encoding="utf-8") as f: f.write(self.apps_text.toPlainText()); QMessageBox.information(self,"Saved","Saved")
+            with open("config/apps.json","w",encoding="utf-8") as f: f.write(self.apps_text.toPlainText())
+            get_app_registry().reload()
+            QMessageBox.information(self,"Saved","Saved")
         except Exception as e:
             QMessageBox.critical(self,"Error",str(e))
 
@@ -32,11 +32,7 @@ try:
 except ImportError:
     IMAGE_PROCESSING_AVAILABLE = False
 
-try:
-    import pytesseract
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+from .ocr_service import OCR_AVAILABLE, get_ocr_service
 
 try:
     import pygetwindow as gw
@@ -44,6 +40,45 @@ try:
 except ImportError:
     WINDOW_MANAGEMENT_AVAILABLE = False
 
+from .screen_frame import ScreenFrame
+from .ui_detection import DETECTION_SCALE, size_mask
+from .advanced_screen_analyzer import LazyScreenContext
+from .window_state import get_window_state
+
+# Intents that open, close or rearrange windows - the window snapshot is stale after them
+WINDOW_ACTIONS = {'open_generic', 'close_generic', 'open_file', 'close', 'minimize', 'maximize'}
+
+
+class UniversalScreenContext(LazyScreenContext):
+    """The universal executor's screen context, computed facet by facet on first read.
+
+    Intent classification only ever looks at the active window (to tell the
+    app type), so the capture, OCR and button detection run only for the
+    commands whose handler actually needs them.
+    """
+
+    FACETS = ('active_window', 'screen_text', 'ui_elements', 'current_app', 'available_actions')
+
+    def _compute(self, key: str) -> Any:
+        executor = self._analyzer
+        if key == 'frame':
+            # One capture shared by OCR and UI element detection, in the configured scope
+            return executor._capture_frame(self['active_window'])
+        if key == 'active_window':
+            return executor._get_active_window_info()
+        if key == 'screen_text':
+            return executor._extract_screen_text(self['frame'])
+        if key == 'ui_elements':
+            return executor._detect_ui_elements(self['frame'])
+        if key == 'current_app':
+            window = self['active_window']
+            return executor._identify_application(window) if window else None
+        if key == 'available_actions':
+            current_app = self['current_app']
+            return executor._get_available_actions(current_app) if current_app else []
+        raise KeyError(key)
+
+
 class UniversalCommandExecutor:
     """Universal command executor that can handle ANY voice command"""
     
@@ -60,6 +95,10 @@ class UniversalCommandExecutor:
         self.last_screen_analysis = None
         self.screen_analysis_timeout = 2.0  # seconds
         
+        # Capture scope: 'window' (active window, optionally narrowed to a focus region) or 'desktop'
+        self.capture_scope = 'window'
+        self.focus_region = None  # FOCUS_REGIONS name or (left, top, right, bottom) fractions of the window
+        
         # Current context
         self.current_context = None
         
@@ -164,7 +203,22 @@ class UniversalCommandExecutor:
             }
         }
     
-    def execute_command(self, voice_text: str) -> bool:
+    def classify_intent(self, intent, context) -> Optional[Dict]:
+        """Side-effect-free intent determination (for speculative dispatch).
+        
+        The screen context is lazy: text-only matches never touch it, and the
+        context-aware ones read at most the active window, so classifying
+        does not capture or OCR the screen.
+        """
+        return self._determine_intent(intent.text, context.get('window_context', self._analyze_current_context))
+    
+    def handle_intent(self, intent, context) -> bool:
+        """Command pipeline entry point - reuses the pipeline's context (and intent, if already classified)"""
+        return self.execute_command(intent.text, context=context.get('window_context', self._analyze_current_context),
+                                    intent=intent.candidates.get('universal'))
+    
+    def execute_command(self, voice_text: str, context: Optional[Dict[str, Any]] = None,
+                        intent: Optional[Dict] = None) -> bool:
         """Execute any voice command by understanding intent and context"""
         try:
             # Normalize input
@@ -172,10 +226,12 @@ class UniversalCommandExecutor:
             self.logger.info(f"Processing universal command: '{text}'")
             
             # Analyze current screen context
-            context = self._analyze_current_context()
+            if context is None:
+                context = self._analyze_current_context()
             
             # Determine command intent
-            intent = self._determine_intent(text, context)
+            if intent is None:
+                intent = self._determine_intent(text, context)
             
             if not intent:
                 self._handle_unknown_command(text)
@@ -190,35 +246,30 @@ class UniversalCommandExecutor:
                 self.tts.say("Sorry, I encountered an error processing that command.")
             return False
     
-    def _analyze_current_context(self) -> Dict[str, Any]:
-        """Analyze current screen and application context"""
-        try:
-            # Check if we need fresh analysis
-            current_time = time.time()
-            if (self.last_screen_analysis and 
-                current_time - self.last_screen_analysis.get('timestamp', 0) < self.screen_analysis_timeout):
-                return self.last_screen_analysis
-            
-            context = {
-                'timestamp': current_time,
-                'active_window': self._get_active_window_info(),
-                'screen_text': self._extract_screen_text(),
-                'ui_elements': self._detect_ui_elements(),
-                'current_app': None,
-                'available_actions': []
-            }
-            
-            # Determine current application
-            if context['active_window']:
-                context['current_app'] = self._identify_application(context['active_window'])
-                context['available_actions'] = self._get_available_actions(context['current_app'])
-            
-            self.last_screen_analysis = context
-            return context
-            
-        except Exception as e:
-            self.logger.error(f"Error analyzing context: {e}")
-            return {'timestamp': time.time(), 'active_window': None, 'screen_text': '', 'ui_elements': [], 'current_app': None, 'available_actions': []}
+    def _analyze_current_context(self) -> UniversalScreenContext:
+        """Current screen and application context - facets are only computed when read"""
+        current_time = time.time()
+        if (self.last_screen_analysis and 
+            current_time - self.last_screen_analysis['timestamp'] < self.screen_analysis_timeout):
+            return self.last_screen_analysis
+        self.last_screen_analysis = UniversalScreenContext(self)
+        return self.last_screen_analysis
+    
+    def set_capture_scope(self, scope: str = 'window', focus_region=None):
+        """Choose what gets captured and OCRed: the active window (default), a focus region of it, or the desktop"""
+        self.capture_scope = scope
+        self.focus_region = focus_region
+        self.last_screen_analysis = None
+    
+    def _capture_frame(self, window_info: Optional[Dict] = None) -> Optional[ScreenFrame]:
+        """Capture the screen once for an analysis - by default only the active window"""
+        if not IMAGE_PROCESSING_AVAILABLE:
+            return None
+        if self.capture_scope == 'desktop':
+            return ScreenFrame.capture()
+        if window_info is None:
+            window_info = self._get_active_window_info()
+        return ScreenFrame.capture_scoped(window_info, self.focus_region)
     
     def _get_active_window_info(self) -> Optional[Dict]:
         """Get information about currently active window"""
@@ -229,7 +280,9 @@ class UniversalCommandExecutor:
                     return {
                         'title': active_windows.title,
                         'app_name': self._extract_app_name(active_windows.title),
-                        'rect': (active_windows.left, active_windows.top, active_windows.width, active_windows.height)
+                        'rect': (active_windows.left, active_windows.top, active_windows.width, active_windows.height),
+                        'bbox': (active_windows.left, active_windows.top,
+                                 active_windows.left + active_windows.width, active_windows.top + active_windows.height)
                     }
             return None
         except Exception as e:
@@ -246,49 +299,47 @@ class UniversalCommandExecutor:
         else:
             return window_title.strip()
     
-    def _extract_screen_text(self) -> str:
+    def _extract_screen_text(self, frame: Optional[ScreenFrame] = None) -> str:
         """Extract text from current screen using OCR"""
         try:
             if not OCR_AVAILABLE or not IMAGE_PROCESSING_AVAILABLE:
                 return ""
             
-            # Capture screen
-            screenshot = ImageGrab.grab()
+            frame = frame or self._capture_frame()
+            if frame is None:
+                return ""
             
             # Extract text using OCR
-            text = pytesseract.image_to_string(screenshot)
+            text = get_ocr_service().text(frame.image)
             return text.strip()
             
         except Exception as e:
             # Don't log OCR errors as they're expected if Tesseract isn't installed
             return ""
     
-    def _detect_ui_elements(self) -> List[Dict]:
+    def _detect_ui_elements(self, frame: Optional[ScreenFrame] = None) -> List[Dict]:
         """Detect UI elements on screen"""
         try:
             if not IMAGE_PROCESSING_AVAILABLE:
                 return []
             
-            # Capture screen
-            screenshot = ImageGrab.grab()
-            cv_image = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+            frame = frame or self._capture_frame()
+            if frame is None:
+                return []
             
             # Detect buttons, text areas, etc.
             elements = []
             
-            # Simple button detection
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-            edges = cv2.Canny(gray, 50, 150)
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            # Simple button detection on the frame's shared, downscaled edge map
+            rects = frame.pyramid.rects(DETECTION_SCALE)
             
-            for contour in contours:
-                x, y, w, h = cv2.boundingRect(contour)
-                if 50 <= w <= 300 and 20 <= h <= 100:  # Button-like size
-                    elements.append({
-                        'type': 'button',
-                        'rect': (x, y, w, h),
-                        'center': (x + w//2, y + h//2)
-                    })
+            for x, y, w, h in rects[size_mask(rects, (50, 300), (20, 100))].tolist():  # Button-like size
+                x, y = frame.to_screen(x, y)
+                elements.append({
+                    'type': 'button',
+                    'rect': (x, y, w, h),
+                    'center': (x + w//2, y + h//2)
+                })
             
             return elements
             
@@ -409,12 +460,12 @@ class UniversalCommandExecutor:
     def _check_context_aware_matches(self, text: str, context: Dict) -> Optional[Dict]:
         """Check for context-aware command matches"""
         current_app = context.get('current_app', 'unknown')
-        screen_text = context.get('screen_text', '').lower()
         
         # File operations in file explorer
         if current_app == 'file_explorer':
             if any(word in text for word in ['open', 'double click']):
-                # Find file/folder to open from screen text
+                # Find file/folder to open from screen text (the only match that needs OCR)
+                screen_text = (context.get('screen_text') or '').lower()
                 target = self._find_matching_file(text, screen_text)
                 if target:
                     return {
@@ -595,6 +646,9 @@ class UniversalCommandExecutor:
             if self.tts:
                 self.tts.say("Sorry, I encountered an error.")
             return False
+        finally:
+            if intent.get('action') in WINDOW_ACTIONS:
+                get_window_state().invalidate()
     
     def _lock_screen(self) -> bool:
         """Lock the screen"""
@@ -1053,5 +1107,7 @@ class UniversalCommandExecutor:
             'ocr_available': OCR_AVAILABLE,
             'window_management_available': WINDOW_MANAGEMENT_AVAILABLE,
             'command_patterns_loaded': len(self.command_patterns),
+            'capture_scope': self.capture_scope,
+            'focus_region': self.focus_region,
             'last_context_time': self.last_screen_analysis.get('timestamp', 0) if self.last_screen_analysis else 0
         }
@@ -72,7 +72,9 @@ class UniversalConfig:
                 "type_delay": 0.05,
                 "scroll_speed": 3,
                 "zoom_speed": 1.2,
-                "retry_attempts": 3
+                "retry_attempts": 3,
+                "screen_capture_scope": "window",  # window (active window only) or desktop
+                "screen_focus_region": None  # None, "file_list" or "browser_content"
             },
             "security": {
                 "require_authentication": True,
@@ -84,12 +86,14 @@ class UniversalConfig:
                 "scan_depth": 3,
                 "include_hidden_files": False,
                 "max_apps_per_category": 100,
-                "exclude_system_apps": True
+                "exclude_system_apps": True,
+                "rescan_interval_minutes": 30  # Incremental rescans reuse unchanged directories; 0 disables
             },
             "commands": {
                 "custom_patterns": {},
                 "aliases": {},
-                "disabled_commands": []
+                "disabled_commands": [],
+                "speculative_dispatch": False
             }
         }
     
@@ -39,6 +39,10 @@ try:
 except ImportError:
     WINDOW_MANAGER_AVAILABLE = False
 
+from .app_registry import get_app_registry
+from .intent_router import IntentRouter
+from .window_state import get_window_state
+
 class UniversalExecutorV2:
     """Universal command executor that works on any system"""
     
@@ -50,8 +54,8 @@ class UniversalExecutorV2:
         self.logger = logging.getLogger(__name__)
         self.platform = platform.system().lower()
         
-        # Load discovered apps
-        self.discovered_apps = self._load_discovered_apps()
+        # Discovered apps, shared process-wide and refreshed when discovery completes
+        self.app_registry = get_app_registry()
         
         # Initialize window manager
         if WINDOW_MANAGER_AVAILABLE:
@@ -68,27 +72,24 @@ class UniversalExecutorV2:
         # Pending deletion confirmation
         self.pending_deletion = None  # Stores (file_name, file_path, context) for pending deletion
         
-    def _load_discovered_apps(self) -> Dict[str, str]:
-        """Load discovered applications dynamically"""
-        apps = {}
+        # Cached window state so routing never enumerates windows itself
+        self.window_state = get_window_state()
         
-        try:
-            apps_file = Path("config/apps.json")
-            if apps_file.exists():
-                with open(apps_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for app in data.get('apps', []):
-                        name = app.get('name', '').lower()
-                        exec_path = app.get('exec', '')
-                        if name and exec_path and os.path.exists(exec_path):
-                            apps[name] = exec_path
-                            # Also add aliases
-                            for alias in app.get('aliases', []):
-                                apps[alias.lower()] = exec_path
-        except Exception as e:
-            self.logger.error(f"Error loading discovered apps: {e}")
+        # Keyword routing compiled once from the route table
+        self.intent_router = IntentRouter()
+        self._category_handlers = {
+            'media': self._execute_media_control,
+            'text': self._execute_text_operation,
+            'accessibility': self._execute_accessibility,
+            'navigation': self._execute_navigation,
+            'web': self._execute_web_operation,
+            'cmd': self._execute_cmd_operation
+        }
         
-        return apps
+    @property
+    def discovered_apps(self) -> Dict[str, str]:
+        """App name/alias -> executable, always the registry's latest discovery"""
+        return self.app_registry.paths
     
     def execute_command(self, voice_text: str) -> bool:
         """Execute any voice command using screen context - REQUIRES AUTHENTICATION"""
@@ -113,99 +114,7 @@ class UniversalExecutorV2:
                 self.logger.info(f"Command execution authorized for user: {current_user}")
             
             text = voice_text.lower().strip()
-            self.logger.info(f"Universal executor V2 processing: '{text}'")
-            
-            # Check for deletion confirmation first
-            if self.pending_deletion:
-                if any(word in text for word in ['yes', 'confirm', 'confirm delete', 'proceed', 'delete it']):
-                    # User confirmed deletion
-                    file_name, file_path, context = self.pending_deletion
-                    self.pending_deletion = None
-                    return self._execute_deletion(file_name, file_path, context)
-                elif any(word in text for word in ['no', 'cancel', 'abort', 'stop']):
-                    # User cancelled deletion
-                    self.pending_deletion = None
-                    if self.tts:
-                        self.tts.say("Deletion cancelled.")
-                    return True
-                else:
-                    # Still waiting for confirmation, remind user
-                    if self.tts:
-                        self.tts.say("Please say 'yes' to confirm deletion or 'no' to cancel.")
-                    return True
-            
-            # Get screen context
-            context = None
-            if self.screen_analyzer:
-                context = self.screen_analyzer.analyze_screen()
-            
-            # System commands (highest priority)
-            if self._is_system_command(text):
-                return self._execute_system_command(text)
-            
-            # Check if File Explorer is open - if so, prioritize file operations
-            file_explorer_open = self._is_file_explorer_open()
-            
-            # CRITICAL: Handle "go back" early - prioritize directory navigation over web navigation
-            if any(word in text for word in ['go back', 'back directory', 'previous directory', 'navigate back', 'go up', 'parent directory']):
-                # Check if File Explorer is open - if so, definitely directory navigation
-                if file_explorer_open:
-                    return self._execute_file_operation(text, context)
-                # Otherwise, try directory navigation first (more common than web navigation)
-                if self._is_file_operation(text):
-                    result = self._execute_file_operation(text, context)
-                    if result:
-                        return True
-                # Fallback to web navigation if directory navigation fails
-                # (will be handled by web operations section below)
-            
-            # File operations (check first if File Explorer is open)
-            if self._is_file_operation(text) or (file_explorer_open and text.startswith('open ')):
-                result = self._execute_file_operation(text, context)
-                if result:
-                    return True
-                # If file operation failed and File Explorer is open, don't try app control
-                if file_explorer_open and text.startswith('open '):
-                    return False  # File/folder not found in current directory
-            
-            # Application control (only if File Explorer is NOT open, or if explicit "open app")
-            if self._is_app_control(text) and not (file_explorer_open and text.startswith('open ') and 'open app' not in text):
-                return self._execute_app_control(text)
-            
-            # Media control
-            if self._is_media_control(text):
-                return self._execute_media_control(text)
-            
-            # Text operations
-            if self._is_text_operation(text):
-                return self._execute_text_operation(text)
-            
-            # Accessibility operations (check before navigation)
-            if self._is_accessibility(text):
-                return self._execute_accessibility(text)
-            
-            # Navigation/UI operations
-            if self._is_navigation(text):
-                return self._execute_navigation(text)
-            
-            # Web operations
-            if self._is_web_operation(text):
-                return self._execute_web_operation(text)
-            
-            # Command prompt operations
-            if self._is_cmd_operation(text):
-                return self._execute_cmd_operation(text)
-            
-            # Generic open command
-            if text.startswith('open '):
-                return self._open_generic(text[5:].strip(), context)
-            
-            # Generic close command
-            if text.startswith('close '):
-                return self._close_generic(text[6:].strip())
-            
-            # Try as generic command
-            return self._try_generic_execution(text, context)
+            return self._process_command(text, self.intent_router.route(text), self._analyze_screen)
             
         except Exception as e:
             self.logger.error(f"Error executing command: {e}")
@@ -213,97 +122,168 @@ class UniversalExecutorV2:
                 self.tts.say("Sorry, I couldn't execute that command.")
             return False
     
+    def handle_intent(self, intent, context) -> bool:
+        """Command pipeline entry point - authentication and parsing were done by the pipeline"""
+        try:
+            return self._process_command(
+                intent.text, intent.route, lambda: context.get('screen_analysis', self._analyze_screen)
+            )
+        except Exception as e:
+            self.logger.error(f"Error executing command: {e}")
+            if self.tts:
+                self.tts.say("Sorry, I couldn't execute that command.")
+            return False
+    
+    def classify_intent(self, intent, context) -> Optional[Dict]:
+        """Side-effect-free guess at how this executor would route the command (for speculative dispatch)"""
+        if self.pending_deletion:
+            return {'category': 'deletion_confirmation', 'confidence': 1.0}
+        category = intent.route.first()
+        if category:
+            return {'category': category, 'confidence': 0.9}
+        if intent.verb in ('open', 'close') and intent.target:
+            return {'category': f'generic_{intent.verb}', 'confidence': 0.6}
+        # Anything else ends up as a web search here - a last resort, not a confident match
+        return {'category': 'search_fallback', 'confidence': 0.2}
+    
+    def _analyze_screen(self) -> Optional[Dict]:
+        """Screen context handle from the screen analyzer (None without one).
+        
+        With the advanced analyzer this is lazy: OCR, file detection and UI
+        element detection only run when a handler reads that facet, so
+        commands like volume, media, tabs or app launch never trigger them.
+        """
+        if not self.screen_analyzer:
+            return None
+        if hasattr(self.screen_analyzer, 'screen_context'):
+            return self.screen_analyzer.screen_context()
+        return self.screen_analyzer.analyze_screen()
+    
+    def _process_command(self, text: str, route, get_context) -> bool:
+        """Route and execute an authenticated, lowercased command"""
+        self.logger.info(f"Universal executor V2 processing: '{text}'")
+        
+        # Check for deletion confirmation first
+        if self.pending_deletion:
+            if any(word in text for word in ['yes', 'confirm', 'confirm delete', 'proceed', 'delete it']):
+                # User confirmed deletion
+                file_name, file_path, context = self.pending_deletion
+                self.pending_deletion = None
+                return self._execute_deletion(file_name, file_path, context)
+            elif any(word in text for word in ['no', 'cancel', 'abort', 'stop']):
+                # User cancelled deletion
+                self.pending_deletion = None
+                if self.tts:
+                    self.tts.say("Deletion cancelled.")
+                return True
+            else:
+                # Still waiting for confirmation, remind user
+                if self.tts:
+                    self.tts.say("Please say 'yes' to confirm deletion or 'no' to cancel.")
+                return True
+        
+        # Screen context handle - nothing is captured or OCRed until a handler reads a facet
+        context = get_context()
+        
+        # System commands (highest priority)
+        if route.has('system'):
+            return self._execute_system_command(text)
+        
+        # Check if File Explorer is open - if so, prioritize file operations
+        file_explorer_open = self._is_file_explorer_open()
+        
+        # CRITICAL: Handle "go back" early - prioritize directory navigation over web navigation
+        if route.has('go_back'):
+            # Check if File Explorer is open - if so, definitely directory navigation
+            if file_explorer_open:
+                return self._execute_file_operation(text, context)
+            # Otherwise, try directory navigation first (more common than web navigation)
+            if self._is_file_operation(text):
+                result = self._execute_file_operation(text, context)
+                if result:
+                    return True
+            # Fallback to web navigation if directory navigation fails
+            # (will be handled by web operations section below)
+        
+        # File operations (check first if File Explorer is open)
+        if self._is_file_operation(text) or (file_explorer_open and text.startswith('open ')):
+            result = self._execute_file_operation(text, context)
+            if result:
+                return True
+            # If file operation failed and File Explorer is open, don't try app control
+            if file_explorer_open and text.startswith('open '):
+                return False  # File/folder not found in current directory
+        
+        # Application control (only if File Explorer is NOT open, or if explicit "open app")
+        if self._is_app_control(text) and not (file_explorer_open and text.startswith('open ') and 'open app' not in text):
+            return self._execute_app_control(text)
+        
+        # Remaining categories in route table priority order:
+        # media, text, accessibility, navigation, web, command prompt
+        for category in route.categories:
+            handler = self._category_handlers.get(category)
+            if handler:
+                return handler(text)
+        
+        # Generic open command
+        if text.startswith('open '):
+            result = self._open_generic(text[5:].strip(), context)
+            self.window_state.invalidate()
+            return result
+        
+        # Generic close command
+        if text.startswith('close '):
+            result = self._close_generic(text[6:].strip())
+            self.window_state.invalidate()
+            return result
+        
+        # Try as generic command
+        return self._try_generic_execution(text, context)
+    
     def _is_system_command(self, text: str) -> bool:
         """Check if command is a system command"""
-        system_keywords = [
-            'shutdown', 'restart', 'reboot', 'sleep', 'hibernate',
-            'lock screen', 'lock', 'logout', 'log out',
-            'volume up', 'volume down', 'mute', 'unmute',
-            'system info', 'battery', 'disk space', 'memory', 'cpu'
-        ]
-        return any(keyword in text for keyword in system_keywords)
+        return self.intent_router.route(text).has('system')
     
     def _is_file_operation(self, text: str) -> bool:
         """Check if command is a file operation"""
-        file_keywords = [
-            'open file', 'create file', 'delete file', 'copy file', 'move file',
-            'rename file', 'create folder', 'delete folder', 'navigate to',
-            'go to', 'list files', 'show files', 'save file', 'open file explorer',
-            'file explorer', 'explorer', 'go back', 'back directory', 'previous directory',
-            'navigate back', 'go up', 'parent directory', 'current directory'
-        ]
         # Also check if "open [something]" might be a folder/file when File Explorer is open
         if text.startswith('open ') and not any(kw in text for kw in ['open file ', 'open app ', 'open file explorer']):
-            # Check if File Explorer is open - if so, treat as potential file operation
-            try:
-                import pygetwindow as gw
-                all_windows = gw.getAllWindows()
-                for w in all_windows:
-                    if w.title and ('explorer' in w.title.lower() or 'file' in w.title.lower() or 'this pc' in w.title.lower()):
-                        return True  # File Explorer is open, treat as file operation
-            except:
-                pass
-        return any(keyword in text for keyword in file_keywords)
+            # File Explorer is open (per the cached window snapshot) - treat as potential file operation
+            if self.window_state.snapshot.explorer_open:
+                return True
+        return self.intent_router.route(text).has('file')
     
     def _is_app_control(self, text: str) -> bool:
         """Check if command is application control"""
-        app_keywords = [
-            'open app', 'close app', 'minimize', 'maximize', 'restore',
-            'switch to', 'switch app', 'go to app', 'bring to front',
-            'close all apps', 'close all', 'next app', 'previous app',
-            'list apps', 'list open apps'
-        ]
         # Don't treat "open [folder]" as app control if it might be a file operation
         if text.startswith('open ') and not any(kw in text for kw in ['open file ', 'open app ']):
             # Check if it might be a folder/file - let file operations handle it first
             return False
-        return any(keyword in text for keyword in app_keywords)
+        return self.intent_router.route(text).has('app')
     
     def _is_media_control(self, text: str) -> bool:
         """Check if command is media control"""
-        media_keywords = ['play', 'pause', 'stop', 'next', 'previous', 'seek', 'start from beginning']
-        return any(keyword in text for keyword in media_keywords)
+        return self.intent_router.route(text).has('media')
     
     def _is_text_operation(self, text: str) -> bool:
         """Check if command is text operation"""
-        text_keywords = [
-            'type', 'write', 'enter', 'select all', 'copy all', 'paste all',
-            'copy', 'paste', 'cut', 'undo', 'redo'
-        ]
-        return any(keyword in text for keyword in text_keywords)
+        return self.intent_router.route(text).has('text')
     
     def _is_navigation(self, text: str) -> bool:
         """Check if command is navigation"""
-        nav_keywords = [
-            'click', 'double click', 'right click', 'scroll up', 'scroll down',
-            'zoom in', 'zoom out', 'navigate up', 'navigate down'
-        ]
-        return any(keyword in text for keyword in nav_keywords)
+        return self.intent_router.route(text).has('navigation')
     
     def _is_accessibility(self, text: str) -> bool:
         """Check if command is accessibility feature"""
-        accessibility_keywords = [
-            'read screen', 'screen read', 'describe screen', 'screen describe',
-            'navigation mode', 'enable navigation', 'disable navigation'
-        ]
-        return any(keyword in text for keyword in accessibility_keywords)
+        return self.intent_router.route(text).has('accessibility')
     
     def _is_web_operation(self, text: str) -> bool:
         """Check if command is web operation"""
-        web_keywords = [
-            'search', 'google', 'youtube', 'amazon', 'open website', 'go to website',
-            'next tab', 'previous tab', 'switch tab', 'close tab', 'new tab',
-            'list tabs', 'tab number'
-        ]
-        return any(keyword in text for keyword in web_keywords)
+        return self.intent_router.route(text).has('web')
     
     def _is_cmd_operation(self, text: str) -> bool:
         """Check if command is command prompt operation"""
-        cmd_keywords = [
-            'command prompt', 'cmd', 'powershell', 'terminal', 'execute command',
-            'run command', 'type command'
-        ]
-        return any(keyword in text for keyword in cmd_keywords)
+        return self.intent_router.route(text).has('cmd')
     
     # System command execution
     def _execute_system_command(self, text: str) -> bool:
@@ -760,13 +740,22 @@ class UniversalExecutorV2:
         except Exception as e:
             self.logger.error(f"Error executing file operation: {e}")
             return False
+        finally:
+            # Opening Explorer or navigating it changes window titles
+            self.window_state.invalidate()
+    
+    def _find_on_screen(self, name: str, context) -> Optional[Dict]:
+        """Look a file up among those visible on screen, reading only the files facet of the context"""
+        if hasattr(self.screen_analyzer, 'screen_context'):
+            return self.screen_analyzer.find_file_on_screen(name, context)
+        return self.screen_analyzer.find_file_on_screen(name)
     
     def _open_file(self, file_name: str, context: Optional[Dict]) -> bool:
         """Open a file - first check screen, then current directory, then search"""
         try:
             # First, check if file is visible on screen
             if context and self.screen_analyzer:
-                file_info = self.screen_analyzer.find_file_on_screen(file_name)
+                file_info = self._find_on_screen(file_name, context)
                 if file_info:
                     # File found on screen - try to open it
                     # Use keyboard navigation or clicking
@@ -888,7 +877,7 @@ class UniversalExecutorV2:
             
             # Check screen first
             if context and self.screen_analyzer:
-                file_info = self.screen_analyzer.find_file_on_screen(file_name)
+                file_info = self._find_on_screen(file_name, context)
                 if file_info:
                     file_path = file_info.get('path') or os.path.join(self.current_directory, file_info['name'])
                     file_name = file_info['name']
@@ -921,7 +910,7 @@ class UniversalExecutorV2:
             
             # Try screen-based deletion first if context available
             if context and self.screen_analyzer and PYAUTOGUI_AVAILABLE:
-                file_info = self.screen_analyzer.find_file_on_screen(file_name)
+                file_info = self._find_on_screen(file_name, context)
                 if file_info:
                     # Select file/folder on screen
                     pyautogui.typewrite(file_info['name'], interval=0.1)
@@ -985,7 +974,7 @@ class UniversalExecutorV2:
             
             # Check screen first
             if context and self.screen_analyzer:
-                folder_info = self.screen_analyzer.find_file_on_screen(folder_name)
+                folder_info = self._find_on_screen(folder_name, context)
                 if folder_info:
                     folder_path = folder_info.get('path') or os.path.join(self.current_directory, folder_info['name'])
                     folder_name = folder_info['name']
@@ -1149,18 +1138,10 @@ class UniversalExecutorV2:
             return False
     
     def _is_file_explorer_open(self) -> bool:
-        """Check if File Explorer is currently open"""
-        try:
-            if not PYAUTOGUI_AVAILABLE:
-                return False
-            import pygetwindow as gw
-            all_windows = gw.getAllWindows()
-            for w in all_windows:
-                if w.title and ('explorer' in w.title.lower() or 'file' in w.title.lower() or 'this pc' in w.title.lower()):
-                    return True
-            return False
-        except:
+        """Check if File Explorer is currently open (from the cached window snapshot)"""
+        if not PYAUTOGUI_AVAILABLE:
             return False
+        return self.window_state.snapshot.explorer_open
     
     def _open_folder_or_file_in_explorer(self, target: str) -> bool:
         """Open folder or file in File Explorer when it's open - PRIORITY when File Explorer is open"""
@@ -1410,6 +1391,8 @@ class UniversalExecutorV2:
         except Exception as e:
             self.logger.error(f"Error executing app control: {e}")
             return False
+        finally:
+            self.window_state.invalidate()
     
     def _open_app(self, app_name: str) -> bool:
         """Open an application dynamically"""
@@ -1492,7 +1475,7 @@ class UniversalExecutorV2:
             
             # Try fuzzy matching
             if FUZZY_AVAILABLE and self.discovered_apps:
-                app_names = list(self.discovered_apps.keys())
+                app_names = self.app_registry.names
                 result = process.extractOne(app_name_lower, app_names, scorer=fuzz.ratio)
                 if result and len(result) == 2:
                     best_match, score = result
@@ -2114,17 +2097,13 @@ class UniversalExecutorV2:
         """Read screen content using OCR"""
         try:
             import pyautogui
-            import cv2
-            import pytesseract
-            from PIL import Image
-            import numpy as np
+            from .ocr_service import get_ocr_service
             
             # Take screenshot
             screenshot = pyautogui.screenshot()
-            img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
             
-            # Perform OCR
-            text = pytesseract.image_to_string(img)
+            # Perform OCR on the shared worker pool
+            text = get_ocr_service().text(screenshot)
             
             if text.strip():
                 # Limit text length for TTS
@@ -0,0 +1,178 @@
+"""
+Voice Activity Detection for EchoOS
+Frame-level energy / zero-crossing VAD with hangover and adaptive noise-floor tracking
+"""
+
+import logging
+from collections import deque
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Events emitted by VoiceActivityDetector.process()
+SPEECH_START = 'start'
+SPEECH = 'speech'
+SPEECH_END = 'end'
+
+
+class VoiceActivityDetector:
+    """Scores fixed-size frames and opens/closes utterances.
+
+    Energies are RMS values in int16 units (0-32767), the same scale as
+    EnhancedSTT.energy_threshold.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20,
+                 min_energy: float = 300.0, noise_ratio: float = 3.0,
+                 max_zcr: float = 0.35, start_frames: int = 2,
+                 hangover_ms: int = 300, preroll_ms: int = 150,
+                 noise_adapt_rate: float = 0.05):
+        self.logger = logging.getLogger(__name__)
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.min_energy = float(min_energy)  # Absolute floor for the speech threshold
+        self.noise_ratio = noise_ratio  # Speech must be this many times louder than the noise floor
+        self.max_zcr = max_zcr  # Frames above this zero-crossing rate need twice the energy (hiss/fans)
+        self.start_frames = max(1, start_frames)  # Consecutive voiced frames needed to open an utterance
+        self.hangover_frames = max(0, int(hangover_ms / frame_ms))  # Unvoiced frames tolerated before closing
+        self.noise_adapt_rate = noise_adapt_rate
+
+        self.noise_floor: Optional[float] = None
+        self._preroll = deque(maxlen=max(self.start_frames, int(preroll_ms / frame_ms)))
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self.reset()
+
+        # Counters for status reporting
+        self.frames_total = 0
+        self.frames_voiced = 0
+
+    def reset(self):
+        """Close any open utterance and drop buffered audio (noise floor is kept)"""
+        self.in_speech = False
+        self._voiced_run = 0
+        self._silence_run = 0
+        self._preroll.clear()
+        self._remainder = np.zeros(0, dtype=np.int16)
+
+    def seed_noise_floor(self, rms: float):
+        """Initialise the noise floor from an ambient-noise calibration measurement"""
+        if rms and rms > 0:
+            self.noise_floor = float(rms)
+            self.logger.info(f"VAD noise floor seeded at {self.noise_floor:.1f}")
+
+    @property
+    def threshold(self) -> float:
+        """Current speech energy threshold"""
+        if self.noise_floor is None:
+            return self.min_energy
+        return max(self.min_energy, self.noise_floor * self.noise_ratio)
+
+    def frame_features(self, samples) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Per-frame RMS energy and zero-crossing rate for a whole number of frames"""
+        n_frames = len(samples) // self.frame_len
+        frames = np.asarray(samples[:n_frames * self.frame_len], dtype=np.float32).reshape(n_frames, self.frame_len)
+        energy = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(self.frame_len - 1)
+        return energy, zcr
+
+    def score_frames(self, samples) -> "np.ndarray":
+        """Boolean voiced mask for each complete frame in `samples`, updating the noise floor"""
+        energy, zcr = self.frame_features(samples)
+        if len(energy) == 0:
+            return np.zeros(0, dtype=bool)
+
+        threshold = self.threshold
+        # Noisy broadband frames (high ZCR) must clear a higher bar than voiced speech
+        required = np.where(zcr > self.max_zcr, threshold * 2.0, threshold)
+        voiced = energy > required
+
+        # Track the noise floor from unvoiced frames only
+        quiet = energy[~voiced]
+        if len(quiet):
+            level = float(np.median(quiet))
+            if self.noise_floor is None:
+                self.noise_floor = level
+            elif level < self.noise_floor:
+                # Follow drops in background noise quickly
+                self.noise_floor = level
+            else:
+                self.noise_floor += self.noise_adapt_rate * (level - self.noise_floor)
+
+        self.frames_total += len(voiced)
+        self.frames_voiced += int(np.count_nonzero(voiced))
+        return voiced
+
+    def has_speech(self, samples) -> bool:
+        """True if any frame in `samples` is voiced"""
+        return bool(np.any(self.score_frames(samples)))
+
+    def process(self, samples) -> List[Tuple[str, Optional["np.ndarray"]]]:
+        """Feed int16 samples and return utterance events.
+
+        Returns a list of (event, audio) pairs: SPEECH_START carries the pre-roll
+        plus onset frames, SPEECH carries voiced (or hangover) frames, and
+        SPEECH_END carries None. Silence outside an utterance produces no events.
+        """
+        samples = np.asarray(samples, dtype=np.int16).reshape(-1)
+        if len(self._remainder):
+            samples = np.concatenate((self._remainder, samples))
+        n_frames = len(samples) // self.frame_len
+        self._remainder = samples[n_frames * self.frame_len:].copy()
+        if n_frames == 0:
+            return []
+
+        voiced = self.score_frames(samples)
+        frames = samples[:n_frames * self.frame_len].reshape(n_frames, self.frame_len)
+        events: List[Tuple[str, Optional[np.ndarray]]] = []
+        pending: List[np.ndarray] = []
+
+        for frame, is_voiced in zip(frames, voiced):
+            if not self.in_speech:
+                self._preroll.append(frame)
+                self._voiced_run = self._voiced_run + 1 if is_voiced else 0
+                if self._voiced_run >= self.start_frames:
+                    self.in_speech = True
+                    self._silence_run = 0
+                    events.append((SPEECH_START, np.concatenate(list(self._preroll))))
+                    self._preroll.clear()
+                continue
+
+            pending.append(frame)
+            if is_voiced:
+                self._silence_run = 0
+                continue
+
+            self._silence_run += 1
+            if self._silence_run > self.hangover_frames:
+                if pending:
+                    events.append((SPEECH, np.concatenate(pending)))
+                    pending = []
+                events.append((SPEECH_END, None))
+                self.in_speech = False
+                self._voiced_run = 0
+
+        if pending:
+            events.append((SPEECH, np.concatenate(pending)))
+        return events
+
+    def extract_voiced(self, samples) -> "np.ndarray":
+        """Return only the audio that belongs to utterances in `samples` (empty if none)"""
+        chunks = [audio for event, audio in self.process(samples) if audio is not None]
+        if not chunks:
+            return np.zeros(0, dtype=np.int16)
+        return np.concatenate(chunks)
+
+    def get_stats(self) -> dict:
+        """Frame counters and current thresholds"""
+        return {
+            'frames_total': self.frames_total,
+            'frames_voiced': self.frames_voiced,
+            'noise_floor': self.noise_floor,
+            'threshold': self.threshold,
+            'in_speech': self.in_speech
+        }
@@ -0,0 +1,147 @@
+"""
+Vosk Model Registry for EchoOS
+Loads each Vosk model once per process on a background thread and pools recognizers
+"""
+
+import os
+import threading
+import logging
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from vosk import Model, KaldiRecognizer
+    VOSK_AVAILABLE = True
+except ImportError:
+    Model = None
+    KaldiRecognizer = None
+    VOSK_AVAILABLE = False
+
+
+class VoskModelRegistry:
+    """Process-wide cache of Vosk models and pooled KaldiRecognizer instances.
+
+    `preload()` returns a Future that resolves to the loaded model, so callers
+    can start the load early (e.g. before the Qt window is shown) and only wait
+    on it when they actually need to decode audio.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._models: Dict[str, Future] = {}
+        self._pools: Dict[Tuple[str, int, Optional[str]], List] = {}
+        self._checked_out: Dict[int, Tuple[str, int, Optional[str]]] = {}
+        self.max_pool_size = 4
+        self.recognizers_created = 0
+
+    @classmethod
+    def instance(cls) -> "VoskModelRegistry":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @staticmethod
+    def _key(model_path: str) -> str:
+        return os.path.normcase(os.path.abspath(model_path))
+
+    def preload(self, model_path: str) -> Future:
+        """Start loading a model in the background (no-op if already loading or loaded)"""
+        key = self._key(model_path)
+        with self._lock:
+            future = self._models.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            self._models[key] = future
+
+        if not VOSK_AVAILABLE:
+            future.set_exception(RuntimeError("Vosk is not installed"))
+            return future
+        if not os.path.exists(model_path):
+            future.set_exception(FileNotFoundError(f"Vosk model not found: {model_path}"))
+            return future
+
+        def load():
+            try:
+                self.logger.info(f"Loading Vosk model from {model_path}...")
+                model = Model(model_path)
+                self.logger.info("Vosk model loaded")
+                future.set_result(model)
+            except Exception as e:
+                self.logger.error(f"Failed to load Vosk model: {e}")
+                future.set_exception(e)
+
+        threading.Thread(target=load, name="vosk-model-loader", daemon=True).start()
+        return future
+
+    def is_ready(self, model_path: str) -> bool:
+        """True once the model has finished loading successfully"""
+        future = self._models.get(self._key(model_path))
+        return bool(future and future.done() and future.exception() is None)
+
+    def get_model(self, model_path: str, timeout: Optional[float] = None):
+        """Return the loaded model, waiting up to `timeout` seconds. None if unavailable."""
+        future = self.preload(model_path)
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            self.logger.debug(f"Vosk model unavailable: {e}")
+            return None
+
+    def acquire_recognizer(self, model_path: str, sample_rate: int = 16000, grammar: Optional[str] = None):
+        """Check out a recognizer from the pool, creating one if the pool is empty"""
+        key = (self._key(model_path), sample_rate, grammar)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool:
+                rec = pool.pop()
+                self._checked_out[id(rec)] = key
+                return rec
+
+        model = self.get_model(model_path)
+        if model is None:
+            return None
+        rec = KaldiRecognizer(model, sample_rate, grammar) if grammar else KaldiRecognizer(model, sample_rate)
+        with self._lock:
+            self.recognizers_created += 1
+            self._checked_out[id(rec)] = key
+        return rec
+
+    def release_recognizer(self, rec, discard: bool = False):
+        """Reset a recognizer and return it to its pool (or drop it, e.g. for a stale grammar)"""
+        if rec is None:
+            return
+        with self._lock:
+            key = self._checked_out.pop(id(rec), None)
+        if key is None or discard:
+            return
+        try:
+            rec.Reset()
+        except Exception as e:
+            self.logger.debug(f"Discarding recognizer that failed to reset: {e}")
+            return
+        with self._lock:
+            pool = self._pools.setdefault(key, [])
+            if len(pool) < self.max_pool_size:
+                pool.append(rec)
+
+    def get_stats(self) -> dict:
+        """Loaded models and pool sizes"""
+        with self._lock:
+            return {
+                'models_loaded': sum(1 for f in self._models.values() if f.done() and f.exception() is None),
+                'models_loading': sum(1 for f in self._models.values() if not f.done()),
+                'pooled_recognizers': sum(len(p) for p in self._pools.values()),
+                'checked_out_recognizers': len(self._checked_out),
+                'recognizers_created': self.recognizers_created
+            }
+
+
+def get_model_registry() -> VoskModelRegistry:
+    """Return the process-wide Vosk model registry"""
+    return VoskModelRegistry.instance()
@@ -0,0 +1,246 @@
+"""
+Whisper Fallback Recognizer for EchoOS
+Second-pass recognition in a persistent worker process that keeps a CPU Whisper model warm
+"""
+
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from typing import Dict, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import importlib.util
+    WHISPER_AVAILABLE = importlib.util.find_spec("whisper") is not None
+except Exception:
+    WHISPER_AVAILABLE = False
+
+
+def _worker_main(model_name, shm_name, slot_samples, requests, responses):
+    """Worker process: load Whisper once, then transcribe audio slots on request"""
+    import numpy as np
+    import whisper
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        model = whisper.load_model(model_name, device="cpu")
+        responses.put(('ready', None, None))
+        while True:
+            job = requests.get()
+            if job is None:
+                break
+            job_id, slot, n_samples = job
+            try:
+                offset = slot * slot_samples * 2
+                pcm = np.ndarray((n_samples,), dtype=np.int16, buffer=shm.buf, offset=offset)
+                audio = pcm.astype(np.float32) / 32768.0
+                result = model.transcribe(audio, language="en", fp16=False, temperature=0.0,
+                                          condition_on_previous_text=False)
+                segments = result.get("segments") or []
+                no_speech = max((s.get("no_speech_prob", 0.0) for s in segments), default=1.0)
+                responses.put(('result', job_id, (result.get("text", "").strip(), no_speech)))
+            except Exception as e:
+                responses.put(('error', job_id, str(e)))
+    except Exception as e:
+        responses.put(('failed', None, str(e)))
+    finally:
+        shm.close()
+
+
+class WhisperFallback:
+    """Owns the Whisper worker process and hands out per-job futures.
+
+    Audio is passed as int16 through a shared-memory block split into fixed
+    slots, so only small job descriptors go through the request queue. Every
+    job has a deadline: if the worker has not answered in time the future
+    fails with TimeoutError and the late answer is discarded.
+    """
+
+    def __init__(self, model_name: str = "tiny.en", sample_rate: int = 16000,
+                 max_seconds: float = 10.0, slots: int = 2, no_speech_threshold: float = 0.6):
+        self.logger = logging.getLogger(__name__)
+        self.model_name = model_name
+        self.sample_rate = sample_rate
+        self.slot_samples = int(sample_rate * max_seconds)
+        self.no_speech_threshold = no_speech_threshold
+        self._slots = slots
+        self._free_slots = queue.SimpleQueue()
+        self._jobs: Dict[int, Tuple[Future, int, float]] = {}
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._process = None
+        self._shm = None
+        self._requests = None
+        self._responses = None
+        self._reader = None
+        self._running = False
+        self.ready = threading.Event()
+        self.jobs_submitted = 0
+        self.jobs_completed = 0
+        self.jobs_timed_out = 0
+
+    @staticmethod
+    def is_available() -> bool:
+        return WHISPER_AVAILABLE and NUMPY_AVAILABLE
+
+    def start(self) -> bool:
+        """Start the worker process (model loads in the worker, not in this process)"""
+        if self._running:
+            return True
+        if not self.is_available():
+            return False
+        try:
+            ctx = multiprocessing.get_context("spawn")
+            self._shm = shared_memory.SharedMemory(create=True, size=self._slots * self.slot_samples * 2)
+            self._requests = ctx.Queue()
+            self._responses = ctx.Queue()
+            # Fresh slot queue and job table: a previous run's slots and jobs belong to the old shared memory
+            free_slots = queue.SimpleQueue()
+            for slot in range(self._slots):
+                free_slots.put(slot)
+            with self._lock:
+                self._free_slots = free_slots
+                self._jobs = {}
+            self._process = ctx.Process(
+                target=_worker_main,
+                args=(self.model_name, self._shm.name, self.slot_samples, self._requests, self._responses),
+                name="whisper-fallback",
+                daemon=True
+            )
+            self._process.start()
+            self._running = True
+            self._reader = threading.Thread(target=self._read_responses, name="whisper-fallback-reader", daemon=True)
+            self._reader.start()
+            self.logger.info(f"Whisper fallback worker starting (model: {self.model_name})")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to start Whisper fallback: {e}")
+            self.stop()
+            return False
+
+    def submit(self, audio, deadline: float = 3.0) -> Future:
+        """Queue int16 audio for transcription. Never blocks; the future fails fast if the worker is busy or not ready."""
+        future = Future()
+        if not self._running or not self.ready.is_set():
+            future.set_exception(RuntimeError("Whisper fallback not ready"))
+            return future
+        try:
+            slot = self._free_slots.get_nowait()
+        except queue.Empty:
+            future.set_exception(RuntimeError("Whisper fallback busy"))
+            return future
+
+        samples = np.asarray(audio, dtype=np.int16).reshape(-1)[:self.slot_samples]
+        view = np.ndarray((self.slot_samples,), dtype=np.int16, buffer=self._shm.buf,
+                          offset=slot * self.slot_samples * 2)
+        view[:len(samples)] = samples
+
+        job_id = next(self._job_ids)
+        with self._lock:
+            self._jobs[job_id] = (future, slot, time.monotonic() + deadline)
+            self.jobs_submitted += 1
+        self._requests.put((job_id, slot, len(samples)))
+        return future
+
+    def _read_responses(self):
+        """Resolve futures from worker responses and expire jobs past their deadline"""
+        while self._running:
+            try:
+                kind, job_id, payload = self._responses.get(timeout=0.1)
+            except queue.Empty:
+                kind = None
+            except (EOFError, OSError):
+                break
+
+            if kind == 'ready':
+                self.ready.set()
+                self.logger.info("Whisper fallback model loaded")
+            elif kind == 'failed':
+                self.logger.error(f"Whisper fallback worker failed: {payload}")
+                self._running = False
+            elif kind in ('result', 'error'):
+                self._resolve(job_id, kind, payload)
+
+            self._expire_jobs()
+
+    def _resolve(self, job_id, kind, payload):
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            if job is not None:
+                self.jobs_completed += 1
+        if job is None:
+            return
+        future, slot, _ = job
+        self._free_slots.put(slot)
+        if kind == 'error':
+            future.set_exception(RuntimeError(payload))
+            return
+        text, no_speech = payload
+        future.set_result(text if no_speech < self.no_speech_threshold else "")
+
+    def _expire_jobs(self):
+        now = time.monotonic()
+        timed_out = []
+        with self._lock:
+            for job_id, (future, slot, deadline) in list(self._jobs.items()):
+                if deadline < now:
+                    # Keep the slot reserved (the worker may still be reading it) but stop waiting
+                    self._jobs[job_id] = (Future(), slot, float('inf'))
+                    self.jobs_timed_out += 1
+                    timed_out.append(future)
+        for future in timed_out:
+            future.set_exception(TimeoutError("Whisper fallback missed its deadline"))
+
+    def stop(self):
+        """Stop the worker, fail pending jobs and release shared memory"""
+        self._running = False
+        self.ready.clear()
+        if self._reader is not None and self._reader is not threading.current_thread():
+            self._reader.join(timeout=1)
+        self._reader = None
+        with self._lock:
+            pending = [future for future, _, _ in self._jobs.values()]
+            self._jobs = {}
+            self._free_slots = queue.SimpleQueue()
+        for future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Whisper fallback stopped"))
+        try:
+            if self._requests is not None:
+                self._requests.put(None)
+            if self._process is not None:
+                self._process.join(timeout=2)
+                if self._process.is_alive():
+                    self._process.terminate()
+        except Exception as e:
+            self.logger.debug(f"Error stopping Whisper worker: {e}")
+        if self._shm is not None:
+            try:
+                self._shm.close()
+                self._shm.unlink()
+            except Exception:
+                pass
+        self._process = None
+        self._shm = None
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'running': self._running,
+                'ready': self.ready.is_set(),
+                'model': self.model_name,
+                'pending': sum(1 for _, _, d in self._jobs.values() if d != float('inf')),
+                'submitted': self.jobs_submitted,
+                'completed': self.jobs_completed,
+                'timed_out': self.jobs_timed_out
+            }
@@ -0,0 +1,205 @@
+"""
+Window State Snapshot for EchoOS
+Keeps a cached view of open windows so command routing never waits on the window system
+"""
+
+import logging
+import platform
+import threading
+import time
+from typing import Optional, Tuple
+
+# Window enumeration
+try:
+    import pygetwindow as gw
+    WINDOW_ENUM_AVAILABLE = True
+except Exception:
+    gw = None
+    WINDOW_ENUM_AVAILABLE = False
+
+# Foreground-change notifications (Windows only)
+if platform.system() == "Windows":
+    try:
+        import ctypes
+        from ctypes import wintypes
+        WIN_EVENTS_AVAILABLE = True
+    except ImportError:
+        WIN_EVENTS_AVAILABLE = False
+else:
+    WIN_EVENTS_AVAILABLE = False
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+
+# Title fragments that identify a File Explorer window
+EXPLORER_TITLE_MARKERS = ('explorer', 'file', 'this pc')
+
+
+class WindowSnapshot:
+    """Immutable window state captured at one point in time"""
+
+    def __init__(self, titles: Tuple[str, ...] = (), active_title: str = "", taken_at: float = 0.0):
+        self.titles = titles
+        self.active_title = active_title
+        self.taken_at = taken_at
+        lowered = [t.lower() for t in titles]
+        self.explorer_open = any(marker in t for t in lowered for marker in EXPLORER_TITLE_MARKERS)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.taken_at if self.taken_at else float('inf')
+
+
+class WindowStateMonitor:
+    """Cached WindowSnapshot, kept current off the caller's thread.
+
+    Readers only ever get the cached `snapshot`, so routing checks like "is
+    File Explorer open" are O(1) and never touch the window system. A
+    background refresher re-enumerates windows when asked to: after
+    `invalidate()` (executors call it after opening, closing or switching
+    windows), on every foreground change (on Windows, via a WinEvent hook),
+    and when a read finds the snapshot older than `ttl` - that read still
+    returns the cached value (stale-while-revalidate). The refresher sleeps
+    until one of those happens, so nothing polls while the user is idle.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, ttl: float = 0.5):
+        self.logger = logging.getLogger(__name__)
+        self.ttl = ttl
+        self._snapshot = WindowSnapshot()
+        self._stale = True
+        self._wake = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._running = False
+        self._thread = None
+        self._hook_thread = None
+        self._hook_thread_id = None
+        self.refresh_count = 0
+        self.read_refreshes = 0
+        self.event_refreshes = 0
+        self.last_refresh_ms = 0.0
+
+    @classmethod
+    def instance(cls) -> "WindowStateMonitor":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @staticmethod
+    def is_available() -> bool:
+        return WINDOW_ENUM_AVAILABLE
+
+    def start(self):
+        """Take a first snapshot and start the refresher (and, on Windows, the foreground hook)"""
+        if self._running or not self.is_available():
+            return
+        self._running = True
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, name="window-state", daemon=True)
+        self._thread.start()
+        if WIN_EVENTS_AVAILABLE:
+            self._hook_thread = threading.Thread(target=self._run_foreground_hook, name="window-state-hook", daemon=True)
+            self._hook_thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._hook_thread_id is not None:
+            # WM_QUIT ends the hook thread's message loop
+            ctypes.windll.user32.PostThreadMessageW(self._hook_thread_id, 0x0012, 0, 0)
+
+    def invalidate(self):
+        """Schedule a refresh (e.g. right after opening or closing a window); returns immediately"""
+        self._stale = True
+        self._wake.set()
+
+    @property
+    def snapshot(self) -> WindowSnapshot:
+        """The cached window state - never blocks; a stale one triggers a background refresh"""
+        snapshot = self._snapshot
+        if self._running and not self._stale and snapshot.age > self.ttl:
+            self.read_refreshes += 1
+            self.invalidate()
+        return snapshot
+
+    def refresh(self) -> WindowSnapshot:
+        """Enumerate windows now and publish a new snapshot"""
+        with self._refresh_lock:
+            # Cleared first, so an invalidate() that lands mid-enumeration schedules another refresh
+            self._stale = False
+            start = time.perf_counter()
+            titles: Tuple[str, ...] = ()
+            active_title = ""
+            try:
+                titles = tuple(w.title for w in gw.getAllWindows() if w.title)
+                active = gw.getActiveWindow()
+                active_title = active.title if active is not None and active.title else ""
+            except Exception as e:
+                self.logger.debug(f"Window enumeration failed: {e}")
+            self._snapshot = WindowSnapshot(titles, active_title, time.monotonic())
+            self.refresh_count += 1
+            self.last_refresh_ms = (time.perf_counter() - start) * 1000
+            return self._snapshot
+
+    def _run(self):
+        while self._running:
+            self._wake.wait()
+            self._wake.clear()
+            if not self._running:
+                break
+            if self._stale:
+                self.refresh()
+
+    def _run_foreground_hook(self):
+        """Windows: schedule a refresh whenever the foreground window changes"""
+        try:
+            user32 = ctypes.windll.user32
+            kernel32 = ctypes.windll.kernel32
+            WinEventProc = ctypes.WINFUNCTYPE(
+                None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+            )
+
+            def on_foreground(hook, event, hwnd, id_object, id_child, thread, event_time):
+                self.event_refreshes += 1
+                self.invalidate()
+
+            callback = WinEventProc(on_foreground)
+            hook = user32.SetWinEventHook(
+                EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, 0, callback, 0, 0, WINEVENT_OUTOFCONTEXT
+            )
+            if not hook:
+                self.logger.debug("SetWinEventHook failed - refreshing on invalidation and stale reads only")
+                return
+            self._hook_thread_id = kernel32.GetCurrentThreadId()
+            msg = wintypes.MSG()
+            while self._running and user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+            user32.UnhookWinEvent(hook)
+        except Exception as e:
+            self.logger.debug(f"Foreground hook unavailable: {e}")
+
+    def get_stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            'running': self._running,
+            'windows': len(snapshot.titles),
+            'explorer_open': snapshot.explorer_open,
+            'snapshot_age_ms': snapshot.age * 1000 if snapshot.taken_at else None,
+            'refreshes': self.refresh_count,
+            'read_refreshes': self.read_refreshes,
+            'event_refreshes': self.event_refreshes,
+            'last_refresh_ms': self.last_refresh_ms
+        }
+
+
+def get_window_state() -> WindowStateMonitor:
+    """Return the process-wide window state monitor, starting it on first use"""
+    monitor = WindowStateMonitor.instance()
+    monitor.start()
+    return monitor
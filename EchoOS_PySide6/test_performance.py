@@ -50,7 +50,7 @@ class PerformanceTester:
         times = []
         for phrase in test_phrases:
             start = time.perf_counter()
-            # Simulate recognition (would use actual Vosk model)
+            # Simulated - benchmarks/stt_replay.py replays recorded audio through the real pipeline
             # model.recognize(phrase)
             time.sleep(0.15)  # Vosk model latency
             end = time.perf_counter()
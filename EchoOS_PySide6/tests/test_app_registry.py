@@ -0,0 +1,49 @@
+"""
+The binary catalog answers lookups exactly like the apps.json it was built from
+Run: python -m pytest tests
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.app_registry import AppRegistry
+
+
+@pytest.fixture
+def apps_file(tmp_path):
+    editor = tmp_path / "editor.exe"
+    editor.write_text("")
+    notes = tmp_path / "notes.exe"
+    notes.write_text("")
+    apps = [
+        {"name": "Visual Studio Code", "exec": str(editor), "aliases": ["code", "vs code"], "category": "start_menu"},
+        {"name": "Notes", "exec": str(notes), "aliases": ["notepad"], "category": "path"},
+        # Later entries claiming the same keys, one of them no longer installed
+        {"name": "Code Insiders", "exec": str(tmp_path / "missing.exe"), "aliases": ["code"], "category": "path"},
+        {"name": "Notes Portable", "exec": str(notes), "aliases": ["notepad"], "category": "portable"},
+    ]
+    path = tmp_path / "apps.json"
+    path.write_text(json.dumps({"apps": apps}))
+    return str(path)
+
+
+def test_json_and_catalog_lookups_agree(apps_file):
+    first = AppRegistry(apps_file)
+    first.ensure_loaded()
+    assert first.source == 'json'
+
+    second = AppRegistry(apps_file)
+    second.ensure_loaded()
+    assert second.source == 'catalog'
+
+    for name in ("code", "vs code", "vscode", "visual studio code", "notepad", "notes portable",
+                 "code insiders", "unknown"):
+        assert first.lookup(name) == second.lookup(name), name
+    assert second.lookup("code") == first.lookup("visual studio code")
+    assert second.lookup("code insiders") is None
+    assert set(first.names) == set(second.names)
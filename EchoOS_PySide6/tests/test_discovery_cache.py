@@ -0,0 +1,81 @@
+"""
+Concurrent discovery sources sharing one DiscoveryCache
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.discovery_cache import DiscoveryCache
+
+
+def exe_matcher(file):
+    return file.endswith(".exe")
+
+
+def build_app(path, file):
+    return {"name": os.path.splitext(file)[0], "exec": path}
+
+
+def make_tree(tmp_path):
+    roots = []
+    for name in ("alpha", "beta"):
+        root = tmp_path / name
+        root.mkdir()
+        (root / f"{name}.exe").write_text("")
+        roots.append(str(root))
+    return roots
+
+
+def test_concurrent_sources_reuse_a_saved_cache(tmp_path):
+    roots = make_tree(tmp_path)
+    cache_file = str(tmp_path / "cache.json")
+    first = DiscoveryCache(cache_file)
+    for root in roots:
+        first.scan(root, [root], exe_matcher, build_app)
+    first.save()
+
+    cache = DiscoveryCache(cache_file)
+    barrier = threading.Barrier(len(roots))
+    found = {}
+
+    def source(root):
+        barrier.wait()
+        found[root] = cache.scan(root, [root], exe_matcher, build_app)
+
+    threads = [threading.Thread(target=source, args=(root,)) for root in roots]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.stats['dir_listings'] == 0
+    assert cache.stats['dirs_reused'] == len(roots)
+    assert all(len(apps) == 1 for apps in found.values())
+
+
+def test_scan_from_an_ended_run_does_not_commit(tmp_path):
+    roots = make_tree(tmp_path)
+    cache = DiscoveryCache(str(tmp_path / "cache.json"))
+    started, release = threading.Event(), threading.Event()
+
+    def slow_build(path, file):
+        started.set()
+        release.wait(timeout=5)
+        return build_app(path, file)
+
+    cache.begin_run()
+    late = threading.Thread(target=cache.scan, args=("late", roots[:1], exe_matcher, slow_build))
+    late.start()
+    assert started.wait(timeout=5)
+    cache.end_run()  # The source missed its deadline and the run finished without it
+
+    cache.begin_run()
+    cache.scan("fresh", roots[1:], exe_matcher, build_app)
+    release.set()
+    late.join()
+
+    assert cache.get_stats()['sources'] == {"fresh": 1}
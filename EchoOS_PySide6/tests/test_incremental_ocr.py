@@ -0,0 +1,71 @@
+"""
+Tiling checks for IncrementalOCR (no OCR engine needed - only the tile layout is tested)
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.incremental_ocr import IncrementalOCR
+
+
+def text_line(frame, x, y, width, height=10):
+    """Glyph-like ink: 4 px strokes with 2 px gaps"""
+    for left in range(x, x + width, 6):
+        frame[y:y + height, left:left + 4] = 0
+
+
+def bordered_frame(offset=0):
+    """White 400x300 window with a 1 px border, a full-height scrollbar edge and text lines"""
+    frame = np.full((300, 400), 255, dtype=np.uint8)
+    frame[0, :] = frame[-1, :] = 0
+    frame[:, 0] = frame[:, -1] = 0
+    frame[:, 380] = 0
+    for y in (20 + offset, 60 + offset, 118 + offset, 160 + offset):
+        text_line(frame, 20, y, 200)
+    return frame
+
+
+def covers(tile, y0, y1):
+    _, y, _, h = tile
+    return y <= y0 and y1 <= y + h
+
+
+def test_border_does_not_merge_or_slice_lines():
+    ocr = IncrementalOCR()
+    tiles = ocr.tiles(bordered_frame())
+    # One tile per text line, the line at y=118-128 in one piece (not cut at y=120)
+    assert len(tiles) == 4
+    for y in (20, 60, 118, 160):
+        assert any(covers(t, y, y + 10) for t in tiles)
+    # No 1 px border strips
+    assert all(w >= ocr.min_tile_size and h >= ocr.min_tile_size for _, _, w, h in tiles)
+
+
+def test_scrolled_lines_keep_their_tile_keys():
+    ocr = IncrementalOCR()
+    before, after = bordered_frame(), bordered_frame(offset=7)
+    keys_before = {ocr._tile_key(before, t) for t in ocr.tiles(before)}
+    keys_after = {ocr._tile_key(after, t) for t in ocr.tiles(after)}
+    assert keys_before == keys_after
+
+
+def test_tall_block_is_cut_between_lines():
+    ocr = IncrementalOCR(max_band_height=120)
+    frame = np.full((300, 400), 255, dtype=np.uint8)
+    # Lines 3 px apart merge into one block taller than max_band_height
+    lines = range(10, 250, 13)
+    for y in lines:
+        text_line(frame, 20, y, 200)
+    tiles = ocr.tiles(frame)
+    assert len(tiles) > 1
+    assert all(h <= ocr.max_band_height for _, _, _, h in tiles)
+    # Every cut falls in a gap between lines, never through one
+    for _, y, _, h in tiles:
+        assert not any(line < y + h < line + 10 for line in lines)
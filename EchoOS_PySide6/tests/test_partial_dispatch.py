@@ -0,0 +1,37 @@
+"""
+Early dispatch from stable partial hypotheses, and reconciling it with the final result
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.partial_dispatch import PartialCommandDispatcher
+
+
+def dispatch_early(dispatcher, partial):
+    fired = [dispatcher.observe(partial) for _ in range(dispatcher.stable_frames)]
+    return fired[-1]
+
+
+def test_identical_final_is_suppressed():
+    dispatcher = PartialCommandDispatcher(["go to documents", "volume up"])
+    assert dispatch_early(dispatcher, "go to documents") == "go to documents"
+    assert dispatcher.reconcile("go to documents")
+    assert dispatcher.suppressed_count == 1
+
+
+def test_final_that_extends_the_dispatched_command_still_runs():
+    dispatcher = PartialCommandDispatcher(["go to documents", "volume up"])
+    assert dispatch_early(dispatcher, "go to documents") == "go to documents"
+    assert not dispatcher.reconcile("go to documents projects")
+    assert dispatcher.extended_count == 1
+    assert dispatcher.suppressed_count == 0
+
+
+def test_prefix_of_another_command_is_never_dispatched_early():
+    dispatcher = PartialCommandDispatcher(["next", "next tab"])
+    assert dispatch_early(dispatcher, "next") is None
+    assert not dispatcher.reconcile("next tab")
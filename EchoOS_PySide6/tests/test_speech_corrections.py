@@ -0,0 +1,36 @@
+"""
+Regression checks for the EnhancedSTT correction pipeline
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.enhanced_stt import EnhancedSTT
+
+
+@pytest.fixture(scope="module")
+def stt():
+    stt = EnhancedSTT()
+    yield stt
+    stt.shutdown()
+
+
+@pytest.mark.parametrize("heard, expected", [
+    # The whole-utterance fuzzy pass must never swap one command for another
+    ("close all apps", "close all apps"),
+    ("close all", "close all apps"),
+    ("close all tabs", "close all tabs"),
+    # ...but still fixes misheard words of the same command
+    ("scrol down", "scroll down"),
+    ("volume upp", "volume up"),
+    ("next tabb", "next tab"),
+    ("open not bad", "open notepad"),
+    ("create fine on desktop", "create file on desktop"),
+])
+def test_correct_speech_text(stt, heard, expected):
+    assert stt._correct_speech_text(heard) == expected
@@ -0,0 +1,108 @@
+"""
+Window snapshots are read from the cache without blocking and refreshed in the background
+Run: python -m pytest tests
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import window_state
+from modules.window_state import WindowStateMonitor
+
+
+class FakeWindow:
+    def __init__(self, title):
+        self.title = title
+
+
+class FakeWindows:
+    """pygetwindow stand-in that records which threads enumerate windows"""
+
+    def __init__(self, titles):
+        self.titles = list(titles)
+        self.threads = []
+        self.release = threading.Event()
+        self.release.set()
+
+    @property
+    def enumerations(self):
+        return len(self.threads)
+
+    def getAllWindows(self):
+        self.release.wait(timeout=5)
+        self.threads.append(threading.current_thread().name)
+        return [FakeWindow(t) for t in self.titles]
+
+    def getActiveWindow(self):
+        return FakeWindow(self.titles[0]) if self.titles else None
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+@pytest.fixture
+def windows(monkeypatch):
+    fake = FakeWindows(["Notepad"])
+    monkeypatch.setattr(window_state, "gw", fake)
+    monkeypatch.setattr(window_state, "WINDOW_ENUM_AVAILABLE", True)
+    monkeypatch.setattr(window_state, "WIN_EVENTS_AVAILABLE", False)
+    return fake
+
+
+@pytest.fixture
+def monitor(windows):
+    monitors = []
+
+    def make(ttl):
+        monitor = WindowStateMonitor(ttl=ttl)
+        monitor.start()
+        monitors.append(monitor)
+        return monitor
+
+    yield make
+    for monitor in monitors:
+        monitor.stop()
+
+
+def test_fresh_snapshot_is_reused(windows, monitor):
+    state = monitor(ttl=60)
+    assert windows.enumerations == 1
+    for _ in range(10):
+        assert state.snapshot.titles == ("Notepad",)
+    time.sleep(0.05)
+    assert windows.enumerations == 1  # Idle: nothing polls
+
+
+def test_invalidate_refreshes_in_the_background(windows, monitor):
+    state = monitor(ttl=60)
+    windows.titles.append("Documents - File Explorer")
+    state.invalidate()
+    assert wait_for(lambda: state.snapshot.explorer_open)
+    assert windows.threads[-1] == "window-state"
+
+
+def test_stale_read_returns_cached_snapshot_without_blocking(windows, monitor):
+    state = monitor(ttl=0.01)
+    time.sleep(0.02)
+    windows.release.clear()  # Enumeration now hangs until released
+    windows.titles.append("Documents - File Explorer")
+    start = time.perf_counter()
+    stale = state.snapshot
+    assert time.perf_counter() - start < 0.05
+    assert not stale.explorer_open
+    assert state.get_stats()['read_refreshes'] == 1
+    windows.release.set()
+    assert wait_for(lambda: state._snapshot.explorer_open)
+    assert windows.threads[1:] == ["window-state"]